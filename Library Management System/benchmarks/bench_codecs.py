@@ -0,0 +1,48 @@
+"""
+Compares the available codec backends of every text format, and pretty with compact JSON.
+
+Run from the project root:
+    python -m benchmarks.bench_codecs [sizes...]
+"""
+import json
+import sys
+import time
+
+from benchmarks.common import synthetic_books
+from managers.loaders import available_codecs, codecFactories, describe_codecs
+from utils import list2dict
+
+SIZES = [10_000, 100_000]
+
+
+def timed(function, argument) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function(argument)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(size: int) -> list[str]:
+    books = synthetic_books(size)
+    lines = []
+    pretty, text = timed(lambda content: json.dumps(content, indent=3), books)
+    parsed, _ = timed(json.loads, text)
+    lines.append(f"json pretty (indent=3): dumps {pretty:.0f} ms, loads {parsed:.0f} ms")
+    for format_ in codecFactories:
+        content = books if format_ == "json" else list2dict(books)
+        for codec in available_codecs(format_):
+            dumped, text = timed(codec.dumps, content)
+            loaded, result = timed(codec.loads, text)
+            assert result == content
+            lines.append(f"{format_} {codec.name}: dumps {dumped:.0f} ms, loads {loaded:.0f} ms")
+    return lines
+
+
+def main(sizes: list[int]):
+    print("selected:", ", ".join(f"{format_} -> {name}" for format_, name in describe_codecs().items()))
+    for size in sizes:
+        for line in run(size):
+            print(f"{size:>10} books, {line}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
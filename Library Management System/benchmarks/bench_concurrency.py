@@ -0,0 +1,62 @@
+"""
+Measures the issue and return throughput of a concurrent library across thread counts.
+
+Every thread issues and returns its own books, so the threads only contend for the shared commit lock. The
+first line is a library without the concurrent mode, driven by one thread, for the overhead of the locks.
+
+Run from the project root:
+    python -m benchmarks.bench_concurrency [threads...]
+"""
+import sys
+import threading
+import time
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+from managers.library import Library
+
+BOOKS = 100_000
+OPERATIONS = 40_000
+THREADS = [1, 2, 4, 8]
+
+
+def run(library: Library, uuids: list[str], threads: int) -> float:
+    """
+    Issues and returns books from several threads.
+
+    Returns:
+        float: The number of operations per second.
+    """
+    share = OPERATIONS // 2 // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def work(number):
+        mine = uuids[number * share:(number + 1) * share]
+        barrier.wait()
+        for uuid in mine:
+            library.issue_book(uuid)
+        for uuid in mine:
+            library.return_book(uuid)
+
+    workers = [threading.Thread(target=work, args=(number,)) for number in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return share * threads * 2 / (time.perf_counter() - start)
+
+
+def main(threadCounts: list[int]):
+    books = synthetic_books(BOOKS)
+    uuids = [book["uuid"] for book in books if book["available"]]
+    with catalog_file(books) as path, quiet():
+        results = [("serial", 1, run(Library(bookListFile=path), uuids, 1))]
+        library = Library(bookListFile=path, concurrent=True)
+        results += [("concurrent", threads, run(library, uuids, threads)) for threads in threadCounts]
+    for mode, threads, rate in results:
+        print(f"{mode:<10} {threads:>2} threads {rate:>10,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main([int(threads) for threads in sys.argv[1:]] or THREADS)
@@ -0,0 +1,43 @@
+"""
+Compares exporting a catalog to every text format one after another and in a process pool.
+
+Run from the project root:
+    python -m benchmarks.bench_export [sizes...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import synthetic_books
+from managers.loaders import export_data
+
+SIZES = [10_000, 100_000]
+EXTENSIONS = [".json", ".xml", ".yaml", ".toml", ".csv"]
+
+
+def run(size: int, workers: int) -> tuple[float, dict[str, float]]:
+    books = synthetic_books(size)
+    directory = tempfile.mkdtemp(prefix="kscrt-bench-")
+    try:
+        start = time.perf_counter()
+        timings = export_data(books, [os.path.join(directory, "books" + extension) for extension in EXTENSIONS],
+                              workers)
+        return time.perf_counter() - start, timings
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(sizes: list[int]):
+    print(f"{os.cpu_count()} CPUs")
+    for size in sizes:
+        for workers in (1, len(EXTENSIONS)):
+            total, timings = run(size, workers)
+            print(f"{size:>10} books, {workers} workers: total {total * 1000:.0f} ms (" +
+                  ", ".join(f"{os.path.splitext(path)[1]} {seconds * 1000:.0f}" for path, seconds in timings.items()) +
+                  ")")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,64 @@
+"""
+Measures fuzzy lookups of the trigram index over synthetic catalogs.
+
+Run from the project root:
+    python -m benchmarks.bench_fulltext [sizes...]
+"""
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import synthetic_books
+from managers.fulltext import TrigramIndex
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def misspell(text: str, rand: random.Random) -> str:
+    """
+    Drops one character of a text, like a hurried typist would.
+    """
+    position = rand.randrange(len(text))
+    return text[:position] + text[position + 1:]
+
+
+def run(size: int) -> dict[str, float]:
+    books = synthetic_books(size)
+    rand = random.Random(size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = TrigramIndex()
+    index.build(books)
+    build = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+
+    targets = rand.sample(books, 200)
+    byUUID = {book["uuid"]: book for book in books}
+    result = {"build (s)": build, "index (MiB)": memory}
+    for attribute in ("name", "author"):
+        latencies = []
+        found = 0
+        for book in targets:
+            text = misspell(book[attribute], rand)
+            start = time.perf_counter()
+            matches = index.search(text, limit=10)
+            latencies.append((time.perf_counter() - start) * 1000)
+            found += any(byUUID[uuid][attribute] == book[attribute] for uuid, _ in matches)
+        latencies.sort()
+        result[f"{attribute} p50 (ms)"] = statistics.median(latencies)
+        result[f"{attribute} p95 (ms)"] = latencies[int(len(latencies) * 0.95)]
+        result[f"{attribute} found@10"] = found / len(targets)
+    return result
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        result = run(size)
+        print(f"{size:>10} books: " + ", ".join(f"{name} {value:.3f}" for name, value in result.items()))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,49 @@
+"""
+Compares loading a whole JSON catalog with reading and updating single books of a .kbin catalog.
+
+Run from the project root:
+    python -m benchmarks.bench_kbin [sizes...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.common import synthetic_books, catalog_file
+from managers.loaders import JsonLoader, KbinLoader
+
+SIZES = [10_000, 100_000, 1_000_000]
+LOOKUPS = 1_000
+
+
+def run(size: int) -> dict[str, float]:
+    books = synthetic_books(size)
+    uuids = random.Random(7).sample([book["uuid"] for book in books], min(LOOKUPS, size))
+    result = {}
+    with catalog_file(books) as path:
+        start = time.perf_counter()
+        list(JsonLoader(path).iter_load())
+        result["json load (ms)"] = (time.perf_counter() - start) * 1000
+    with catalog_file(books, ".kbin") as path:
+        loader = KbinLoader(path)
+        start = time.perf_counter()
+        list(loader.iter_load())
+        result["kbin load (ms)"] = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for uuid in uuids:
+            assert loader.find(uuid) is not None
+        result["kbin find (us)"] = (time.perf_counter() - start) / len(uuids) * 1e6
+        start = time.perf_counter()
+        for uuid in uuids:
+            loader.apply_changes([{"op": "update", "uuid": uuid, "fields": {"available": False}}])
+        result["kbin update (us)"] = (time.perf_counter() - start) / len(uuids) * 1e6
+    return result
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        result = run(size)
+        print(f"{size:>10} books: " + ", ".join(f"{name} {value:.2f}" for name, value in result.items()))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,51 @@
+"""
+Compares the startup time and memory of an eager and a lazy library, and the cost of touching one book.
+
+Run from the project root:
+    python -m benchmarks.bench_lazy [sizes...]
+"""
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+from managers.library import Library
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def measure(path: str, **options) -> dict[str, float]:
+    start = time.perf_counter()
+    library = Library(bookListFile=path, **options)
+    startup = time.perf_counter() - start
+    uuid = library.bList[len(library.bList) // 2]["uuid"]
+    with quiet():
+        start = time.perf_counter()
+        library.issue_book(uuid)
+        issued = time.perf_counter() - start
+    del library
+    tracemalloc.start()
+    library = Library(bookListFile=path, **options)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"startup (ms)": startup * 1000, "issue (us)": issued * 1e6, "memory (MiB)": memory / 2 ** 20}
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        books = synthetic_books(size)
+        with catalog_file(books) as path:
+            results = {"json eager": measure(path), "json lazy": measure(path, lazy=True)}
+        with catalog_file(books, ".csv") as path:
+            results["csv eager"] = measure(path)
+            results["csv lazy"] = measure(path, lazy=True)
+        with catalog_file(books, ".kbin") as path:
+            results["kbin eager"] = measure(path)
+            results["kbin lazy"] = measure(path, lazy=True)
+        del books
+        for name, result in results.items():
+            print(f"{size:>10} books, {name:<10}: " + ", ".join(f"{key} {value:.2f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,38 @@
+"""
+Measures the per-operation latency of the UUID based Library operations.
+
+Run from the project root:
+    python -m benchmarks.bench_library_index [sizes...]
+"""
+import random
+import sys
+
+from benchmarks.common import synthetic_books, catalog_file, quiet, per_op
+from managers.library import Library
+
+SIZES = [1_000, 10_000, 100_000, 300_000]
+OPERATIONS = 1_000
+
+
+def run(size: int) -> dict[str, float]:
+    books = synthetic_books(size)
+    with catalog_file(books) as path, quiet():
+        library = Library(bookListFile=path)
+        uuids = random.Random(size).sample([book["uuid"] for book in books], OPERATIONS)
+        return {
+            "display": per_op(library.display_book, uuids),
+            "issue": per_op(library.issue_book, uuids),
+            "return": per_op(library.return_book, uuids),
+            "remove": per_op(library.remove_book, uuids),
+        }
+
+
+def main(sizes: list[int]):
+    print(f"{'books':>10} {'display':>10} {'issue':>10} {'return':>10} {'remove':>10}  (us/op)")
+    for size in sizes:
+        result = run(size)
+        print(f"{size:>10} " + " ".join(f"{result[name]:>10.2f}" for name in ("display", "issue", "return", "remove")))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,48 @@
+"""
+Compares listing outdated books through the due-date heap with parsing every expire date.
+
+Run from the project root:
+    python -m benchmarks.bench_outdated [sizes...]
+"""
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+from managers.library import Library
+from utils import DATE_FORMAT
+
+SIZES = [10_000, 100_000, 1_000_000]
+NOW = datetime(2024, 7, 3)
+
+
+def scan(library: Library) -> list[str]:
+    return [book["uuid"] for book in library.bList
+            if not book["available"] and datetime.strptime(book["expire_date"], DATE_FORMAT) < NOW]
+
+
+def run(size: int) -> dict[str, float]:
+    with catalog_file(synthetic_books(size)) as path, quiet():
+        library = Library(bookListFile=path, indexes={})
+        start = time.perf_counter()
+        expected = scan(library)
+        scanned = time.perf_counter() - start
+        start = time.perf_counter()
+        library.outdated_books(NOW)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        found = library.outdated_books(NOW)
+        repeated = time.perf_counter() - start
+        assert sorted(found) == sorted(expected)
+    return {"outdated": len(found), "scan (ms)": scanned * 1000, "first (ms)": first * 1000,
+            "repeated (ms)": repeated * 1000}
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        result = run(size)
+        print(f"{size:>10} books: " + ", ".join(f"{name} {value:.2f}" for name, value in result.items()))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
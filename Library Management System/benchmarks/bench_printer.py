@@ -0,0 +1,45 @@
+"""
+Measures printing every book of a catalog, as the Display Books menu entry does, with and without buffering.
+
+The output goes to a line buffered stream, as a terminal is, and to a block buffered one, as a pipe is.
+
+Run from the project root:
+    python -m benchmarks.bench_printer [sizes...]
+"""
+import contextlib
+import os
+import sys
+import time
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+from managers.library import Library
+from utils import Printer
+
+SIZES = [10_000, 200_000]
+
+
+def render(library: Library, printer: Printer, buffered: bool):
+    with printer.buffered() if buffered else contextlib.nullcontext():
+        for id, book in enumerate(library.bList, 1):
+            printer.print(f"Book {id}:")
+            with printer:
+                library.display_book(book["uuid"])
+
+
+def main(sizes: list[int]):
+    printer = Printer()
+    for size in sizes:
+        with catalog_file(synthetic_books(size)) as path, quiet():
+            library = Library(bookListFile=path)
+        for sink, buffering in (("line buffered", 1), ("block buffered", -1)):
+            for buffered in (False, True):
+                with open(os.devnull, "w", buffering=buffering) as output, contextlib.redirect_stdout(output):
+                    start = time.perf_counter()
+                    render(library, printer, buffered)
+                    seconds = time.perf_counter() - start
+                print(f"{size:>8} books, {sink:<14} {'buffered' if buffered else 'unbuffered':<10} "
+                      f"{seconds * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
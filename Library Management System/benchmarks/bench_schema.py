@@ -0,0 +1,66 @@
+"""
+Compares the schema-compiled CSV and XML decoding with the former per-cell int()/exception path.
+
+Run from the project root:
+    python -m benchmarks.bench_schema [sizes...]
+"""
+import csv
+import io
+import sys
+import time
+import xml.etree.ElementTree as Et
+
+from benchmarks.common import synthetic_books
+from managers.loaders import CsvLoader, XmlLoader
+
+
+def legacy_convert(value):
+    try:
+        value = int(value)
+    except ValueError:
+        if value.lower() in ['true', 'false']:
+            value = value.lower() == 'true'
+    except TypeError:
+        value = ''
+    return value
+
+
+def legacy_csv(text: str) -> list[dict]:
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        for key, value in row.items():
+            row[key] = legacy_convert(value)
+        rows.append(row)
+    return rows
+
+
+def legacy_xml(text: str) -> list[dict]:
+    books = []
+    for element in Et.fromstring(text):
+        item = {sub_element.tag: legacy_convert(sub_element.text) for sub_element in element}
+        item['uuid'] = element.attrib['uuid']
+        books.append(item)
+    return books
+
+
+SIZES = [10_000, 100_000]
+
+
+def timed(function, argument) -> float:
+    start = time.perf_counter()
+    function(argument)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        books = synthetic_books(size)
+        for name, loader, legacy in (("csv", CsvLoader(), legacy_csv), ("xml", XmlLoader(), legacy_xml)):
+            text = loader.serialize(books)
+            assert legacy(text) == loader.deserialize(text) == books
+            print(f"{size:>10} books, {name}: per-cell {timed(legacy, text):.0f} ms, "
+                  f"schema {timed(loader.deserialize, text):.0f} ms, serialize {timed(loader.serialize, books):.0f} ms")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,45 @@
+"""
+Compares Library.search_by and Library.query with the secondary indexes against the linear scan, and repeated
+searches answered by the search_by cache.
+
+Run from the project root:
+    python -m benchmarks.bench_search [sizes...]
+"""
+import sys
+
+from benchmarks.common import synthetic_books, catalog_file, quiet, per_op
+from managers.library import Library
+
+SIZES = [10_000, 100_000]
+QUERIES = ["author", "available", "number_of_readings", "uuid"]
+ENGINE_QUERY = "author prefix 'Ka' AND available AND number_of_readings >= 50 ORDER BY number_of_readings DESC LIMIT 20"
+
+
+def run(size: int) -> dict[str, tuple[float, float, float]]:
+    books = synthetic_books(size)
+    results = {}
+    with catalog_file(books) as path, quiet():
+        indexed = Library(bookListFile=path, searchCacheSize=0)
+        scanned = Library(bookListFile=path, indexes={}, searchCacheSize=0)
+        cached = Library(bookListFile=path)
+        for attribute in QUERIES:
+            value = str(books[size // 2][attribute])
+            repeat = [value] * 20
+            results[attribute] = (per_op(lambda v: indexed.search_by(attribute, v), repeat),
+                                  per_op(lambda v: scanned.search_by(attribute, v), repeat),
+                                  per_op(lambda v: cached.search_by(attribute, v), repeat * 50))
+        repeat = [ENGINE_QUERY] * 20
+        results["query"] = (per_op(lambda q: list(indexed.query(q)), repeat),
+                            per_op(lambda q: list(scanned.query(q)), repeat), float("nan"))
+    return results
+
+
+def main(sizes: list[int]):
+    print(f"{'books':>10} {'attribute':>20} {'indexed':>12} {'scan':>12} {'cached':>12}  (us/query)")
+    for size in sizes:
+        for attribute, (indexed, scanned, cached) in run(size).items():
+            print(f"{size:>10} {attribute:>20} {indexed:>12.1f} {scanned:>12.1f} {cached:>12.1f}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,134 @@
+"""
+Generates load on the library service and measures its throughput and latency.
+
+Without --port a service is started in a separate process over a synthetic catalog, once for every save
+delay, so the effect of coalescing the saves is visible; with --port an already running service is measured.
+
+Run from the project root:
+    python -m benchmarks.bench_service --books 100000 --clients 32 --requests 20000
+    python -m benchmarks.bench_service --port 8765 --writes 0.5
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+
+
+async def _client(host: str, port: int, uuids: list[str], authors: list[str], requests: int, writes: float,
+                  seed: int, latencies: list[float]) -> int:
+    """
+    Sends requests one after another over a connection, recording the latency of every request.
+
+    Returns:
+        int: The number of rejected requests, such as issuing a book another client issued.
+    """
+    rand = random.Random(seed)
+    issued: list[str] = []
+    failures = 0
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    try:
+        for _ in range(requests):
+            if rand.random() < writes:
+                if issued and rand.random() < 0.5:
+                    request = {"op": "return", "uuid": issued.pop()}
+                else:
+                    issued.append(rand.choice(uuids))
+                    request = {"op": "issue", "uuid": issued[-1]}
+            elif rand.random() < 0.8:
+                request = {"op": "get", "uuid": rand.choice(uuids)}
+            else:
+                request = {"op": "search", "attribute": "author", "value": rand.choice(authors)}
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            failures += not response["ok"]
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return failures
+
+
+async def _generate(host: str, port: int, clients: int, requests: int, writes: float) -> dict[str, float]:
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    writer.write(json.dumps({"op": "query", "query": "available", "limit": 10_000}).encode() + b"\n")
+    uuids = json.loads(await reader.readline())["uuids"]
+    authors = []
+    for uuid in uuids[:100]:
+        writer.write(json.dumps({"op": "get", "uuid": uuid}).encode() + b"\n")
+        authors.append(json.loads(await reader.readline())["book"]["author"])
+    writer.close()
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    failures = await asyncio.gather(*(
+        _client(host, port, uuids, authors, requests // clients, writes, seed, latencies) for seed in range(clients)
+    ))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failures": sum(failures),
+        "rps": len(latencies) / seconds,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+    }
+
+
+def _serve(path: str, saveDelay: float, ports: multiprocessing.Queue):
+    from managers.library import Library
+    from managers.service import LibraryService
+
+    async def serve():
+        with quiet():
+            library = Library(bookListFile=path, journal=True, concurrent=True)
+        service = LibraryService(library, saveDelay)
+        server = await service.start(port=0)
+        ports.put(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def report(label: str, result: dict[str, float]):
+    print(f"{label:<28} {result['requests']:>7} requests {result['rps']:>9,.0f}/s   "
+          f"p50 {result['p50'] * 1000:7.2f} ms   p99 {result['p99'] * 1000:7.2f} ms   {result['failures']} rejected")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_service", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="measure the service running on this port")
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--writes", type=float, default=0.2, help="the share of issue and return requests")
+    parser.add_argument("--save-delays", dest="saveDelays", type=float, nargs="+", default=[0.0, 0.005])
+    options = parser.parse_args()
+
+    if options.port is not None:
+        result = asyncio.run(_generate(options.host, options.port, options.clients, options.requests, options.writes))
+        report(f"{options.host}:{options.port}", result)
+        return
+    books = synthetic_books(options.books)
+    for saveDelay in options.saveDelays:
+        with catalog_file(books) as path:
+            ports = multiprocessing.Queue()
+            server = multiprocessing.Process(target=_serve, args=(path, saveDelay, ports), daemon=True)
+            server.start()
+            try:
+                port = ports.get(timeout=600)
+                result = asyncio.run(_generate("127.0.0.1", port, options.clients, options.requests, options.writes))
+            finally:
+                server.terminate()
+                server.join()
+        report(f"{options.books} books, delay {saveDelay * 1000:g} ms", result)
+
+
+if __name__ == "__main__":
+    main()
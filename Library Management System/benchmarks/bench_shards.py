@@ -0,0 +1,60 @@
+"""
+Compares a library stored in a single file with a sharded one: the startup, issuing one book and saving it,
+and loading every shard on startup with and without worker processes.
+
+Run from the project root:
+    python -m benchmarks.bench_shards [sizes...]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+from managers.library import Library
+from managers.shards import ShardedLoader
+
+SIZES = [10_000, 200_000]
+
+
+def measure(path: str, uuid: str, **options) -> dict[str, float]:
+    with quiet():
+        start = time.perf_counter()
+        library = Library(bookListFile=path, **options)
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        library.issue_book(uuid)
+        library.save(library.dataLoader.fileExt)
+        saved = time.perf_counter() - start
+    return {"startup (ms)": startup * 1000, "issue and save (ms)": saved * 1000}
+
+
+def preload(path: str, workers: int | None) -> float:
+    loader = ShardedLoader(path)
+    start = time.perf_counter()
+    loader.load_shards(loader.shards(), workers)
+    return time.perf_counter() - start
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        books = synthetic_books(size)
+        uuid = books[size // 2]["uuid"]
+        with catalog_file(books) as path:
+            results = {"single file": measure(path, uuid)}
+        directory = tempfile.mkdtemp(prefix="kscrt-bench-")
+        try:
+            ShardedLoader(directory).save_iter(books)
+            results["sharded"] = measure(directory, uuid, sharded=True)
+            results["sharded preload"] = measure(directory, uuid, sharded=True, preload=True)
+            for name, result in results.items():
+                print(f"{size:>8} books, {name:<16}: " +
+                      ", ".join(f"{key} {value:.2f}" for key, value in result.items()))
+            print(f"{size:>8} books, loading every shard: sequential {preload(directory, 1) * 1000:.0f} ms, "
+                  f"worker processes {preload(directory, None) * 1000:.0f} ms")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
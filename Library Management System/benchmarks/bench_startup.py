@@ -0,0 +1,63 @@
+"""
+Measures the startup of main.py with ``python -X importtime``: the total import time, the modules that take
+the longest, and the import time of opening a small catalog of every format in a fresh interpreter.
+
+Run from the project root:
+    python -m benchmarks.bench_startup [runs] [top]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import synthetic_books, catalog_file
+from managers.loaders import supportedExtensions
+
+RUNS = 10
+TOP = 15
+
+
+def import_times(script: str) -> dict[str, tuple[int, int]]:
+    """
+    Runs a script in a fresh interpreter with -X importtime.
+
+    Args:
+        script (str): The script to run.
+
+    Returns:
+        dict[str, tuple[int, int]]: The self and cumulative import time of every module in microseconds.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True,
+                            check=True, cwd=os.getcwd()).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("| imported package"):
+            self_, cumulative, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(self_), int(cumulative)
+    return times
+
+
+def median_times(script: str, runs: int) -> dict[str, tuple[float, float]]:
+    samples = [import_times(script) for _ in range(runs)]
+    names = set.intersection(*(set(times) for times in samples))
+    return {name: (statistics.median(times[name][0] for times in samples),
+                   statistics.median(times[name][1] for times in samples)) for name in names}
+
+
+def main(runs: int, top: int):
+    times = median_times("import main", runs)
+    print(f"import main: {times['main'][1] / 1000:.1f} ms (median of {runs} runs)")
+    print(f"slowest {top} modules by their own import time:")
+    for name, (self_, cumulative) in sorted(times.items(), key=lambda item: -item[1][0])[:top]:
+        print(f"    {name:<40} {self_ / 1000:6.2f} ms self {cumulative / 1000:7.2f} ms cumulative")
+    books = synthetic_books(100)
+    for extension in supportedExtensions:
+        with catalog_file(books, extension) as path:
+            times = median_times(f"import main\nmain.Library(bookListFile={path!r})", runs)
+        total = sum(self_ for self_, _ in times.values())
+        print(f"import main and open a {extension:<6} catalog: {total / 1000:6.1f} ms of imports")
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*arguments, *[RUNS, TOP][len(arguments):])
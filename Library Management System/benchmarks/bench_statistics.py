@@ -0,0 +1,53 @@
+"""
+Compares the circulation reports of the library with sorting the whole catalog for every report, and
+measures what keeping the statistics up to date adds to issuing a book.
+
+Run from the project root:
+    python -m benchmarks.bench_statistics [sizes...]
+"""
+import heapq
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import synthetic_books, catalog_file, quiet, per_op
+from managers.library import Library
+
+SIZES = [10_000, 200_000]
+LIMIT = 10
+
+
+def sorted_reports(library: Library):
+    books = sorted(library.bList, key=lambda book: book["number_of_readings"], reverse=True)[:LIMIT]
+    authors = Counter()
+    for book in library.bList:
+        authors[book["author"]] += book["number_of_readings"]
+    issued = sum(not book["available"] for book in library.bList)
+    return books, heapq.nlargest(LIMIT, authors.items(), key=lambda item: item[1]), issued
+
+
+def reports(library: Library):
+    return library.most_read_books(LIMIT), library.most_read_authors(LIMIT), library.issued_count()
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        with catalog_file(synthetic_books(size)) as path, quiet():
+            library = Library(bookListFile=path)
+        start = time.perf_counter()
+        reports(library)
+        built = time.perf_counter() - start
+        rounds = range(20)
+        print(f"{size:>8} books: sort every time {per_op(lambda _: sorted_reports(library), rounds) / 1000:8.2f} ms, "
+              f"first report {built * 1000:8.2f} ms, later reports {per_op(lambda _: reports(library), rounds):6.1f} us")
+        uuids = [book["uuid"] for book in library.bList if book["available"]][:10_000]
+        with quiet():
+            half = len(uuids) // 2
+            cost = per_op(library.issue_book, uuids[:half])
+            library._observers.remove(library._statistics.observe)
+            baseline = per_op(library.issue_book, uuids[half:])
+        print(f"{size:>8} books: issue_book {baseline:.2f} us without statistics, {cost:.2f} us with them")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
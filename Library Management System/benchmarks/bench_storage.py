@@ -0,0 +1,68 @@
+"""
+Compares the memory used by the dict and compact storage backends of Library while loading a catalog and
+once it is loaded.
+
+Every measurement runs in a fresh interpreter so the peak resident set sizes do not mix, and the resident
+set size is measured without tracemalloc, whose bookkeeping would inflate it. The benchmark fails if the
+compact backend does not lower the peak memory and the peak resident set size.
+
+Run from the project root:
+    python -m benchmarks.bench_storage [sizes...]
+"""
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+from benchmarks.common import synthetic_books, catalog_file, quiet
+
+SIZES = [100_000, 1_000_000]
+BACKENDS = ["dict", "compact"]
+# The figures the compact backend must lower.
+CHECKED = ["peak (MiB)", "max RSS (MiB)"]
+
+
+def measure(path: str, storage: str, traced: bool) -> dict[str, float]:
+    from managers.library import Library
+
+    if not traced:
+        with quiet():
+            Library(bookListFile=path, indexes={}, storage=storage)
+        return {"max RSS (MiB)": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10}
+    tracemalloc.start()
+    with quiet():
+        library = Library(bookListFile=path, indexes={}, storage=storage)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del library
+    return {"held (MiB)": current / 2 ** 20, "peak (MiB)": peak / 2 ** 20}
+
+
+def run(path: str, storage: str, traced: bool) -> dict[str, float]:
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_storage", "--measure", path, storage,
+                             str(int(traced))], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main(sizes: list[int]) -> int:
+    failed = False
+    for size in sizes:
+        with catalog_file(synthetic_books(size)) as path:
+            results = {storage: run(path, storage, True) | run(path, storage, False) for storage in BACKENDS}
+        for storage, result in results.items():
+            print(f"{size:>10} books, {storage:>8}: " +
+                  ", ".join(f"{name} {value:.1f}" for name, value in result.items()))
+        ratios = {name: results["compact"][name] / results["dict"][name] for name in results["dict"]}
+        print(f"{size:>10} books, compact/dict: " + ", ".join(f"{name} {ratio:.0%}" for name, ratio in ratios.items()))
+        if regressed := [name for name in CHECKED if ratios[name] >= 1]:
+            print(f"{size:>10} books: the compact backend does not lower {', '.join(regressed)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        print(json.dumps(measure(sys.argv[2], sys.argv[3], sys.argv[4] == "1")))
+    else:
+        sys.exit(main([int(size) for size in sys.argv[1:]] or SIZES))
@@ -0,0 +1,124 @@
+import contextlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+import uuid as _uuid
+
+from utils import Book
+
+CONSONANTS = "bcdfghjklmnprstvwyz"
+VOWELS = "aeiou"
+TITLE_WORDS = 20_000
+AUTHORS = 50_000
+
+
+def _vocabulary(rand: random.Random, size: int) -> list[str]:
+    """
+    Generates distinct pronounceable pseudo-words in random order.
+    """
+    words = set()
+    while len(words) < size:
+        letters = [rand.choice(CONSONANTS if i % 2 == 0 else VOWELS) for i in range(rand.randint(3, 9))]
+        if rand.random() < 0.3:
+            letters.insert(rand.randrange(len(letters)), rand.choice(CONSONANTS))
+        words.add("".join(letters).capitalize())
+    words = sorted(words)
+    rand.shuffle(words)
+    return words
+
+
+def synthetic_books(count: int, seed: int = 1337) -> list[Book]:
+    """
+    Generates a reproducible synthetic catalog.
+
+    Titles are two to five words drawn from a Zipf-like distribution over a pseudo-word vocabulary, so a
+    few words are very common as in real catalogs, and authors repeat across books.
+
+    Args:
+        count (int): The number of books to generate.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[Book]: The generated books.
+    """
+    rand = random.Random(seed)
+    words = _vocabulary(rand, TITLE_WORDS)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    names = _vocabulary(rand, 2_000)
+    authors = [f"{rand.choice(names)} {rand.choice(names)}" for _ in range(min(AUTHORS, max(count // 10, 1)))]
+    books = []
+    for _ in range(count):
+        available = rand.random() > 0.2
+        issue_date = expire_date = ""
+        if not available:
+            day = rand.randint(1, 28)
+            issue_date = f"2024/06/{day:02d} 12:00:00"
+            expire_date = f"2024/07/{day:02d} 12:00:00"
+        books.append(Book(
+            uuid=str(_uuid.UUID(int=rand.getrandbits(128), version=4)),
+            name=" ".join(rand.choices(words, cum_weights=weights, k=rand.randint(2, 5))),
+            author=rand.choice(authors),
+            available=available,
+            issue_date=issue_date,
+            expire_date=expire_date,
+            number_of_readings=rand.randint(0, 100),
+        ))
+    return books
+
+
+@contextlib.contextmanager
+def catalog_file(books: list[Book], extension: str = ".json"):
+    """
+    Writes books to a temporary catalog file and removes it afterwards.
+
+    Args:
+        books (list[Book]): The books to write.
+        extension (str): The extension of the catalog file.
+
+    Yields:
+        str: The path of the catalog file.
+    """
+    from managers.loaders import dump_data
+
+    directory = tempfile.mkdtemp(prefix="kscrt-bench-")
+    path = os.path.join(directory, "books" + extension)
+    if extension == ".json":
+        with open(path, "w") as file:
+            json.dump(books, file)
+    else:
+        dump_data(books, path)
+    try:
+        yield path
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silences everything printed through Printer while benchmarking.
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def per_op(function, arguments) -> float:
+    """
+    Calls a function once for every argument and measures the average latency.
+
+    Args:
+        function (Callable): The function to measure.
+        arguments (list): The arguments to call the function with.
+
+    Returns:
+        float: The average latency of one call in microseconds.
+    """
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / max(len(arguments), 1) * 1e6
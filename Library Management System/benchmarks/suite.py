@@ -0,0 +1,222 @@
+"""
+Runs the loaders and the Library operations over synthetic catalogs for every registered extension, records
+wall times and peak memory to a JSON file and compares runs.
+
+Run from the project root:
+    python -m benchmarks.suite --sizes 10000 100000 --output results.json
+    python -m benchmarks.suite --large --extensions .json .csv .kbin .sqlite
+    python -m benchmarks.suite --sizes 10000 --compare results.json --threshold 0.2
+    python -m benchmarks.suite --diff old.json new.json
+
+Peak memory is traced in a second run of every operation, so tracing does not slow the timed one; pass
+--no-memory to skip it. Comparing exits with status 1 when an operation got slower, or used more memory,
+than the threshold allows; slowdowns of measurements shorter than --min-seconds in total are ignored.
+
+The default sizes stop at 100,000 books. --large adds a catalog of 1,000,000 books; the formats parsed or
+written as a whole (YAML, TOML) make it slow and memory hungry, so it is opt-in and best combined with
+--extensions.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.common import synthetic_books, catalog_file, quiet, per_op
+from managers.library import Library
+from managers.loaders import describe_codecs, get_loader, supportedExtensions
+
+SIZES = [10_000, 100_000]
+LARGE_SIZES = [1_000_000]
+OPERATIONS = 1_000
+NOW = datetime(2024, 7, 3)
+
+
+def measure(function, memory: bool) -> dict[str, float]:
+    """
+    Times a function and, when asked, traces its peak memory in a second call.
+
+    Args:
+        function (Callable): The function to measure.
+        memory (bool): Whether to trace the peak memory.
+
+    Returns:
+        dict[str, float]: The wall time in seconds and the peak of the traced memory in bytes.
+    """
+    start = time.perf_counter()
+    function()
+    result = {"seconds": time.perf_counter() - start}
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _key(book):
+    return book["uuid"]
+
+
+def run_extension(books: list, extension: str, memory: bool) -> dict[str, dict[str, float]]:
+    """
+    Measures the operations of one extension over a catalog.
+
+    Args:
+        books (list[Book]): The catalog.
+        extension (str): The extension of the catalog file.
+        memory (bool): Whether to trace the peak memory.
+
+    Returns:
+        dict[str, dict[str, float]]: The measurements by operation.
+    """
+    results = {}
+    rand = random.Random(42)
+    uuids = [book["uuid"] for book in rand.sample(books, min(OPERATIONS, len(books)))]
+    authors = [book["author"] for book in rand.sample(books, min(OPERATIONS, len(books)))]
+    expected = sorted(books, key=_key)
+    with catalog_file([], extension) as path:
+        loader = get_loader(path)(path)
+        results["save"] = measure(lambda: loader.save_iter(books), memory)
+        # A library of dicts opens its file with load; other storage backends and conversions stream it.
+        results["load"] = measure(loader.load, memory)
+        results["iter_load"] = measure(lambda: list(loader.iter_load()), memory)
+
+        def round_trip():
+            if sorted(loader.deserialize(loader.serialize(books)), key=_key) != expected:
+                raise AssertionError(f"The {extension} round trip changed the books")
+
+        results["round-trip"] = measure(round_trip, memory)
+        with quiet():
+            libraries = []
+            # The search cache would answer the repeated searches and hide the cost of search_by itself.
+            results["library"] = measure(lambda: libraries.append(Library(bookListFile=path, searchCacheSize=0)),
+                                         memory)
+            library = libraries[-1]
+            del libraries[:-1]
+            # per_op reports microseconds per call; the results keep seconds and the number of calls, which
+            # compare needs to tell noisy measurements apart.
+            search = per_op(lambda author: library.search_by("author", author), authors)
+            results["search_by"] = {"seconds": search / 1e6, "calls": len(authors)}
+            issue = per_op(lambda uuid: (library.issue_book(uuid), library.return_book(uuid)), uuids)
+            results["issue/return"] = {"seconds": issue / 1e6, "calls": len(uuids)}
+            results["outdated (first)"] = measure(lambda: library.outdated_books(NOW), False)
+            results["outdated"] = measure(lambda: library.outdated_books(NOW), False)
+    return results
+
+
+def run(sizes: list[int], extensions: list[str], memory: bool) -> dict:
+    """
+    Runs the suite.
+
+    Args:
+        sizes (list[int]): The numbers of books of the catalogs.
+        extensions (list[str]): The extensions to measure.
+        memory (bool): Whether to trace the peak memory.
+
+    Returns:
+        dict: The results, with the run environment under "meta" and the measurements by
+            "extension/size/operation" under "results".
+    """
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "codecs": describe_codecs(),
+        },
+        "results": {},
+    }
+    for size in sizes:
+        books = synthetic_books(size)
+        for extension in extensions:
+            for operation, result in run_extension(books, extension, memory).items():
+                key = f"{extension}/{size}/{operation}"
+                report["results"][key] = result
+                print(f"{key:<32} {format_result(result)}", flush=True)
+    return report
+
+
+def format_result(result: dict[str, float]) -> str:
+    """
+    Formats a measurement for the console.
+    """
+    text = f"{result['seconds'] * 1000:10.3f} ms"
+    if "peak_bytes" in result:
+        text += f" {result['peak_bytes'] / 2 ** 20:9.1f} MiB"
+    return text
+
+
+def compare(old: dict, new: dict, threshold: float, minSeconds: float = 0.01) -> list[str]:
+    """
+    Compares two runs and prints the ratio of every measurement they share.
+
+    Args:
+        old (dict): The baseline results.
+        new (dict): The new results.
+        threshold (float): The relative growth tolerated before a measurement counts as a regression.
+        minSeconds (float): Measurements that took less time in total are too noisy to count as regressions.
+
+    Returns:
+        list[str]: The keys of the measurements that regressed.
+    """
+    regressions = []
+    for key, result in new["results"].items():
+        if (baseline := old["results"].get(key)) is None:
+            continue
+        flags = []
+        for metric in ("seconds", "peak_bytes"):
+            if metric in result and baseline.get(metric):
+                ratio = result[metric] / baseline[metric]
+                flags.append(f"{metric} x{ratio:.2f}")
+                noisy = metric == "seconds" and result[metric] * result.get("calls", 1) < minSeconds
+                if ratio > 1 + threshold and not noisy:
+                    flags[-1] += " REGRESSION"
+                    regressions.append(f"{key} {metric}")
+        print(f"{key:<32} " + ", ".join(flags))
+    return regressions
+
+
+def main(arguments: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--large", action="store_true", help=f"also run the sizes {LARGE_SIZES}")
+    parser.add_argument("--extensions", nargs="+", default=list(supportedExtensions))
+    parser.add_argument("--output", help="the JSON file to write the results to")
+    parser.add_argument("--compare", help="a JSON results file to compare the run with")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="compare two results files without running")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-seconds", dest="minSeconds", type=float, default=0.01,
+                        help="ignore slowdowns of measurements that took less time in total")
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    options = parser.parse_args(arguments)
+
+    if options.diff:
+        with open(options.diff[0]) as old, open(options.diff[1]) as new:
+            return 1 if compare(json.load(old), json.load(new), options.threshold, options.minSeconds) else 0
+    unknown = [extension for extension in options.extensions if extension not in supportedExtensions]
+    if unknown:
+        parser.error(f"unsupported extensions: {', '.join(unknown)}")
+    sizes = options.sizes + [size for size in LARGE_SIZES if options.large and size not in options.sizes]
+    report = run(sizes, options.extensions, options.memory)
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report, file, indent=3)
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        if regressions := compare(baseline, report, options.threshold, options.minSeconds):
+            print(f"{len(regressions)} regressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
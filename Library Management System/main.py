@@ -1,18 +1,38 @@
-from datetime import datetime
+import sys
+from itertools import chain, islice
 from os.path import join as join_path
+from typing import Iterable
 
 from managers.library import Library
-from utils import validate_integer, validate_book_attributes, Printer
+from utils import validate_integer, validate_search_mode, Printer
 
 
 class MainApplication:
+    # The number of books listed before asking to show more, None to list all of them at once.
+    pageSize: int | None = 20
+    statisticsSize = 10
+
     def __init__(self, fileName: str = join_path('resources', 'books.json')):
-        self.library = Library(bookListFile=fileName)
+        self.library = Library(bookListFile=fileName, journal=True)
         self.printer = Printer()
-
-    @property
-    def bookIDs(self):
-        return {(i + 1): b['uuid'] for i, b in enumerate(self.library.bList)}
+        if not sys.stdout.isatty():
+            # Output that is piped or redirected is dumped at once instead of prompting for every page.
+            self.pageSize = None
+        self.bookIDs: dict[int, str] = {(i + 1): uuid for i, uuid in enumerate(self.library.uuids())}
+        self.bookUUIDs: dict[str, int] = {uuid: id for id, uuid in self.bookIDs.items()}
+        self.library.subscribe(self._on_library_change)
+
+    def _on_library_change(self, event, book, position=None, moved=None, **details):
+        if event == "add":
+            self.bookIDs[position + 1] = book['uuid']
+            self.bookUUIDs[book['uuid']] = position + 1
+        elif event == "remove":
+            del self.bookUUIDs[book['uuid']]
+            last_id = len(self.bookIDs)
+            if moved is not None:
+                self.bookIDs[position + 1] = moved['uuid']
+                self.bookUUIDs[moved['uuid']] = position + 1
+            del self.bookIDs[last_id]
 
     def __call__(self):
         while True:
@@ -39,6 +59,8 @@ class MainApplication:
                     case 9:
                         if self.exit_application():
                             break
+                    case 10:
+                        self.display_statistics()
                     case _:
                         self.invalid_choice()
             except KeyboardInterrupt:
@@ -59,16 +81,34 @@ class MainApplication:
         self.printer.print("7. Display Outdated Issued Books")
         self.printer.print("8. Clear console")
         self.printer.print("9. Exit")
+        self.printer.print("10. Display Statistics")
 
     def display_books(self):
-        if len(self.bookIDs) != 0:
-            for id, uuid in self.bookIDs.items():
-                self.printer.print(f"Book {id}:")
-                with self.printer:
-                    self.library.display_book(uuid)
-        else:
+        if not self._display_pages((f"Book {id}:", uuid) for id, uuid in self.bookIDs.items()):
             self.printer.error("No books found!")
 
+    def _display_pages(self, books: Iterable[tuple[str, str]]) -> bool:
+        books = iter(books)
+        if (first := next(books, None)) is None:
+            return False
+        books, pageSize, number = chain((first,), books), self.pageSize, 1
+        while True:
+            with self.printer.buffered():
+                for title, uuid in islice(books, pageSize):
+                    self.printer.print(title)
+                    with self.printer:
+                        self.library.display_book(uuid)
+            if (first := next(books, None)) is None:
+                break
+            books, number = chain((first,), books), number + 1
+            answer = self.printer.input(f"Show page {number}? (y/n/all): ",
+                                        lambda s: s.lower() if s.lower() in ["y", "n", "all"] else None)
+            if answer == "n":
+                break
+            if answer == "all":
+                pageSize = None
+        return True
+
     def issue_book(self):
         uuid = self.bookIDs[self.printer.input("Enter the ID of the book you want to issue: ",
                                                lambda s: i if (i := validate_integer(s)) in self.bookIDs else None)]
@@ -85,17 +125,30 @@ class MainApplication:
         self.library.add_book(title, author)
 
     def search_book(self):
-        attribute = self.printer.input("Enter the attribute to search by (e.g., name, author, available): ",
-                                       validate_book_attributes)
+        attribute = self.printer.input("Enter the attribute to search by (e.g., name, author, available), "
+                                       "'query' for an advanced or 'fuzzy' for a fuzzy search: ", validate_search_mode)
+        if attribute == "query":
+            return self.query_books()
+        if attribute == "fuzzy":
+            return self.fuzzy_search_books()
         value = self.printer.input(f"Enter the value for {attribute}: ")
         uuids = self.library.search_by(attribute, value)
-        if uuids:
-            for id, uuid in self.bookIDs.items():
-                if uuid in uuids:
-                    self.printer.print(f"Book {id}:")
-                    with self.printer:
-                        self.library.display_book(uuid)
-        else:
+        ids = sorted(self.bookUUIDs[uuid] for uuid in uuids) if uuids else []
+        if not self._display_pages((f"Book {id}:", self.bookIDs[id]) for id in ids):
+            self.printer.error("No books found!")
+
+    def query_books(self):
+        query = self.printer.input("Enter the query (e.g., author prefix Ad and available "
+                                   "order by number_of_readings desc limit 20): ")
+        uuids = self.library.query(query)
+        if not self._display_pages((f"Book {self.bookUUIDs[uuid]}:", uuid) for uuid in uuids):
+            self.printer.error("No books found!")
+
+    def fuzzy_search_books(self):
+        text = self.printer.input("Enter a part of the title or author: ")
+        matches = self.library.fuzzy_search(text)
+        if not self._display_pages((f"Book {self.bookUUIDs[uuid]} ({score:.0%} match):", uuid)
+                                   for uuid, score in matches):
             self.printer.error("No books found!")
 
     def remove_book(self):
@@ -110,18 +163,26 @@ class MainApplication:
             self.printer.print("Book was not removed.")
 
     def display_outdated_issued_books(self):
-        today = datetime.now()
-        has_outdated_books = False
-        for book in self.library.bList:
-            if not book['available'] and datetime.strptime(book['expire_date'], "%Y/%m/%d %H:%M:%S") < today:
-                if not has_outdated_books:
-                    has_outdated_books = True
-                self.printer.print(f"Book {book['uuid']} is outdated!")
-                with self.printer:
-                    self.library.display_book(book['uuid'])
-        if not has_outdated_books:
+        outdated = self.library.outdated_books()
+        if not self._display_pages((f"Book {uuid} is outdated!", uuid) for uuid in outdated):
             self.printer.print("No outdated books found!")
 
+    def display_statistics(self):
+        if not self.bookIDs:
+            return self.printer.error("No books found!")
+        with self.printer.buffered():
+            self.printer.print(f"Issued books: {self.library.issued_count()} of {len(self.bookIDs)}")
+            self.printer.print("Most read books:")
+            with self.printer:
+                for uuid, readings in self.library.most_read_books(self.statisticsSize):
+                    book = self.library.get_book(uuid)
+                    self.printer.print(f"Book {self.bookUUIDs[uuid]}: {book['name']} by {book['author']} "
+                                       f"({readings} readings)")
+            self.printer.print("Most read authors:")
+            with self.printer:
+                for author in self.library.most_read_authors(self.statisticsSize):
+                    self.printer.print(f"{author.author}: {author.readings} readings of {author.books} books")
+
     def clear_console(self):
         self.printer.clear()
 
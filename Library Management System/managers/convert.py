@@ -0,0 +1,193 @@
+"""
+Converts a catalog file from one registered format to another without building a Library.
+
+Run from the project root:
+    python -m managers.convert resources/books.csv resources/books.yaml
+    python -m managers.convert books.json books.kbin --pipeline process
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from itertools import islice
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from managers.journal import Journal
+from managers.loaders import get_loader, dump_data, supportedExtensions
+from utils import Book
+
+PIPELINES = ("inline", "thread", "process")
+
+
+class Progress(NamedTuple):
+    """
+    The state of a running conversion.
+
+    Attributes:
+        books (int): The number of books converted so far.
+        seconds (float): The seconds since the conversion started.
+    """
+    books: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.books / self.seconds if self.seconds else 0.0
+
+
+def _chunks(books: Iterable[Book], chunkSize: int) -> Iterator[list[Book]]:
+    books = iter(books)
+    while chunk := list(islice(books, chunkSize)):
+        yield chunk
+
+
+def _read(sourcePath: str) -> Iterator[Book]:
+    """
+    Streams the books of a catalog file with the changes saved to its journal since the last compaction.
+    """
+    return Journal(sourcePath).replay_iter(get_loader(sourcePath)(sourcePath).iter_load())
+
+
+def _produce(sourcePath: str, channel, chunkSize: int) -> None:
+    """
+    Reads the books of the source file and puts them into a channel in chunks, followed by None.
+
+    An exception raised while reading is put into the channel in place of the end marker.
+    """
+    try:
+        for chunk in _chunks(_read(sourcePath), chunkSize):
+            channel.put([dict(book) for book in chunk])
+    except BaseException as error:
+        channel.put(error)
+        return
+    channel.put(None)
+
+
+def _consume(channel) -> Iterator[Book]:
+    while (chunk := channel.get()) is not None:
+        if isinstance(chunk, BaseException):
+            raise chunk
+        yield from chunk
+
+
+def _piped(sourcePath: str, pipeline: str, chunkSize: int, queueSize: int) -> Iterator[Book]:
+    """
+    Reads the books of the source file in a separate thread or process and yields them from a bounded queue.
+    """
+    if pipeline == "thread":
+        channel = queue.Queue(queueSize)
+        worker = threading.Thread(target=_produce, args=(sourcePath, channel, chunkSize), daemon=True)
+    else:
+        channel = multiprocessing.Queue(queueSize)
+        worker = multiprocessing.Process(target=_produce, args=(sourcePath, channel, chunkSize), daemon=True)
+    worker.start()
+    try:
+        yield from _consume(channel)
+    finally:
+        if pipeline == "process":
+            worker.terminate()
+        while worker.is_alive():
+            # Unblocks a reader thread waiting on the full queue after the writer stopped early.
+            try:
+                channel.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        worker.join()
+
+
+def convert(sourcePath: str, targetPath: str, progress: Callable[[Progress], None] | None = None,
+            pipeline: str = "inline", every: int = 10_000, chunkSize: int = 1_000, queueSize: int = 8) -> Progress:
+    """
+    Streams the books of a catalog file into a file of another format.
+
+    The books are read with ``iter_load``, with the changes of the journal of the source applied, and written
+    with ``save_iter``, so formats that stream keep only a few books in memory at a time; YAML and TOML files
+    are still parsed or written as a whole. With the "thread" or "process" pipeline the source is parsed in a
+    worker that hands chunks of ``chunkSize`` books to the writer through a queue of at most ``queueSize``
+    chunks.
+
+    Args:
+        sourcePath (str): The path of the catalog file to convert.
+        targetPath (str): The path of the file to write; its extension selects the format.
+        progress (Callable[[Progress], None] | None): Called every ``every`` books and once at the end.
+        pipeline (str): One of "inline", "thread" and "process".
+        every (int): The number of books between two progress reports.
+        chunkSize (int): The number of books passed through the queue at once.
+        queueSize (int): The maximum number of chunks waiting in the queue.
+
+    Returns:
+        Progress: The number of converted books and the seconds the conversion took.
+
+    Raises:
+        ValueError: If the pipeline is unknown or both paths name the same file.
+        TypeError: If the format of either file is unsupported.
+        FileExistsError: If the source file does not exist.
+    """
+    if pipeline not in PIPELINES:
+        raise ValueError(f"Unknown pipeline {pipeline}, expected one of {', '.join(PIPELINES)}")
+    get_loader(sourcePath)  # Fails early if the source is missing or unsupported.
+    if os.path.splitext(targetPath)[1].lower() not in supportedExtensions:
+        raise TypeError(f"File format of {targetPath} is unsupported!!")
+    if os.path.exists(targetPath) and os.path.samefile(sourcePath, targetPath):
+        raise ValueError(f"Cannot convert {sourcePath} into itself")
+
+    start = time.perf_counter()
+    count = 0
+
+    def counted(books: Iterable[Book]) -> Iterator[Book]:
+        nonlocal count
+        for book in books:
+            yield book
+            count += 1
+            if progress is not None and count % every == 0:
+                progress(Progress(count, time.perf_counter() - start))
+
+    if pipeline == "inline":
+        books = _read(sourcePath)
+    else:
+        books = _piped(sourcePath, pipeline, chunkSize, queueSize)
+    # The books are written next to the target first, so a failed conversion leaves an existing target intact.
+    directory, fileName = os.path.split(targetPath)
+    partialPath = os.path.join(directory, f".{fileName}.partial{os.path.splitext(fileName)[1]}")
+    try:
+        dump_data(counted(books), partialPath)
+        os.replace(partialPath, targetPath)
+    finally:
+        books.close()
+        if os.path.exists(partialPath):
+            os.remove(partialPath)
+    result = Progress(count, time.perf_counter() - start)
+    if progress is not None:
+        progress(result)
+    return result
+
+
+def _report(state: Progress) -> None:
+    sys.stderr.write(f"\r{state.books:,} books in {state.seconds:.1f}s ({state.rate:,.0f} books/s)")
+    sys.stderr.flush()
+
+
+def main(arguments: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m managers.convert", description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("source", help="the catalog file to convert")
+    parser.add_argument("target", help="the file to write, in the format of its extension")
+    parser.add_argument("--pipeline", choices=PIPELINES, default="inline",
+                        help="parse the source in a separate thread or process")
+    parser.add_argument("--every", type=int, default=10_000, help="the number of books between progress reports")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    options = parser.parse_args(arguments)
+    try:
+        convert(options.source, options.target, None if options.quiet else _report, options.pipeline,
+                options.every)
+    except (TypeError, ValueError, FileExistsError) as error:
+        parser.exit(1, f"{error}\n")
+    if not options.quiet:
+        sys.stderr.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+import heapq
+from typing import Iterable
+
+from utils import Book, date2timestamp
+
+
+class DueDateTracker:
+    """
+    Tracks the expire dates of the issued books in a min-heap.
+
+    Expire dates are parsed once, when a book is issued or the tracker is built, and kept as timestamps.
+    Returned or removed books are not searched for in the heap; their entries become stale and are skipped
+    because they no longer match the current expire date of the book. The heap is rebuilt once stale
+    entries make up half of it.
+
+    Attributes:
+        heap (list[tuple[int, str]]): The (expire timestamp, UUID) entries of the issued books.
+        _expiry (dict[str, int]): The current expire timestamp of every issued book.
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[int, str]] = []
+        self._expiry: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def build(self, books: Iterable[Book]) -> None:
+        """
+        Tracks every issued book of a collection.
+
+        Args:
+            books (Iterable[Book]): The books to track.
+        """
+        for book in books:
+            if not book["available"] and (timestamp := date2timestamp(book.get("expire_date"))) is not None:
+                self._expiry[book["uuid"]] = timestamp
+        self.heap = [(timestamp, uuid) for uuid, timestamp in self._expiry.items()]
+        heapq.heapify(self.heap)
+
+    def track(self, uuid: str, expire_date: str | None) -> None:
+        """
+        Starts tracking an issued book or updates its expire date.
+
+        Args:
+            uuid (str): The UUID of the book.
+            expire_date (str | None): The expire date of the book; books without one are not tracked.
+        """
+        if (timestamp := date2timestamp(expire_date)) is None:
+            self.untrack(uuid)
+            return
+        self._expiry[uuid] = timestamp
+        heapq.heappush(self.heap, (timestamp, uuid))
+
+    def untrack(self, uuid: str) -> None:
+        """
+        Stops tracking a book, leaving its heap entry stale.
+
+        Args:
+            uuid (str): The UUID of the book.
+        """
+        if self._expiry.pop(uuid, None) is None:
+            return
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self._expiry):
+            self.heap = [(timestamp, uuid) for uuid, timestamp in self._expiry.items()]
+            heapq.heapify(self.heap)
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Applies a mutation event of the library to the tracker.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        if event == "remove":
+            self.untrack(book["uuid"])
+        elif event == "add" or "available" in previous or "expire_date" in previous:
+            if book["available"]:
+                self.untrack(book["uuid"])
+            else:
+                self.track(book["uuid"], book.get("expire_date"))
+
+    def overdue(self, now: int) -> list[str]:
+        """
+        Lists the issued books that expired before a point in time, the longest overdue first.
+
+        The heap is walked as a tree without popping: a node is only visited when its parent expired, so
+        listing k overdue books costs O(k log k) plus the stale entries met on the way.
+
+        Args:
+            now (int): The point in time, as a timestamp made by date2timestamp.
+
+        Returns:
+            list[str]: The UUIDs of the overdue books.
+        """
+        heap, expiry = self.heap, self._expiry
+        result = []
+        listed = set()
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            (timestamp, uuid), position = heapq.heappop(frontier)
+            if timestamp >= now:
+                break
+            if expiry.get(uuid) == timestamp and uuid not in listed:
+                listed.add(uuid)
+                result.append(uuid)
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
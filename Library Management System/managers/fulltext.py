@@ -0,0 +1,266 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from itertools import chain, islice, repeat
+from typing import Iterable
+
+from utils import Book
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Splits a text into the set of trigrams of its words.
+
+    Words are lower-cased and padded with two spaces in front and one behind, so short words and word
+    beginnings still produce trigrams.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        set[str]: The trigrams of the text.
+    """
+    result = set()
+    for word in _words(text):
+        result.update(_word_trigrams(word))
+    return result
+
+
+def _words(text: str) -> list[str]:
+    return [word for word in _NON_WORD.split(text.lower()) if word]
+
+
+def _word_trigrams(word: str) -> set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    An inverted trigram index for fuzzy searches over text attributes of the books.
+
+    The index stores every distinct (case-insensitive) attribute value once as a term, so an author with
+    thousands of books costs a single entry, and remembers the UUIDs of the books using each term. Trigrams
+    are indexed per distinct word rather than per term: the posting lists map trigrams to word IDs, and every
+    word keeps the IDs of the terms containing it. The vocabulary grows far slower than the catalog, so the
+    trigram postings a search counts stay small even for millions of books. Terms no book uses any more leave
+    a tombstone that is skipped while searching; the index is rebuilt once tombstones make up half of it.
+
+    Attributes:
+        attributes (tuple[str, ...]): The attributes whose values are indexed.
+        postings (dict[str, array]): The IDs of the words containing every trigram.
+        _words (dict[str, int]): The word ID of every indexed word.
+        _wordTerms (list[array]): The IDs of the terms containing every word.
+        _terms (list[str | None]): The term of every term ID, None for dropped terms.
+        _termWords (list[tuple[int, ...]]): The IDs of the distinct words of every term.
+        _owners (list[str | set[str] | None]): The UUID, or set of UUIDs, of the books using every term.
+        _termIDs (dict[str, int]): The term ID of every live term.
+        scanBudget (int): The maximum number of terms a search collects as candidates.
+        rescored (int): The number of leading candidates whose trigrams are compared with the search text.
+        spread (float): The share of the best score a match needs to be returned.
+    """
+
+    scanBudget = 1024
+    rescored = 32
+    spread = 0.8
+
+    def __init__(self, attributes: tuple[str, ...] = ("name", "author")):
+        """
+        Initializes a new instance of the TrigramIndex class.
+
+        Args:
+            attributes (tuple[str, ...]): The attributes whose values are indexed.
+        """
+        self.attributes = attributes
+        self.postings: dict[str, array] = {}
+        self._words: dict[str, int] = {}
+        self._wordTerms: list[array] = []
+        self._terms: list[str | None] = []
+        self._termWords: list[tuple[int, ...]] = []
+        self._owners: list[str | set[str] | None] = []
+        self._termIDs: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._termIDs)
+
+    def build(self, books: Iterable[Book]) -> None:
+        """
+        Indexes a collection of books.
+
+        Args:
+            books (Iterable[Book]): The books to index.
+        """
+        for book in books:
+            for attribute in self.attributes:
+                self.add(book["uuid"], book.get(attribute))
+
+    def add(self, uuid: str, value: str | None) -> None:
+        """
+        Indexes an attribute value of a book.
+
+        Args:
+            uuid (str): The UUID of the book.
+            value (str | None): The attribute value.
+        """
+        if not value:
+            return
+        term = value.lower()
+        if (termID := self._termIDs.get(term)) is None:
+            termID = self._termIDs[term] = len(self._terms)
+            self._terms.append(term)
+            self._owners.append(uuid)
+            wordIDs = tuple(dict.fromkeys(self._word_id(word) for word in _words(term)))
+            self._termWords.append(wordIDs)
+            for wordID in wordIDs:
+                self._wordTerms[wordID].append(termID)
+        elif isinstance(owners := self._owners[termID], set):
+            owners.add(uuid)
+        elif owners != uuid:
+            self._owners[termID] = {owners, uuid}
+
+    def _word_id(self, word: str) -> int:
+        if (wordID := self._words.get(word)) is None:
+            wordID = self._words[word] = len(self._wordTerms)
+            self._wordTerms.append(array('I'))
+            postings = self.postings
+            for gram in _word_trigrams(word):
+                if (posting := postings.get(gram)) is None:
+                    posting = postings[gram] = array('I')
+                posting.append(wordID)
+        return wordID
+
+    def discard(self, uuid: str, value: str | None) -> None:
+        """
+        Removes an attribute value of a book from the index.
+
+        Args:
+            uuid (str): The UUID of the book.
+            value (str | None): The attribute value.
+        """
+        if not value or (termID := self._termIDs.get(value.lower())) is None:
+            return
+        owners = self._owners[termID]
+        if isinstance(owners, set):
+            owners.discard(uuid)
+            if len(owners) == 1:
+                self._owners[termID] = next(iter(owners))
+        elif owners == uuid:
+            del self._termIDs[self._terms[termID]]
+            self._terms[termID] = self._owners[termID] = None
+            if len(self._terms) > 1024 and len(self._termIDs) * 2 < len(self._terms):
+                self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Rebuilds the index from the live terms, dropping every tombstone and unused word.
+        """
+        live = [(term, owners) for term, owners in zip(self._terms, self._owners) if term is not None]
+        self.postings, self._words, self._wordTerms = {}, {}, []
+        self._terms, self._termWords, self._owners, self._termIDs = [], [], [], {}
+        for term, owners in live:
+            for uuid in (owners if isinstance(owners, set) else (owners,)):
+                self.add(uuid, term)
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Applies a mutation event of the library to the index.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        for attribute in self.attributes:
+            if event == "add":
+                self.add(book["uuid"], book.get(attribute))
+            elif event == "remove":
+                self.discard(book["uuid"], book.get(attribute))
+            elif event == "update" and attribute in previous:
+                self.discard(book["uuid"], previous[attribute])
+                self.add(book["uuid"], book.get(attribute))
+
+    def search(self, text: str, limit: int = 10, threshold: float = 0.5) -> list[tuple[str, float]]:
+        """
+        Finds the books with a name or author containing most of the trigrams of a search text.
+
+        A term is scored by the share of the search trigrams it contains; ties are broken by the Jaccard
+        similarity of the two trigram sets, preferring the closer matches. A book gets the best score of
+        its terms. Matches scoring below ``spread`` times the best match are dropped.
+
+        The work of a search is bounded, whatever the size of the catalog. Every search word is matched
+        against the vocabulary, exactly or, when unknown, by the words sharing at least ``spread`` times as
+        many trigrams as its closest word. Candidates are the terms containing the rarest matched word, and
+        those of the other words while at most ``scanBudget`` terms are collected. They are ranked by the
+        trigrams their words share with the search text, and only the ``rescored`` leading ones are scored
+        exactly. The search is therefore approximate: a close match reached only through common words, or
+        tied with many reorderings of its words, may be missed.
+
+        Args:
+            text (str): The search text.
+            limit (int): The maximum number of results.
+            threshold (float): The minimum share of search trigrams a result contains.
+
+        Returns:
+            list[tuple[str, float]]: The UUIDs of the best matches with their scores, best first.
+        """
+        words = list(dict.fromkeys(_words(text)))
+        grams = set().union(*map(_word_trigrams, words))
+        if not grams or limit <= 0:
+            return []
+        total = len(grams)
+        empty = array('I')
+        postings, wordTerms = self.postings, self._wordTerms
+        shared = Counter(chain.from_iterable(postings.get(gram, empty) for gram in grams))
+
+        sources: list[tuple[int, tuple[int, ...]]] = []
+        for word in words:
+            if (wordID := self._words.get(word)) is not None:
+                sources.append((len(wordTerms[wordID]), (wordID,)))
+                continue
+            counts = Counter(chain.from_iterable(postings.get(gram, empty) for gram in _word_trigrams(word)))
+            if counts:
+                least = math.ceil(max(counts.values()) * self.spread)
+                similar = tuple(wordID for wordID, count in counts.items() if count >= least)
+                sources.append((sum(len(wordTerms[wordID]) for wordID in similar), similar))
+        sources.sort(key=lambda source: source[0])
+
+        candidates: set[int] = set()
+        collected = 0
+        for size, wordIDs in sources:
+            if collected and collected + size > self.scanBudget:
+                break
+            candidates.update(islice(chain.from_iterable(wordTerms[wordID] for wordID in wordIDs), self.scanBudget))
+            collected += size
+
+        terms, termWords, weight = self._terms, self._termWords, shared.get
+        leading = heapq.nlargest(self.rescored, candidates,
+                                 key=lambda termID: sum(map(weight, termWords[termID], repeat(0))))
+        ranking: list[tuple[int, float, int]] = []
+        for termID in leading:
+            if (term := terms[termID]) is None:
+                continue
+            termGrams = trigrams(term)
+            count = len(termGrams & grams)
+            if count >= threshold * total:
+                ranking.append((count, count / (total + len(termGrams) - count), termID))
+        if not ranking:
+            return []
+        ranking.sort(reverse=True)
+        cutoff = math.ceil(ranking[0][0] * self.spread)
+
+        results: dict[str, float] = {}
+        for count, _, termID in ranking:
+            if count < cutoff:
+                break
+            owners = self._owners[termID]
+            for uuid in (owners if isinstance(owners, set) else (owners,)):
+                if uuid not in results:
+                    results[uuid] = count / total
+                    if len(results) == limit:
+                        return list(results.items())
+        return list(results.items())
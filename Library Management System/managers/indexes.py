@@ -0,0 +1,286 @@
+import bisect
+from abc import ABCMeta, abstractmethod
+from typing import Any, Iterable, Iterator
+
+from utils import Book
+
+
+class BaseIndex(metaclass=ABCMeta):
+    """
+    Abstract base class for the secondary indexes of a library.
+
+    An index maps the values of one book attribute to the UUIDs of the books holding them.
+    It is kept up to date by subscribing ``observe`` to the mutation events of the library.
+
+    Attributes:
+        attribute (str): The book attribute this index covers.
+    """
+
+    def __init__(self, attribute: str):
+        """
+        Initializes a new instance of the BaseIndex class.
+
+        Args:
+            attribute (str): The book attribute this index covers.
+        """
+        self.attribute = attribute
+
+    def build(self, books: Iterable[Book]) -> None:
+        """
+        Indexes a collection of books.
+
+        Args:
+            books (Iterable[Book]): The books to index.
+        """
+        for book in books:
+            self.add(book["uuid"], book.get(self.attribute))
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Applies a mutation event of the library to the index.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        if event == "add":
+            self.add(book["uuid"], book.get(self.attribute))
+        elif event == "remove":
+            self.discard(book["uuid"], book.get(self.attribute))
+        elif event == "update" and self.attribute in previous:
+            self.discard(book["uuid"], previous[self.attribute])
+            self.add(book["uuid"], book.get(self.attribute))
+
+    @staticmethod
+    def normalize(value: Any) -> Any:
+        """
+        Converts an attribute value to the key it is indexed under.
+
+        Args:
+            value (Any): The attribute value.
+
+        Returns:
+            Any: The index key.
+        """
+        return value.lower() if isinstance(value, str) else value
+
+    @staticmethod
+    def parse(value: str) -> Any:
+        """
+        Converts a search string to the key it is looked up by.
+
+        Args:
+            value (str): The search string.
+
+        Returns:
+            Any: The index key.
+        """
+        return value.lower()
+
+    @abstractmethod
+    def add(self, uuid: str, value: Any) -> None:
+        """
+        Adds a book to the index.
+
+        Raises:
+            NotImplementedError: This method must be implemented by a subclass.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def discard(self, uuid: str, value: Any) -> None:
+        """
+        Removes a book from the index.
+
+        Raises:
+            NotImplementedError: This method must be implemented by a subclass.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def lookup(self, key: Any) -> set[str]:
+        """
+        Finds the books whose attribute equals a key.
+
+        Raises:
+            NotImplementedError: This method must be implemented by a subclass.
+        """
+        raise NotImplementedError
+
+    def select(self, operator: str, key: Any) -> list[set[str]] | None:
+        """
+        Finds the books whose attribute satisfies a comparison.
+
+        Args:
+            operator (str): One of "=", "<", "<=", ">", ">=" or "prefix".
+            key (Any): The normalized value to compare with.
+
+        Returns:
+            list[set[str]] | None: The UUID sets whose union is the result, or None if the index cannot answer it.
+        """
+        return [self.lookup(key)] if operator == "=" else None
+
+
+class HashIndex(BaseIndex):
+    """
+    A case-insensitive equality index keeping a set of UUIDs for every distinct value.
+
+    Attributes:
+        buckets (dict[Any, set[str]]): The UUIDs of the books by their normalized value.
+    """
+
+    def __init__(self, attribute: str):
+        super().__init__(attribute)
+        self.buckets: dict[Any, set[str]] = {}
+        self._sortedKeys: list | None = None
+
+    def add(self, uuid, value):
+        key = self.normalize(value)
+        if (bucket := self.buckets.get(key)) is None:
+            bucket = self.buckets[key] = set()
+            self._key_added(key)
+        bucket.add(uuid)
+
+    def discard(self, uuid, value):
+        key = self.normalize(value)
+        if (bucket := self.buckets.get(key)) is not None:
+            bucket.discard(uuid)
+            if not bucket:
+                del self.buckets[key]
+                self._key_removed(key)
+
+    def lookup(self, key):
+        return self.buckets.get(key, set())
+
+    def select(self, operator, key):
+        if operator == "=":
+            return [self.lookup(key)]
+        keys = self.sorted_keys()
+        try:
+            match operator:
+                case "prefix":
+                    start = bisect.bisect_left(keys, key)
+                    stop = start
+                    while stop < len(keys) and keys[stop].startswith(key):
+                        stop += 1
+                    selected = keys[start:stop]
+                case "<":
+                    selected = keys[:bisect.bisect_left(keys, key)]
+                case "<=":
+                    selected = keys[:bisect.bisect_right(keys, key)]
+                case ">":
+                    selected = keys[bisect.bisect_right(keys, key):]
+                case ">=":
+                    selected = keys[bisect.bisect_left(keys, key):]
+                case _:
+                    return None
+        except (TypeError, AttributeError):
+            return None
+        return [self.lookup(key) for key in selected]
+
+    def sorted_keys(self) -> list:
+        """
+        Returns the distinct indexed values in ascending order, leaving out missing (None) values.
+
+        The order is computed lazily and cached until a value is added or removed.
+
+        Returns:
+            list: The sorted distinct values.
+        """
+        if self._sortedKeys is None:
+            self._sortedKeys = sorted(key for key in self.buckets if key is not None)
+        return self._sortedKeys
+
+    def ordered(self, descending: bool = False) -> Iterator[set[str]]:
+        """
+        Iterates over the UUID sets in the order of their values.
+
+        Args:
+            descending (bool): Whether to start from the greatest value.
+
+        Yields:
+            set[str]: The UUIDs of the books sharing a value.
+        """
+        keys = self.sorted_keys()
+        for key in (reversed(keys) if descending else keys):
+            yield self.lookup(key)
+
+    def _key_added(self, key: Any) -> None:
+        self._sortedKeys = None
+
+    def _key_removed(self, key: Any) -> None:
+        self._sortedKeys = None
+
+
+class UniqueIndex(HashIndex):
+    """
+    A case-insensitive equality index for attributes that are unique per book, such as the UUID.
+
+    Attributes:
+        buckets (dict[Any, str]): The UUID of the book by its normalized value.
+    """
+
+    def add(self, uuid, value):
+        self.buckets[self.normalize(value)] = uuid
+        self._sortedKeys = None
+
+    def discard(self, uuid, value):
+        key = self.normalize(value)
+        if self.buckets.get(key) == uuid:
+            del self.buckets[key]
+            self._sortedKeys = None
+
+    def lookup(self, key):
+        return {uuid} if (uuid := self.buckets.get(key)) is not None else set()
+
+
+class BooleanIndex(HashIndex):
+    """
+    An index splitting the books into the sets of true and false values of a flag.
+    """
+
+    @staticmethod
+    def normalize(value):
+        return bool(value)
+
+    @staticmethod
+    def parse(value):
+        return value.lower() == 'true'
+
+
+class SortedIndex(HashIndex):
+    """
+    An index for numeric attributes which additionally keeps its distinct values in order.
+
+    Attributes:
+        keys (list): The distinct indexed values in ascending order.
+    """
+
+    def __init__(self, attribute: str):
+        super().__init__(attribute)
+        self.keys: list = []
+
+    @staticmethod
+    def parse(value):
+        return int(value)
+
+    def sorted_keys(self):
+        return self.keys
+
+    def _key_added(self, key):
+        bisect.insort(self.keys, key)
+
+    def _key_removed(self, key):
+        del self.keys[bisect.bisect_left(self.keys, key)]
+
+
+# The indexes a library maintains unless told otherwise.
+DEFAULT_INDEXES: dict[str, type[BaseIndex]] = {
+    "uuid": UniqueIndex,
+    "name": HashIndex,
+    "author": HashIndex,
+    "available": BooleanIndex,
+    "number_of_readings": SortedIndex,
+}
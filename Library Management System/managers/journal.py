@@ -0,0 +1,179 @@
+import json
+import os
+from contextlib import AbstractContextManager, nullcontext
+from typing import Iterable, Iterator
+
+from utils import Book
+
+
+class Journal:
+    """
+    An append-only journal of the mutations of a catalog, kept next to the catalog file.
+
+    The journal collects the add, update and remove events of a library in memory and appends them as JSON
+    lines on ``flush``, so saving a change costs one small append instead of rewriting the catalog. On
+    startup the journal is replayed on top of the catalog file. Replaying is idempotent, so a crash between
+    rewriting the catalog and truncating the journal loses nothing.
+
+    Attributes:
+        filePath (str): The path of the journal file.
+        pending (list[dict]): The records not flushed yet.
+        records (int): The number of records in the journal file.
+    """
+    suffix = ".journal"
+
+    def __init__(self, catalogPath: str):
+        """
+        Initializes a new instance of the Journal class.
+
+        Args:
+            catalogPath (str): The path of the catalog file the journal belongs to.
+        """
+        self.filePath = catalogPath + self.suffix
+        self.pending: list[dict] = []
+        self.records = 0
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Records a mutation event of the library.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        if event == "add":
+            self.pending.append({"op": "add", "book": dict(book)})
+        elif event == "remove":
+            self.pending.append({"op": "remove", "uuid": book["uuid"]})
+        elif event == "update":
+            self.pending.append({"op": "update", "uuid": book["uuid"], "fields": {key: book[key] for key in previous}})
+
+    def flush(self, lock: AbstractContextManager = nullcontext()) -> int:
+        """
+        Appends the pending records to the journal file and syncs it to disk.
+
+        Only taking the pending records holds the lock, so records added while the file is written wait for
+        the next flush; if writing fails, the records are pending again.
+
+        Args:
+            lock (AbstractContextManager): The lock guarding the pending records.
+
+        Returns:
+            int: The number of appended records.
+        """
+        with lock:
+            records, self.pending = self.pending, []
+        if not records:
+            return 0
+        try:
+            lines = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records)
+            with open(self.filePath, 'a') as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+        except BaseException:
+            with lock:
+                self.pending[:0] = records
+            raise
+        self.records += len(records)
+        return len(records)
+
+    def replay(self, books: Iterable[Book]) -> list[Book]:
+        """
+        Applies the records of the journal file to the books of the catalog file.
+
+        A torn last line, left by a crash while appending, is ignored.
+
+        Args:
+            books (Iterable[Book]): The books of the catalog file.
+
+        Returns:
+            list[Book]: The books after replaying the journal.
+        """
+        return list(self.replay_iter(books))
+
+    def replay_iter(self, books: Iterable[Book]) -> Iterator[Book]:
+        """
+        Applies the records of the journal file to the books of the catalog file as they stream by.
+
+        Only the changes recorded in the journal are kept in memory: the books of the catalog are yielded in
+        their order with their updates applied and without the removed ones, followed by the added books.
+
+        Args:
+            books (Iterable[Book]): The books of the catalog file.
+
+        Yields:
+            Book: The books after replaying the journal.
+        """
+        if not os.path.exists(self.filePath):
+            yield from books
+            return
+        added: dict[str, Book] = {}
+        updates: dict[str, dict] = {}
+        removed: set[str] = set()
+        self.records = 0
+        with open(self.filePath, 'r') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.records += 1
+                match record["op"]:
+                    case "add":
+                        # Adding a book that exists replaces it in place, unless it was removed before.
+                        added[record["book"]["uuid"]] = record["book"]
+                        updates.pop(record["book"]["uuid"], None)
+                    case "remove":
+                        added.pop(record["uuid"], None)
+                        updates.pop(record["uuid"], None)
+                        removed.add(record["uuid"])
+                    case "update":
+                        if (book := added.get(record["uuid"])) is not None:
+                            book.update(record["fields"])
+                        else:
+                            updates.setdefault(record["uuid"], {}).update(record["fields"])
+        for book in books:
+            if book["uuid"] in removed:
+                continue
+            if (replacement := added.pop(book["uuid"], None)) is not None:
+                book = replacement
+            elif (fields := updates.get(book["uuid"])) is not None:
+                book.update(fields)
+            yield book
+        yield from added.values()
+
+    @staticmethod
+    def apply(catalog: dict[str, Book], records: Iterable[dict]) -> None:
+        """
+        Applies journal records to a catalog.
+
+        Args:
+            catalog (dict[str, Book]): The books by UUID, changed in place.
+            records (Iterable[dict]): The records to apply.
+        """
+        for record in records:
+            match record["op"]:
+                case "add":
+                    catalog[record["book"]["uuid"]] = record["book"]
+                case "remove":
+                    catalog.pop(record["uuid"], None)
+                case "update":
+                    if (book := catalog.get(record["uuid"])) is not None:
+                        book.update(record["fields"])
+
+    def size(self) -> int:
+        """
+        Returns the size of the journal file in bytes.
+        """
+        return os.path.getsize(self.filePath) if os.path.exists(self.filePath) else 0
+
+    def truncate(self) -> None:
+        """
+        Removes the journal file after its records were folded into the catalog file.
+        """
+        if os.path.exists(self.filePath):
+            os.remove(self.filePath)
+        self.records = 0
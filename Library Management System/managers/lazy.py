@@ -0,0 +1,157 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, MutableSequence
+from contextlib import AbstractContextManager, nullcontext
+from typing import Callable, Iterator
+
+from managers.loaders import BaseLoader
+from utils import Book
+
+
+class LazyBookList(MutableSequence):
+    """
+    A book list that reads the books from a random access loader when they are first touched.
+
+    Only the UUIDs and the file positions of the books are kept for the whole catalog. Books that were read
+    are kept in a least recently used cache of ``capacity`` entries; books changed or added since the last
+    save are pinned in memory until ``reload`` is called after saving them. Libraries shared between threads
+    pass a lock guarding the cache, whose order changes on every read.
+
+    Attributes:
+        loader (BaseLoader): The loader the books are read from.
+        capacity (int): The maximum number of unchanged books kept in memory.
+        uuids (list[str]): The UUID of the book at every position of the list.
+        _positions (array): The position of every book in the file, -1 for books not saved yet.
+        _record (Callable | None): Converts the books read to the record type of the storage backend.
+        _cache (OrderedDict[str, Book]): The unchanged books read lately, by UUID.
+        _pinned (dict[str, Book]): The books changed or added since the last save, by UUID.
+        _cacheLock (AbstractContextManager): Guards the cache while it is read or changed.
+    """
+    chunkSize = 4096
+
+    def __init__(self, loader: BaseLoader, capacity: int = 4096, record: Callable[[Book], Book] | None = None,
+                 lock: AbstractContextManager = nullcontext()):
+        """
+        Initializes a new instance of the LazyBookList class.
+
+        Args:
+            loader (BaseLoader): A loader with random access.
+            capacity (int): The maximum number of unchanged books kept in memory.
+            record (Callable | None): Converts the books read to the record type of the storage backend.
+            lock (AbstractContextManager): Guards the cache; a real lock when threads share the list.
+        """
+        self.loader = loader
+        self.capacity = capacity
+        self.uuids = loader.keys()
+        self._positions = array('q', range(len(self.uuids)))
+        self._record = record
+        self._cache: OrderedDict[str, Book] = OrderedDict()
+        self._pinned: dict[str, Book] = {}
+        self._cacheLock = lock
+
+    def __len__(self):
+        return len(self.uuids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        uuid = self.uuids[position]
+        if (book := self._pinned.get(uuid)) is not None:
+            return book
+        with self._cacheLock:
+            if (book := self._cache.get(uuid)) is not None:
+                self._cache.move_to_end(uuid)
+                return book
+        return self._remember(uuid, next(self.loader.read((self._positions[position],))))
+
+    def __setitem__(self, position, book):
+        self.uuids[position] = book["uuid"]
+        self._positions[position] = -1
+        self._pinned[book["uuid"]] = book
+
+    def __delitem__(self, position):
+        del self.uuids[position]
+        del self._positions[position]
+
+    def __iter__(self) -> Iterator[Book]:
+        for start in range(0, len(self.uuids), self.chunkSize):
+            uuids = self.uuids[start:start + self.chunkSize]
+            with self._cacheLock:
+                books = [self._pinned.get(uuid) or self._cache.get(uuid) for uuid in uuids]
+            missing = [offset for offset, book in enumerate(books) if book is None]
+            read = self.loader.read(self._positions[start + offset] for offset in missing)
+            for offset, book in zip(missing, read):
+                books[offset] = self._remember(uuids[offset], book)
+            yield from books
+
+    def insert(self, position, book):
+        self.uuids.insert(position, book["uuid"])
+        self._positions.insert(position, -1)
+        self._pinned[book["uuid"]] = book
+
+    def _remember(self, uuid: str, book: Book) -> Book:
+        if self._record is not None:
+            book = self._record(book)
+        with self._cacheLock:
+            # Another thread may have read the same book meanwhile; every caller must get the same record.
+            book = self._cache.setdefault(uuid, book)
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        return book
+
+    def observe(self, event: str, book: Book, **details) -> None:
+        """
+        Pins the changed books and forgets the removed ones.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            **details: Event specific details.
+        """
+        if event == "remove":
+            self._pinned.pop(book["uuid"], None)
+            with self._cacheLock:
+                self._cache.pop(book["uuid"], None)
+        elif event == "update":
+            self._pinned[book["uuid"]] = book
+
+    def reload(self) -> None:
+        """
+        Finds the books in the file again after it was saved and releases the pinned books.
+        """
+        positions = {uuid: position for position, uuid in enumerate(self.loader.keys())}
+        self._positions = array('q', (positions.get(uuid, -1) for uuid in self.uuids))
+        with self._cacheLock:
+            self._cache.update(self._pinned)
+            self._pinned.clear()
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+
+class BookView(Mapping):
+    """
+    A read-only mapping of UUIDs to the books of a book list.
+
+    Attributes:
+        books (list[Book]): The book list.
+        positions (dict[str, int]): The position of every book in the list by its UUID.
+    """
+
+    def __init__(self, books: list[Book], positions: dict[str, int]):
+        self.books = books
+        self.positions = positions
+
+    def __getitem__(self, uuid: str) -> Book:
+        return self.books[self.positions[uuid]]
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def values(self):
+        return self.books
+
+    def items(self):
+        return ((book["uuid"], book) for book in self.books)
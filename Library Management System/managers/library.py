@@ -1,8 +1,36 @@
 import datetime
+import os
+import threading
 import uuid as _uuid
+from contextlib import AbstractContextManager, nullcontext
+from typing import Callable, Iterable, Iterator, NamedTuple
 
-from managers.loaders import get_loader, dump_data
-from utils import Printer, Book
+from managers.due_dates import DueDateTracker
+from managers.fulltext import TrigramIndex
+from managers.indexes import BaseIndex, DEFAULT_INDEXES
+from managers.journal import Journal
+from managers.lazy import BookView, LazyBookList
+from managers.loaders import get_loader, export_data
+from managers.query import Query, execute
+from managers.search_cache import CacheInfo, SearchCache
+from managers.shards import ShardedLoader
+from managers.statistics import AuthorStats, CirculationStats
+from managers.storage import STORAGE_BACKENDS
+from utils import Printer, Book, DATE_FORMAT, date2timestamp
+
+
+class OperationResult(NamedTuple):
+    """
+    The outcome of an operation on a single book.
+
+    Attributes:
+        uuid (str): The UUID of the book.
+        ok (bool): Whether the operation succeeded.
+        message (str): What happened, or why the operation failed.
+    """
+    uuid: str
+    ok: bool
+    message: str
 
 
 class Library:
@@ -11,29 +39,354 @@ class Library:
 
     Attributes:
         lName (str): The name of the library.
-        dataLoader (FileLoader): The file loader used to load and save the book list.
+        dataLoader (BaseLoader | ShardedLoader): The loader used to load and save the book list.
         bookListFile (str): The path of the file containing the book list.
-        bList (list[Book]): A list of books in the library.
+        bList (list[Book] | LazyBookList): A list of books in the library.
+        _record (Callable | None): Converts a Book dictionary to the record type of the storage backend.
+        _books (BookView): The books in bList by their UUID.
+        _positions (dict[str, int]): The position of every book in bList by its UUID.
+        _observers (list[Callable]): The callables notified after every mutation of the book list.
+        _indexClasses (dict[str, type[BaseIndex]]): The index class to maintain for each attribute.
+        _indexes (dict[str, BaseIndex] | None): The secondary indexes used by search_by, by attribute. Lazy
+            libraries build them on their first use.
+        _fulltext (TrigramIndex | None): The trigram index used by fuzzy_search, built on its first use.
+        _dueDates (DueDateTracker | None): The expire dates used by outdated_books, built on its first use.
+        _statistics (CirculationStats | None): The circulation statistics of the reports, built on their first
+            use.
+        _searchCache (SearchCache): The results of the latest searches of search_by.
+        _journal (Journal | None): The journal save appends the changes to, None when saves rewrite the file.
+        _staleJournal (Journal | None): A journal left by a journaled library that a library without one
+            replayed on startup; the next save folds it into the book list file and removes it.
+        _loadedShards (set[str] | None): The prefixes of the shards a sharded library has loaded, None for
+            libraries stored in a single file.
+        _dirtyShards (set[str]): The prefixes of the shards changed since the last save.
+        concurrent (bool): Whether the library may be used from several threads at once.
+        _bookLocks (list[threading.Lock] | None): The lock stripes guarding the books of a concurrent library.
+        _commitLock (threading.RLock | nullcontext): Guards publishing changes to the book list and the
+            structures of the observers, and reading those structures.
         _printer (Printer): A printer used to print messages.
     """
+    lockStripes = 1024
 
-    def __init__(self, libraryName: str = "Library", bookListFile: str = "books.json"):
+    def __init__(self, libraryName: str = "Library", bookListFile: str = "books.json",
+                 indexes: dict[str, type[BaseIndex]] | None = None, storage: str = "dict", journal: bool = False,
+                 lazy: bool = False, cacheSize: int = 4096, concurrent: bool = False, searchCacheSize: int = 256,
+                 sharded: bool = False, preload: bool = False):
         """
         Initializes a new instance of the Library class.
 
         Args:
             libraryName (str): The name of the library.
             bookListFile (str): The path of the file containing the book list.
+            indexes (dict[str, type[BaseIndex]] | None): The index class to maintain for each attribute.
+                Defaults to DEFAULT_INDEXES; pass an empty dict to search by scanning.
+            storage (str): The record type to keep the books in, one of STORAGE_BACKENDS. "compact"
+                trades a little access time for a much smaller memory footprint.
+            journal (bool): Whether save appends the changes to a journal next to the book list file instead
+                of rewriting it. The journal is replayed on startup and compacted once it grows large.
+                Transactional loaders always record the changes and apply them to the file directly.
+            lazy (bool): Whether the books are read from the file when they are first touched instead of on
+                startup. Requires a loader with random access: .kbin, .json holding an array of books, or .csv.
+            cacheSize (int): The maximum number of unchanged books a lazy library keeps in memory.
+            concurrent (bool): Whether the library may be used from several threads at once. Operations on a
+                book are serialized by a lock of the book, so different books are issued and returned in
+                parallel; only publishing a change to the indexes and the journal takes a short shared lock.
+            searchCacheSize (int): The maximum number of search_by results kept for repeated searches, 0 to
+                disable the cache.
+            sharded (bool): Whether bookListFile is a directory of shard files, see ShardedLoader. A shard is
+                loaded when one of its books is first looked up or added, and all of them by operations over
+                the whole catalog such as searches; bList only holds the books of the loaded shards. save
+                rewrites only the shards changed since the last save.
+            preload (bool): Whether a sharded library loads all its shards on startup, in parallel worker
+                processes.
+
+        Raises:
+            ValueError: If the storage backend is unknown, the file can not be loaded lazily or a sharded
+                library is asked to be lazy or journaled.
+            FileExistsError: If the book list file or the directory of the shards does not exist.
         """
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"Unsupported storage backend: {storage}")
         self.lName = libraryName
-        dataLoaderClass = get_loader(bookListFile)
-        self.dataLoader = dataLoaderClass[list[Book]](bookListFile)
+        self.concurrent = concurrent
+        self._bookLocks = [threading.Lock() for _ in range(self.lockStripes)] if concurrent else None
+        self._commitLock = threading.RLock() if concurrent else nullcontext()
+        if sharded:
+            if lazy or journal:
+                raise ValueError("Sharded libraries can not be loaded lazily or journaled")
+            if not os.path.isdir(bookListFile):
+                raise FileExistsError(f"{bookListFile} not exists !!")
+            self.dataLoader = ShardedLoader(bookListFile)
+        else:
+            dataLoaderClass = get_loader(bookListFile)
+            self.dataLoader = dataLoaderClass[list[Book]](bookListFile)
         self.bookListFile = bookListFile
-        self.bList = self.dataLoader.load()
+        self._record = STORAGE_BACKENDS[storage]
+        self._journal = Journal(bookListFile) if journal or self.dataLoader.transactional else None
+        # A journal left by an earlier journaled library must be replayed by every open; otherwise its changes
+        # are lost and replayed later over newer data.
+        self._staleJournal = None
+        if self._journal is None and not sharded and os.path.exists(bookListFile + Journal.suffix):
+            self._staleJournal = Journal(bookListFile)
+        self._observers: list[Callable[..., None]] = []
+        if lazy and not self.dataLoader.randomAccess:
+            raise ValueError(f"Files of format {self.dataLoader.fileExt} can not be loaded lazily")
+        leftover = self._journal or self._staleJournal
+        if (lazy or self.dataLoader.transactional) and leftover is not None and leftover.size():
+            # These libraries never rewrite the file on save, so the journal is folded into it right away. Loaders
+            # with random access replace the file once the new one is complete, so the books stream from the old
+            # one; SQLite rewrites its table in place and needs them read first.
+            books = leftover.replay_iter(self.dataLoader.iter_load())
+            self.dataLoader.save_iter(books if self.dataLoader.randomAccess else list(books))
+            leftover.truncate()
+            self._staleJournal = None
+        if lazy:
+            self.bList = LazyBookList(self.dataLoader, cacheSize, self._record,
+                                      threading.Lock() if concurrent else nullcontext())
+            self.subscribe(self.bList.observe)
+        else:
+            if sharded:
+                shards = self.dataLoader.load_shards(self.dataLoader.shards()) if preload else {}
+                books = (book for shard in shards.values() for book in shard)
+            else:
+                # Dicts are loaded at once, through the fastest codec. Records of other storage backends are
+                # converted as the books stream from the file, so the catalog is never held as dicts.
+                books = self.dataLoader.load() if self._record is None else self.dataLoader.iter_load()
+            if (replayed := self._journal or self._staleJournal) is not None:
+                books = replayed.replay_iter(books)
+            if self._record is None:
+                self.bList = list(books)
+            else:
+                self.bList = [self._record(book) for book in books]
+        self._loadedShards: set[str] | None = set(shards) if sharded else None
+        self._dirtyShards: set[str] = set()
+        self._reindex()
+        self._indexClasses = DEFAULT_INDEXES if indexes is None else indexes
+        self._indexes: dict[str, BaseIndex] | None = None
+        if not lazy:
+            self._get_indexes()
+        if self._journal is not None:
+            self.subscribe(self._journal.observe)
+        if sharded:
+            self.subscribe(self._mark_dirty)
+        self._searchCache = SearchCache(searchCacheSize)
+        self.subscribe(self._searchCache.observe)
+        self._fulltext: TrigramIndex | None = None
+        self._dueDates: DueDateTracker | None = None
+        self._statistics: CirculationStats | None = None
         self._printer = Printer()
 
+    def _reindex(self) -> None:
+        """
+        Rebuilds the UUID indexes from the current book list.
+        """
+        self._positions: dict[str, int] = {uuid: position for position, uuid in enumerate(self.uuids())}
+        self._books = BookView(self.bList, self._positions)
+
+    def uuids(self) -> Iterable[str]:
+        """
+        Returns the UUIDs of the books in the order of the book list, without reading lazily loaded books.
+
+        Returns:
+            Iterable[str]: The UUIDs of the books.
+        """
+        if isinstance(self.bList, LazyBookList):
+            return self.bList.uuids
+        return (book["uuid"] for book in self.bList)
+
+    def _get_indexes(self) -> dict[str, BaseIndex]:
+        """
+        Returns the secondary indexes, building them on the first call.
+        """
+        if self._indexes is None:
+            with self._commitLock:
+                if self._indexes is None:
+                    indexes = {}
+                    for attribute, indexClass in self._indexClasses.items():
+                        index = indexes[attribute] = indexClass(attribute)
+                        index.build(self.bList)
+                        self.subscribe(index.observe)
+                    self._indexes = indexes
+        return self._indexes
+
+    def subscribe(self, observer: Callable[..., None]) -> None:
+        """
+        Registers an observer that is notified after every mutation of the book list.
+
+        The observer is called as ``observer(event, book, **details)`` where event is one of:
+            "add": the book was appended at ``position``.
+            "remove": the book was removed from ``position`` and ``moved`` (a Book or None) took its slot.
+            "update": fields of the book changed, ``previous`` holds their old values.
+
+        Args:
+            observer (Callable): The observer to register.
+        """
+        with self._commitLock:
+            self._observers.append(observer)
+
+    def _notify(self, event: str, book: Book, **details) -> None:
+        """
+        Notifies the observers about a mutation of the book list.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            **details: Event specific details.
+        """
+        for observer in self._observers:
+            observer(event, book, **details)
+
     def _get_book(self, uuid):
-        return next((book for book in self.bList if book["uuid"] == uuid), None)
+        if self._loadedShards is not None:
+            self._load_shard_of(uuid)
+        book = self._read_book(uuid)
+        if book is None and self._bookLocks is not None:
+            # In a concurrent library the book may have been moved by a removal since its position was read.
+            # Removals move books under the commit lock, so reading again under it is definitive.
+            with self._commitLock:
+                book = self._read_book(uuid)
+        return book
+
+    def _read_book(self, uuid: str) -> Book | None:
+        """
+        Reads a book at its recorded position.
+
+        Args:
+            uuid (str): The UUID of the book.
+
+        Returns:
+            Book | None: The book, or None if there is no book with the UUID at its recorded position.
+        """
+        if (position := self._positions.get(uuid)) is None:
+            return None
+        try:
+            book = self.bList[position]
+        except IndexError:
+            return None
+        return book if book["uuid"] == uuid else None
+
+    def _book_lock(self, uuid: str) -> AbstractContextManager:
+        """
+        Returns the lock serializing the operations on a book, a no-op unless the library is concurrent.
+
+        Args:
+            uuid (str): The UUID of the book.
+        """
+        return nullcontext() if self._bookLocks is None else self._bookLocks[hash(uuid) % self.lockStripes]
+
+    def get_book(self, uuid: str) -> Book | None:
+        """
+        Looks a book up by its UUID.
+
+        Args:
+            uuid (str): The UUID of the book.
+
+        Returns:
+            Book | None: The book, or None if there is no book with the UUID.
+        """
+        return self._get_book(uuid)
+
+    def _load_shard_of(self, uuid: str) -> None:
+        """
+        Loads the shard a book belongs to, unless it is loaded already.
+
+        Args:
+            uuid (str): The UUID of the book.
+        """
+        if (prefix := self.dataLoader.shard_of(uuid)) not in self._loadedShards:
+            self._load_shards((prefix,))
+
+    def _load_all_shards(self) -> None:
+        """
+        Loads the shards a sharded library has not loaded yet, before an operation over the whole catalog.
+        """
+        if self._loadedShards is not None and not self._loadedShards.issuperset(self.dataLoader.paths):
+            self._load_shards(self.dataLoader.shards())
+
+    def _load_shards(self, prefixes: Iterable[str]) -> None:
+        """
+        Appends the books of shards that are not loaded yet to the book list.
+
+        The books are announced to the observers as added with ``loaded=True``, so they are indexed without
+        marking their shards dirty.
+
+        Args:
+            prefixes (Iterable[str]): The prefixes of the shards.
+        """
+        with self._commitLock:
+            missing = [prefix for prefix in prefixes if prefix not in self._loadedShards]
+            for books in self.dataLoader.load_shards(missing).values():
+                for book in books:
+                    self._append(book if self._record is None else self._record(book), loaded=True)
+            self._loadedShards.update(missing)
+
+    def _mark_dirty(self, event: str, book: Book, loaded: bool = False, **details) -> None:
+        """
+        Records the shard a mutation changed, so that save rewrites it.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            loaded (bool): Whether the book was only added by loading its shard.
+            **details: Other event specific details.
+        """
+        if not loaded:
+            self._dirtyShards.add(self.dataLoader.shard_of(book["uuid"]))
+
+    def _append(self, book: Book, **details) -> None:
+        """
+        Appends a book to the book list and indexes it.
+
+        Args:
+            book (Book): The book to append.
+            **details: Extra details for the observers.
+        """
+        with self._commitLock:
+            position = len(self.bList)
+            self.bList.append(book)
+            self._positions[book["uuid"]] = position
+            self._notify("add", book, position=position, **details)
+
+    def _discard(self, uuid: str) -> Book:
+        """
+        Removes a book from the book list in constant time.
+
+        The last book of the list is moved into the slot of the removed book, so the
+        order of the remaining books is not preserved.
+
+        Args:
+            uuid (str): The UUID of the book to remove.
+
+        Returns:
+            Book: The removed book.
+        """
+        with self._commitLock:
+            position = self._positions.pop(uuid)
+            book = self.bList[position]
+            last = self.bList.pop()
+            moved = None
+            if position < len(self.bList):
+                self.bList[position] = moved = last
+                self._positions[last["uuid"]] = position
+            self._notify("remove", book, position=position, moved=moved)
+        return book
+
+    def _update(self, book: Book, **changes) -> None:
+        """
+        Changes fields of a book and notifies the observers.
+
+        The caller holds the lock of the book, so the fields are changed without the commit lock; only the
+        observers, whose indexes and journal are shared by all books, are notified under it.
+
+        Args:
+            book (Book): The book to change.
+            **changes: The new values of the fields.
+        """
+        previous = {key: book[key] for key in changes}
+        for key, value in changes.items():
+            book[key] = value
+        with self._commitLock:
+            self._notify("update", book, previous=previous)
 
     def display_book(self, uuid: str) -> None:
         """
@@ -49,30 +402,71 @@ class Library:
         else:
             self._printer.error("Book with UUID {} not found.".format(uuid))
 
-    def issue_book(self, uuid: str) -> None:
+    def issue(self, uuid: str) -> OperationResult:
         """
-        Displays the details of a book.
+        Issues a book for four weeks, without printing anything.
 
         Args:
-            uuid (str): The UUID of the book to display.
+            uuid (str): The UUID of the book to issue.
+
+        Returns:
+            OperationResult: The outcome of the operation.
         """
+        return self._issue(uuid, *self._loan_dates())
 
-        book = self._get_book(uuid)
+    def issue_book(self, uuid: str) -> None:
+        """
+        Issues a book for four weeks.
+
+        Args:
+            uuid (str): The UUID of the book to issue.
+        """
+        result = self.issue(uuid)
         with self._printer as p:
-            if book:
-                if book["available"]:
-                    book["available"] = False
-                    book["issue_date"] = datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S")
-                    book["expire_date"] = (datetime.datetime.now() + datetime.timedelta(weeks=4)).strftime(
-                        "%Y/%m/%d %H:%M:%S")
-                    book["number_of_readings"] += 1
-                    p.print("Book issued successfully!")
-                else:
-                    p.error(
-                        "This book is already issued. Issue Date: {}; Expire Date: {}".format(book["issue_date"],
-                                                                                              book["expire_date"]))
-            else:
-                p.error("Invalid UUID!")
+            (p.print if result.ok else p.error)(result.message)
+
+    def issue_many(self, uuids: Iterable[str]) -> list[OperationResult]:
+        """
+        Issues several books at once, all with the same issue and expire dates.
+
+        Only a summary is printed; the outcome of every book is returned instead.
+
+        Args:
+            uuids (Iterable[str]): The UUIDs of the books to issue.
+
+        Returns:
+            list[OperationResult]: The outcome for every UUID, in the same order.
+        """
+        issueDate, expireDate = self._loan_dates()
+        results = [self._issue(uuid, issueDate, expireDate) for uuid in uuids]
+        self._print_summary(results, "issued")
+        return results
+
+    def _issue(self, uuid: str, issueDate: str, expireDate: str) -> OperationResult:
+        with self._book_lock(uuid):
+            book = self._get_book(uuid)
+            if not book:
+                return OperationResult(uuid, False, "Invalid UUID!")
+            if not book["available"]:
+                message = "This book is already issued. Issue Date: {}; Expire Date: {}".format(book["issue_date"],
+                                                                                                book["expire_date"])
+                return OperationResult(uuid, False, message)
+            self._update(
+                book,
+                available=False,
+                issue_date=issueDate,
+                expire_date=expireDate,
+                number_of_readings=book["number_of_readings"] + 1
+            )
+            return OperationResult(uuid, True, "Book issued successfully!")
+
+    @staticmethod
+    def _loan_dates() -> tuple[str, str]:
+        """
+        Returns the issue and expire dates of a book issued now.
+        """
+        now = datetime.datetime.now()
+        return now.strftime(DATE_FORMAT), (now + datetime.timedelta(weeks=4)).strftime(DATE_FORMAT)
 
     def return_book(self, uuid: str) -> None:
         """
@@ -81,27 +475,82 @@ class Library:
         Args:
             uuid (str): The UUID of the book to return.
         """
-
+        result = self.return_(uuid)
         with self._printer as p:
+            (p.print if result.ok else p.error)(result.message)
+
+    def return_many(self, uuids: Iterable[str]) -> list[OperationResult]:
+        """
+        Returns several books at once, printing only a summary.
+
+        Args:
+            uuids (Iterable[str]): The UUIDs of the books to return.
+
+        Returns:
+            list[OperationResult]: The outcome for every UUID, in the same order.
+        """
+        results = [self.return_(uuid) for uuid in uuids]
+        self._print_summary(results, "returned")
+        return results
+
+    def return_(self, uuid: str) -> OperationResult:
+        """
+        Returns a book, without printing anything.
+
+        Args:
+            uuid (str): The UUID of the book to return.
+
+        Returns:
+            OperationResult: The outcome of the operation.
+        """
+        with self._book_lock(uuid):
             book = self._get_book(uuid)
-            if book:
-                if not book["available"]:
-                    book["available"] = True
-                    book["issue_date"] = ""
-                    book["expire_date"] = ""
-                    p.print("Book returned successfully!")
-                else:
-                    p.error("This book is not issued.")
-            else:
-                p.error("Invalid UUID!")
+            if not book:
+                return OperationResult(uuid, False, "Invalid UUID!")
+            if book["available"]:
+                return OperationResult(uuid, False, "This book is not issued.")
+            self._update(book, available=True, issue_date="", expire_date="")
+            return OperationResult(uuid, True, "Book returned successfully!")
+
+    def add(self, title: str, author: str) -> OperationResult:
+        """
+        Adds a book to the library, without printing anything.
+
+        Args:
+            title (str): The title of the book.
+            author (str): The author of the book.
+
+        Returns:
+            OperationResult: The outcome of the operation, with the UUID the book got.
+        """
+        return OperationResult(self._add(title, author)["uuid"], True, "Book added successfully!")
 
     def add_book(self, title: str, author: str) -> None:
         """
         Adds a book to the library.
         """
-        uuid = str(_uuid.uuid4())
+        result = self.add(title, author)
+        with self._printer as p:
+            p.print(result.message)
+            self._print_book(self._get_book(result.uuid))
+
+    def add_many(self, books: Iterable[tuple[str, str]]) -> list[OperationResult]:
+        """
+        Adds several books at once, printing only a summary.
+
+        Args:
+            books (Iterable[tuple[str, str]]): The title and the author of every book to add.
+
+        Returns:
+            list[OperationResult]: The outcome for every book, in the same order, with the UUID it got.
+        """
+        results = [self.add(title, author) for title, author in books]
+        self._print_summary(results, "added")
+        return results
+
+    def _add(self, title: str, author: str) -> Book:
         book = Book(
-            uuid=uuid,
+            uuid=str(_uuid.uuid4()),
             name=title,
             author=author,
             available=True,
@@ -109,15 +558,21 @@ class Library:
             expire_date="",
             number_of_readings=0
         )
-        self.bList.append(book)
-        with self._printer as p:
-            p.print("Book added successfully!")
-            self._print_book(book)
+        if self._record is not None:
+            book = self._record(book)
+        if self._loadedShards is not None:
+            # The shard is rewritten as a whole on save, so its other books must be loaded first.
+            self._load_shard_of(book["uuid"])
+        self._append(book)
+        return book
 
     def search_by(self, attribute: str, value: str) -> list[str] | None:
         """
         Searches for books by a specific attribute.
 
+        Repeated searches are answered from a cache until a book is added or removed or the attribute of a
+        book changes; every call returns a new list, which the caller is free to change.
+
         Args:
             attribute (str): The attribute to search by.
             value (str): The value of the attribute to search for.
@@ -125,8 +580,48 @@ class Library:
         Returns:
             list[str] | None: A list of UUIDs of the books that match the search, or None if no books were found.
         """
+        if results := self.find(attribute, value):
+            return results
+        else:
+            with self._printer as p:
+                p.error("No books found with {}: {}".format(attribute, value))
+                return None
+
+    def find(self, attribute: str, value: str) -> list[str]:
+        """
+        Searches for books by a specific attribute like search_by, without printing anything.
+
+        Args:
+            attribute (str): The attribute to search by.
+            value (str): The value of the attribute to search for.
+
+        Returns:
+            list[str]: The UUIDs of the matching books, in the order of the book list; a new list on every call.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            key = value.lower()
+            if (results := self._searchCache.get(attribute, key)) is None:
+                results = tuple(self._search_by(attribute, value))
+                self._searchCache.put(attribute, key, results)
+        return list(results)
+
+    def _search_by(self, attribute: str, value: str) -> list[str]:
+        """
+        Runs a search of search_by, through the index of the attribute if there is one.
+
+        Returns:
+            list[str]: The UUIDs of the matching books, in the order of the book list.
+        """
         results = []
-        if len(self.bList) != 0:
+        if (index := self._get_indexes().get(attribute)) is not None:
+            matches = index.lookup(index.parse(value))
+            if len(matches) * 8 > len(self.bList):
+                # Filtering the whole list in order is cheaper than sorting a large share of it.
+                results = [uuid for uuid in self.uuids() if uuid in matches]
+            else:
+                results = sorted(matches, key=self._positions.__getitem__)
+        elif len(self.bList) != 0:
             book = self.bList[0]
             if attribute in book:
                 if isinstance(book[attribute], str):
@@ -143,13 +638,127 @@ class Library:
                             results.append(book["uuid"])
                 else:
                     raise ValueError(f"Unsupported attribute type: {type(book[attribute])}")
+        return results
 
-        if results:
-            return results
-        else:
-            with self._printer as p:
-                p.error("No books found with {}: {}".format(attribute, value))
-                return None
+    def search_cache_info(self) -> CacheInfo:
+        """
+        Returns the hit and miss counters of the search_by cache, for tuning its size.
+
+        Returns:
+            CacheInfo: The counters and the size of the cache.
+        """
+        return self._searchCache.info()
+
+    def query(self, query: Query | str) -> Iterator[str]:
+        """
+        Runs a multi-attribute query over the books, using the secondary indexes where possible.
+
+        Args:
+            query (Query | str): The query, or its text form such as ``author prefix Ad AND available AND
+                number_of_readings >= 50 ORDER BY number_of_readings DESC LIMIT 20``.
+
+        Returns:
+            Iterator[str]: A lazy iterator over the UUIDs of the matching books.
+
+        Raises:
+            ValueError: If the query text is invalid.
+        """
+        if isinstance(query, str):
+            query = Query.parse(query)
+        self._load_all_shards()
+        if self._bookLocks is None:
+            return execute(query, self._books, self._get_indexes())
+        with self._commitLock:
+            return iter(list(execute(query, self._books, self._get_indexes())))
+
+    def fuzzy_search(self, text: str, limit: int = 10, threshold: float = 0.5) -> list[tuple[str, float]]:
+        """
+        Searches the names and authors of the books for partial or misspelled text.
+
+        Args:
+            text (str): The text to search for.
+            limit (int): The maximum number of results.
+            threshold (float): The minimum share of the trigrams of the text a result contains.
+
+        Returns:
+            list[tuple[str, float]]: The UUIDs of the best matches with their similarity, best first.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            if self._fulltext is None:
+                self._fulltext = TrigramIndex()
+                self._fulltext.build(self.bList)
+                self.subscribe(self._fulltext.observe)
+            return self._fulltext.search(text, limit, threshold)
+
+    def outdated_books(self, now: datetime.datetime | None = None) -> list[str]:
+        """
+        Lists the issued books whose expire date has passed, the longest overdue first.
+
+        Args:
+            now (datetime.datetime | None): The point in time to compare with. Defaults to now.
+
+        Returns:
+            list[str]: The UUIDs of the outdated books.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            if self._dueDates is None:
+                self._dueDates = DueDateTracker()
+                self._dueDates.build(self.bList)
+                self.subscribe(self._dueDates.observe)
+            return self._dueDates.overdue(date2timestamp(now or datetime.datetime.now()))
+
+    def _get_statistics(self) -> CirculationStats:
+        """
+        Returns the circulation statistics, building them on the first call. Must be called with the commit
+        lock held.
+        """
+        if self._statistics is None:
+            self._statistics = CirculationStats()
+            self._statistics.build(self.bList)
+            self.subscribe(self._statistics.observe)
+        return self._statistics
+
+    def most_read_books(self, limit: int = 10) -> list[tuple[str, int]]:
+        """
+        Lists the books that were read the most.
+
+        The statistics are kept up to date on every change, so a report costs O(limit log limit) instead of
+        sorting the catalog.
+
+        Args:
+            limit (int): The maximum number of books.
+
+        Returns:
+            list[tuple[str, int]]: The UUIDs of the books with their number of readings, the most read first
+                and ties by UUID.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            return self._get_statistics().most_read_books(limit)
+
+    def most_read_authors(self, limit: int = 10) -> list[AuthorStats]:
+        """
+        Lists the authors whose books were read the most, by the total number of readings of their books.
+
+        Args:
+            limit (int): The maximum number of authors.
+
+        Returns:
+            list[AuthorStats]: The figures of the authors, the most read first and ties by name.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            return self._get_statistics().most_read_authors(limit)
+
+    def issued_count(self) -> int:
+        """
+        Returns the number of books that are currently issued.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            return self._get_statistics().issued
 
     def _print_book(self, book: Book) -> None:
         """
@@ -158,13 +767,15 @@ class Library:
         Args:
             book (Book): The book to print.
         """
-        self._printer.print(f"UUID: {book['uuid']}")
-        self._printer.print(f"Name: {book['name']}")
-        self._printer.print(f"Author: {book['author']}")
-        self._printer.print(f"Available: {book['available']}")
-        self._printer.print(f"Issue Date: {book['issue_date']}")
-        self._printer.print(f"Expire Date: {book['expire_date']}")
-        self._printer.print(f"Number of Readings: {book['number_of_readings']}\n")
+        self._printer.print_many((
+            f"UUID: {book['uuid']}",
+            f"Name: {book['name']}",
+            f"Author: {book['author']}",
+            f"Available: {book['available']}",
+            f"Issue Date: {book['issue_date']}",
+            f"Expire Date: {book['expire_date']}",
+            f"Number of Readings: {book['number_of_readings']}\n",
+        ))
 
     def remove_book(self, uuid: str) -> None:
         """
@@ -173,28 +784,155 @@ class Library:
         Args:
             uuid (str): The UUID of the book to remove.
         """
-        book = self._get_book(uuid)
+        result = self.remove(uuid)
         with self._printer as p:
-            if book:
-                self.bList.remove(book)
-                p.print("Book removed successfully!")
-            else:
-                p.error("Invalid UUID!")
+            (p.print if result.ok else p.error)(result.message)
+
+    def remove_many(self, uuids: Iterable[str]) -> list[OperationResult]:
+        """
+        Removes several books at once, printing only a summary.
+
+        Args:
+            uuids (Iterable[str]): The UUIDs of the books to remove.
+
+        Returns:
+            list[OperationResult]: The outcome for every UUID, in the same order.
+        """
+        results = [self.remove(uuid) for uuid in uuids]
+        self._print_summary(results, "removed")
+        return results
+
+    def remove(self, uuid: str) -> OperationResult:
+        """
+        Removes a book from the library, without printing anything.
+
+        Args:
+            uuid (str): The UUID of the book to remove.
+
+        Returns:
+            OperationResult: The outcome of the operation.
+        """
+        with self._book_lock(uuid):
+            if not self._get_book(uuid):
+                return OperationResult(uuid, False, "Invalid UUID!")
+            self._discard(uuid)
+            return OperationResult(uuid, True, "Book removed successfully!")
+
+    def _print_summary(self, results: list[OperationResult], verb: str) -> None:
+        """
+        Prints how many books of a bulk operation succeeded.
+
+        Args:
+            results (list[OperationResult]): The outcomes of the operation.
+            verb (str): What happened to the books that succeeded, e.g. "issued".
+        """
+        succeeded = sum(result.ok for result in results)
+        with self._printer as p:
+            p.print(f"{succeeded} of {len(results)} books {verb} successfully!")
+            if succeeded < len(results):
+                p.error(f"{len(results) - succeeded} books could not be {verb}.")
+
+    def compact(self) -> None:
+        """
+        Folds the journal back into the book list file by rewriting it and removing the journal.
+
+        Sharded libraries load and rewrite all their shards.
+        """
+        self._load_all_shards()
+        with self._commitLock:
+            self.dataLoader.save_iter(self.bList)
+            self._dirtyShards.clear()
+            if self._journal is not None:
+                self._journal.pending.clear()
+                self._journal.truncate()
+            if self._staleJournal is not None:
+                self._staleJournal.truncate()
+                self._staleJournal = None
+            if isinstance(self.bList, LazyBookList):
+                self.bList.reload()
+
+    def export(self, formats: Iterable[str], workers: int | None = None) -> dict[str, float]:
+        """
+        Exports the book list to several formats concurrently, next to the book list file.
+
+        Args:
+            formats (Iterable[str]): The formats to export to, e.g. "json" or "xml".
+            workers (int | None): The maximum number of worker processes, see export_data.
+
+        Returns:
+            dict[str, float]: The seconds it took to write each format, by format.
+
+        Raises:
+            TypeError: If a format is unsupported.
+        """
+        paths = {format_: f"{self.dataLoader.fileName}.{format_}" for format_ in formats}
+        self._load_all_shards()
+        with self._commitLock:
+            timings = export_data(self.bList, paths.values(), workers)
+        return {format_: timings[path] for format_, path in paths.items()}
 
     def save(self, save_format: str) -> bool:
         """
         Saves the book list to a file.
 
+        With a journal only the changes since the last save are appended to it; the book list file is
+        rewritten once the journal outgrows half of it. Transactional loaders apply the changes in place.
+        Sharded libraries rewrite only the shards changed since the last save.
+
         Args:
-            save_format (str): The format to save the book list in.
+            save_format (str): The format, or comma separated formats, to save the book list in. Formats
+                other than the one of the book list file are exported concurrently.
         """
         try:
-            if self.dataLoader.fileExt != save_format:
-                dump_data(self.bList, f"{self.dataLoader.fileName}.{save_format}")
-            self.dataLoader.save(self.bList)
+            formats = {format_.strip().lstrip(".").lower() for format_ in save_format.split(",")} - {""}
+            formats.discard(self.dataLoader.fileExt.lstrip(".").lower())
+            if formats:
+                for format_, seconds in sorted(self.export(formats).items()):
+                    with self._printer as p:
+                        p.print(f"Exported {self.dataLoader.fileName}.{format_} in {seconds:.2f}s")
+            self.persist()
             with self._printer as p:
                 p.print("Changes saved successfully!")
                 return True
         except KeyboardInterrupt:
             self._printer.error(f"File format {save_format} is unsupported!")
             return False
+
+    def persist(self) -> None:
+        """
+        Saves the changes to the book list file like save, without printing anything or exporting.
+
+        A concurrent library keeps serving other threads meanwhile: appending to a journal only holds the
+        commit lock while taking the pending records, so changes can continue during the disk sync.
+        Rewriting a file holds the lock throughout. Saves must not run at the same time as each other.
+        """
+        with self._commitLock:
+            if self._loadedShards is not None:
+                self._save_shards()
+                return
+            if self._journal is None:
+                self.compact()
+                return
+            if self.dataLoader.transactional:
+                self.dataLoader.apply_changes(self._journal.pending)
+                self._journal.pending.clear()
+                if isinstance(self.bList, LazyBookList):
+                    self.bList.reload()
+                return
+        self._journal.flush(self._commitLock)
+        with self._commitLock:
+            if not os.path.exists(self.bookListFile) or \
+                    self._journal.size() * 2 > os.path.getsize(self.bookListFile):
+                self.compact()
+
+    def _save_shards(self) -> None:
+        """
+        Rewrites the shards changed since the last save, collecting their books in a single pass.
+        """
+        shards: dict[str, list[Book]] = {prefix: [] for prefix in self._dirtyShards}
+        for book in self.bList:
+            if (shard := shards.get(self.dataLoader.shard_of(book["uuid"]))) is not None:
+                shard.append(book)
+        for prefix, books in sorted(shards.items()):
+            self.dataLoader.save_shard(prefix, books)
+        self._dirtyShards.clear()
@@ -1,14 +1,181 @@
-import csv
+import importlib
 import io
 import json
+import mmap
 import os
-import xml.etree.ElementTree as Et
+import struct
+import sys
+import time
 from abc import ABCMeta, abstractmethod
+from array import array
+from contextlib import closing
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
 
-import toml
-import yaml
+from managers.journal import Journal
+from managers.schema import Schema
+from utils import list2dict, dict2list, Book, date2timestamp, timestamp2date
 
-from utils import list2dict, dict2list, Book
+
+class _LazyModule:
+    """
+    A module that is imported on the first access to one of its attributes.
+
+    Attributes:
+        _moduleName (str): The name of the module.
+    """
+
+    def __init__(self, moduleName: str):
+        """
+        Initializes a new instance of the _LazyModule class.
+
+        Args:
+            moduleName (str): The name of the module.
+        """
+        self._moduleName = moduleName
+
+    def __getattr__(self, attribute: str) -> Any:
+        value = getattr(importlib.import_module(self._moduleName), attribute)
+        # Later accesses find the attribute on the instance and skip __getattr__.
+        setattr(self, attribute, value)
+        return value
+
+
+# The standard libraries backing single formats, imported when a loader first uses them so that opening a
+# catalog only pays for its own format. The third party ones are imported by the codec factories.
+Et = _LazyModule("xml.etree.ElementTree")
+csv = _LazyModule("csv")
+sqlite3 = _LazyModule("sqlite3")
+
+
+class Codec(NamedTuple):
+    """
+    An implementation of a text format.
+
+    Attributes:
+        name (str): The name of the implementation.
+        loads (Callable[[str], Any]): Parses a text.
+        dumps (Callable[[Any], str]): Formats an object.
+    """
+    name: str
+    loads: Callable[[str], Any]
+    dumps: Callable[[Any], str]
+
+
+# The codec factories of every format, fastest first. A factory imports its implementation when it is called
+# and raises ImportError or AttributeError when the implementation is unavailable.
+codecFactories: dict[str, list[Callable[[], Codec]]] = {}
+# The codec picked for every format, by get_codec.
+selectedCodecs: dict[str, Codec] = {}
+
+
+def register_codec(format_: str):
+    """
+    Registers a codec factory for a format, after the faster ones registered before it.
+
+    Args:
+        format_ (str): The format, e.g. "yaml".
+
+    Returns:
+        Callable: A decorator registering the factory.
+    """
+
+    def decorator(factory: Callable[[], Codec]) -> Callable[[], Codec]:
+        codecFactories.setdefault(format_, []).append(factory)
+        return factory
+
+    return decorator
+
+
+def available_codecs(format_: str) -> list[Codec]:
+    """
+    Lists the codecs of a format that can be used here, fastest first.
+
+    Args:
+        format_ (str): The format.
+
+    Returns:
+        list[Codec]: The available codecs.
+    """
+    codecs = []
+    for factory in codecFactories.get(format_, []):
+        try:
+            codecs.append(factory())
+        except (ImportError, AttributeError):
+            continue
+    return codecs
+
+
+def get_codec(format_: str) -> Codec:
+    """
+    Returns the fastest available codec of a format, picking it on the first call.
+
+    Args:
+        format_ (str): The format.
+
+    Returns:
+        Codec: The codec.
+
+    Raises:
+        RuntimeError: If no codec of the format is available.
+    """
+    if (codec := selectedCodecs.get(format_)) is None:
+        if not (codecs := available_codecs(format_)):
+            raise RuntimeError(f"No codec is available for {format_}")
+        codec = selectedCodecs[format_] = codecs[0]
+    return codec
+
+
+def describe_codecs() -> dict[str, str]:
+    """
+    Reports the codec used for every format.
+
+    Returns:
+        dict[str, str]: The name of the codec of every format.
+    """
+    return {format_: get_codec(format_).name for format_ in codecFactories}
+
+
+@register_codec("json")
+def _orjson_codec() -> Codec:
+    import orjson
+
+    return Codec("orjson", orjson.loads, lambda content: orjson.dumps(content, default=dict).decode())
+
+
+@register_codec("json")
+def _json_codec() -> Codec:
+    return Codec("json", json.loads, json.JSONEncoder(separators=(',', ':'), default=dict).encode)
+
+
+@register_codec("yaml")
+def _libyaml_codec() -> Codec:
+    import yaml
+
+    return Codec("libyaml", lambda text: yaml.load(text, Loader=yaml.CSafeLoader),
+                 lambda content: yaml.dump(content, Dumper=yaml.CSafeDumper, default_flow_style=False))
+
+
+@register_codec("yaml")
+def _pyyaml_codec() -> Codec:
+    import yaml
+
+    return Codec("pyyaml", yaml.safe_load, lambda content: yaml.dump(content, default_flow_style=False))
+
+
+@register_codec("toml")
+def _tomllib_codec() -> Codec:
+    import tomllib
+
+    import toml
+
+    return Codec("tomllib", tomllib.loads, toml.dumps)
+
+
+@register_codec("toml")
+def _toml_codec() -> Codec:
+    import toml
+
+    return Codec("toml", toml.loads, toml.dumps)
 
 
 class BaseLoader[T](metaclass=ABCMeta):
@@ -20,8 +187,13 @@ class BaseLoader[T](metaclass=ABCMeta):
         filePath (str): The path of the file to load or save.
         fileName (str): The name of the file to load or save.
         fileExt (str): The extension of the file to load or save.
+        transactional (bool): Whether the loader persists single changes with apply_changes instead of
+            rewriting the file.
+        randomAccess (bool): Whether the loader can read single books with keys and read.
     """
     extension: str = NotImplemented
+    transactional: bool = False
+    randomAccess: bool = False
 
     def __init__(self, filePath=''):
         """
@@ -55,6 +227,57 @@ class BaseLoader[T](metaclass=ABCMeta):
         with open(self.filePath, 'w') as file:
             file.write(serialized_content)
 
+    def iter_load(self) -> Iterator[Book]:
+        """
+        Loads the books of the file one by one.
+
+        Loaders of formats that can be parsed incrementally override this to keep only one book in memory
+        at a time; the default loads the whole file.
+
+        Yields:
+            Book: The books of the file.
+        """
+        yield from self.load()
+
+    def save_iter(self, books: Iterable[Book]):
+        """
+        Saves books to the file as they are produced.
+
+        Loaders of formats that can be written incrementally override this to never hold the serialized
+        content in memory; the default collects the books and saves them at once.
+
+        Args:
+            books (Iterable[Book]): The books to save to the file.
+        """
+        self.save(list(books))
+
+    def keys(self) -> list[str]:
+        """
+        Lists the UUIDs of the books in the order they are stored in, without reading the books.
+
+        Returns:
+            list[str]: The UUIDs of the books.
+
+        Raises:
+            NotImplementedError: If the loader has no random access.
+        """
+        raise NotImplementedError
+
+    def read(self, positions: Iterable[int]) -> Iterator[Book]:
+        """
+        Reads single books by their position in the file.
+
+        Args:
+            positions (Iterable[int]): The positions of the books, as their indexes in keys.
+
+        Yields:
+            Book: The books at the positions, in the same order.
+
+        Raises:
+            NotImplementedError: If the loader has no random access.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def deserialize(self, serialized_content: str) -> T:
         """
@@ -82,6 +305,25 @@ class BaseLoader[T](metaclass=ABCMeta):
         raise NotImplementedError
 
 
+def _read_spans(filePath: str, spans: array, positions: Iterable[int]) -> Iterator[bytes]:
+    """
+    Reads the text of single books of a file, by the byte spans its loader recorded in keys.
+
+    Args:
+        filePath (str): The path of the file.
+        spans (array): The start and the end offset of every book, one pair after another.
+        positions (Iterable[int]): The positions of the books, as their indexes in keys.
+
+    Yields:
+        bytes: The text of the books at the positions, in the same order.
+    """
+    with open(filePath, 'rb') as file:
+        for position in positions:
+            start = spans[2 * position]
+            file.seek(start)
+            yield file.read(spans[2 * position + 1] - start)
+
+
 # A dictionary to store the supported file extensions and their corresponding loader classes.
 supportedExtensions: dict[str, BaseLoader] = {}
 
@@ -108,12 +350,118 @@ def register_extension(class_):
 @register_extension
 class JsonLoader[T](BaseLoader[T]):
     extension = ".json"
+    # Files holding an array of books are read lazily by the byte span of every item.
+    randomAccess = True
+    chunkSize = 1 << 16
+    # The indentation of saved files; None writes compact JSON with the fastest codec.
+    indent: int | None = 3
+    # The start and the end offset of every book, recorded by keys.
+    _spans: array | None = None
 
     def deserialize(self, serialized_content):
-        return json.loads(serialized_content)
+        return get_codec("json").loads(serialized_content)
 
     def serialize(self, content):
-        return json.dumps(content, indent=3)
+        if self.indent is None:
+            return get_codec("json").dumps(content)
+        return json.dumps(content, indent=self.indent, default=dict)
+
+    def iter_load(self):
+        with open(self.filePath, 'r') as file:
+            buffer = file.read(self.chunkSize).lstrip()
+            if not buffer.startswith('['):
+                yield from self.deserialize(buffer + file.read())
+                return
+            for book, _, _ in self._items(file, buffer, 0):
+                yield {sys.intern(key): value for key, value in book.items()} if isinstance(book, dict) else book
+
+    def _items(self, file, buffer: str, offset: int) -> Iterator[tuple[Any, int, int]]:
+        """
+        Parses the items of a top-level array one by one, reading the rest of the file in chunks.
+
+        Args:
+            file: The file, positioned after the buffer.
+            buffer (str): The text read so far, starting with the opening bracket of the array.
+            offset (int): The offset of the buffer in the file, in characters.
+
+        Yields:
+            tuple[Any, int, int]: Every item with the offsets of its first character and past its last one.
+        """
+        decoder = json.JSONDecoder()
+        position, eof = 1, False
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                if position == len(buffer):
+                    raise ValueError
+                item, end = decoder.raw_decode(buffer, position)
+                if end == len(buffer) and not eof:
+                    raise ValueError
+            except ValueError:
+                if eof:
+                    raise json.JSONDecodeError("Unterminated array", buffer, position) from None
+                chunk = file.read(self.chunkSize)
+                buffer, offset, position, eof = buffer[position:] + chunk, offset + position, 0, not chunk
+                continue
+            yield item, offset + position, offset + end
+            position = end
+
+    def keys(self):
+        uuids, spans = [], array('q')
+        # Every byte is a character in latin-1, so the offsets are byte offsets. The syntax of JSON is ASCII,
+        # which UTF-8 never uses inside other characters, so only the UUIDs need to be decoded again.
+        with open(self.filePath, 'r', encoding='latin-1', newline='') as file:
+            text = file.read(self.chunkSize)
+            buffer = text.lstrip()
+            if not buffer.startswith('['):
+                raise ValueError(f"{self.filePath} must hold an array of books to be loaded lazily")
+            for book, start, end in self._items(file, buffer, len(text) - len(buffer)):
+                uuid = book["uuid"]
+                uuids.append(uuid if uuid.isascii() else uuid.encode('latin-1').decode())
+                spans.extend((start, end))
+        self._spans = spans
+        return uuids
+
+    def read(self, positions):
+        if self._spans is None:
+            self.keys()
+        loads = get_codec("json").loads
+        for text in _read_spans(self.filePath, self._spans, positions):
+            yield loads(text)
+
+    def save_iter(self, books):
+        # The books may be read lazily from the file, so it is replaced once the new one is complete.
+        temporaryPath = self.filePath + ".tmp"
+        try:
+            self._write_items(temporaryPath, books)
+            os.replace(temporaryPath, self.filePath)
+        finally:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+        self._spans = None
+
+    def _write_items(self, filePath: str, books: Iterable[Book]):
+        if self.indent is None:
+            dumps = get_codec("json").dumps
+            with open(filePath, 'w') as file:
+                separator = '['
+                for book in books:
+                    file.write(separator)
+                    file.write(dumps(book))
+                    separator = ','
+                file.write('[]' if separator == '[' else ']')
+            return
+        newline = '\n' + ' ' * self.indent
+        with open(filePath, 'w') as file:
+            separator = '[' + newline
+            for book in books:
+                file.write(separator)
+                file.write(json.dumps(book, indent=self.indent, default=dict).replace('\n', newline))
+                separator = ',' + newline
+            file.write('[]' if separator == '[' + newline else '\n]')
 
 
 @register_extension
@@ -127,36 +475,64 @@ class XmlLoader[T: list[Book]](BaseLoader[T]):
     def serialize(self, content):
         return Et.tostring(self._list2elements(content), encoding='unicode')
 
+    def load(self):
+        # Parsing incrementally is faster than building the whole tree and keeps only one element at a time.
+        return list(self.iter_load())
+
+    def iter_load(self):
+        events = Et.iterparse(self.filePath, events=('start', 'end'))
+        _, root = next(events)
+        schema = Schema(())
+        depth = 1
+        for event, element in events:
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield self._element2dict(element, schema)
+                root.clear()
+
+    def save_iter(self, books):
+        with open(self.filePath, 'w') as file:
+            file.write('<Library>')
+            for i, book in enumerate(books):
+                item = {**book}
+                uuid = item.pop('uuid') if 'uuid' in item.keys() else str(i)
+                file.write(Et.tostring(self._dict2element(uuid, item), encoding='unicode'))
+            file.write('</Library>')
+
+    @staticmethod
+    def _dict2element(uuid: str, item: dict, parent=None):
+        attributes = {"uuid": uuid}
+        element = Et.Element('book', attributes) if parent is None else Et.SubElement(parent, 'book', attributes)
+        for key, value in item.items():
+            if value is not None:
+                sub_element = Et.SubElement(element, key)
+                sub_element.text = str(value)
+        return element
+
     @staticmethod
     def _list2elements(list_: T):
         parent = Et.Element('Library')
         dict_ = list2dict(list_)
         for uuid, item in dict_.items():
-            element = Et.SubElement(parent, 'book', {"uuid": uuid})
-            for key, value in item.items():
-                sub_element = Et.SubElement(element, key)
-                sub_element.text = str(value)
+            XmlLoader._dict2element(uuid, item, parent)
         return parent
 
+    @staticmethod
+    def _element2dict(element, schema: Schema) -> Book:
+        item = {sub_element.tag: schema.decoder(sub_element.tag)(sub_element.text) for sub_element in element}
+        item['uuid'] = element.attrib['uuid']
+        if len(item) < len(schema.types):
+            for field in schema.types:
+                item.setdefault(field, None)
+        return item
+
     @staticmethod
     def _elements2list(elements) -> T:
-        result_list = []
-        for element in elements:
-            item = {}
-            for sub_element in element:
-                value = sub_element.text
-                try:
-                    value = int(value)
-                except ValueError:
-                    if value.lower() in ['true', 'false']:
-                        value = value.lower() == 'true'
-                except TypeError:
-                    value = ''
-                finally:
-                    item[sub_element.tag] = value
-            item['uuid'] = element.attrib['uuid']
-            result_list.append(item)
-        return result_list
+        schema = Schema(())
+        return [XmlLoader._element2dict(element, schema) for element in elements]
 
 
 @register_extension
@@ -164,10 +540,10 @@ class YamlLoader[T](BaseLoader[T]):
     extension = ".yaml"
 
     def deserialize(self, serialized_content):
-        return dict2list(yaml.safe_load(serialized_content))
+        return dict2list(get_codec("yaml").loads(serialized_content))
 
     def serialize(self, content):
-        return yaml.dump(list2dict(content), default_flow_style=False)
+        return get_codec("yaml").dumps(list2dict(content))
 
 
 @register_extension
@@ -175,46 +551,451 @@ class TomlLoader[T](BaseLoader[T]):
     extension = ".toml"
 
     def deserialize(self, serialized_content: str) -> list:
-        return dict2list(toml.loads(serialized_content))
+        return dict2list(get_codec("toml").loads(serialized_content))
 
     def serialize(self, content: list) -> str:
-        return toml.dumps(list2dict(content))
+        return get_codec("toml").dumps(list2dict(content))
 
 
 @register_extension
 class CsvLoader[T: list[dict]](BaseLoader[T]):
     extension = ".csv"
+    # Books are read lazily by the byte span of their rows.
+    randomAccess = True
+    # The start and the end offset of every row, and the schema of the header, recorded by keys.
+    _spans: array | None = None
+    _schema: Schema | None = None
 
     def deserialize(self, serialized_content):
         input_ = io.StringIO(serialized_content)
-        rows = list(csv.DictReader(input_))
-
-        for row in rows:
-            for key, value in row.items():
-                try:
-                    value = int(value)
-                except ValueError:
-                    if value.lower() in ['true', 'false']:
-                        value = value.lower() == 'true'
-                finally:
-                    row[key] = value
-        return list(rows)
+        return list(self._decode_rows(csv.reader(input_)))
 
     def serialize(self, content):
         output = io.StringIO()
-        if len(content) != 0:
-            writer = csv.DictWriter(output, fieldnames=content[0].keys())
-            writer.writeheader()
-            writer.writerows(content)
+        self._write_rows(output, content)
+        return output.getvalue()
+
+    def load(self):
+        # Reading the rows from the file is as fast as reading the whole text first, in half the memory.
+        return list(self.iter_load())
+
+    def iter_load(self):
+        with open(self.filePath, 'r', newline='') as file:
+            yield from self._decode_rows(csv.reader(file))
+
+    def keys(self):
+        uuids, spans, end = [], array('q'), 0
+        # Every byte is a character in latin-1, so the offsets are byte offsets; only the values are decoded
+        # from UTF-8 again.
+        with open(self.filePath, 'r', encoding='latin-1', newline='') as file:
+            def lines():
+                nonlocal end
+                for line in file:
+                    end += len(line)
+                    yield line
+
+            reader = csv.reader(lines())
+            schema = Schema(column.encode('latin-1').decode() for column in next(reader, ()))
+            if "uuid" not in schema.columns:
+                raise ValueError(f"{self.filePath} has no uuid column")
+            column, start = schema.columns.index("uuid"), end
+            for row in reader:
+                # A quoted value can span lines, so a row ends where the reader stopped.
+                if row:
+                    uuid = row[column]
+                    uuids.append(uuid if uuid.isascii() else uuid.encode('latin-1').decode())
+                    spans.extend((start, end))
+                start = end
+        self._spans, self._schema = spans, schema
+        return uuids
+
+    def read(self, positions):
+        if self._spans is None:
+            self.keys()
+        decode = self._schema.decode
+        for text in _read_spans(self.filePath, self._spans, positions):
+            yield decode(next(csv.reader(io.StringIO(text.decode(), newline=''))))
+
+    def save_iter(self, books):
+        # The books may be read lazily from the file, so it is replaced once the new one is complete.
+        temporaryPath = self.filePath + ".tmp"
+        try:
+            with open(temporaryPath, 'w', newline='') as file:
+                self._write_rows(file, books)
+            os.replace(temporaryPath, self.filePath)
+        finally:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+        self._spans = None
+
+    @staticmethod
+    def _decode_rows(reader) -> Iterator[Book]:
+        decode = Schema(next(reader, ())).decode
+        for row in reader:
+            if row:
+                yield decode(row)
+
+    @staticmethod
+    def _write_rows(file, books: Iterable[Book]):
+        writer = csv.writer(file)
+        schema = None
+        for book in books:
+            if schema is None:
+                schema = Schema(book.keys())
+                writer.writerow(schema.columns)
+            writer.writerow(schema.encode(book))
+
+
+@register_extension
+class SqliteLoader[T: list[Book]](BaseLoader[T]):
+    """
+    Keeps the books in an indexed SQLite table.
+
+    Unlike the text formats the database is updated in place: apply_changes persists single changes in one
+    transaction, so saving does not rewrite the catalog. Serializing produces an SQL script, so the books can
+    still be exchanged as text. Names and authors are stored as they are: the library matches them
+    case-insensitively with str.lower, which folds all of Unicode, while SQLite's NOCASE folds only ASCII.
+    """
+    extension = ".sqlite"
+    transactional = True
+    _schemaReady: bool = False
+
+    FIELDS = tuple(Book.__annotations__)
+    SCHEMA = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS books (
+            uuid TEXT PRIMARY KEY,
+            name TEXT,
+            author TEXT,
+            available INTEGER,
+            issue_date TEXT,
+            expire_date TEXT,
+            number_of_readings INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS books_name ON books (name);
+        CREATE INDEX IF NOT EXISTS books_author ON books (author);
+        CREATE INDEX IF NOT EXISTS books_available ON books (available);
+        COMMIT;
+    """
+
+    def load(self):
+        return list(self.iter_load())
+
+    def save(self, content):
+        self.save_iter(content)
+
+    def deserialize(self, serialized_content):
+        with closing(sqlite3.connect(":memory:")) as connection:
+            connection.executescript(serialized_content)
+            return list(self._select(connection, ""))
+
+    def serialize(self, content):
+        with closing(sqlite3.connect(":memory:")) as connection:
+            connection.executescript(self.SCHEMA)
+            self._insert(connection, content)
+            return "\n".join(connection.iterdump())
+
+    def iter_load(self):
+        with closing(self._connect()) as connection:
+            yield from self._select(connection, "")
+
+    def save_iter(self, books):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM books")
+            self._insert(connection, books)
+
+    def apply_changes(self, records: Iterable[dict]):
+        """
+        Persists changes of the books in a single transaction.
+
+        Args:
+            records (Iterable[dict]): The changes, as the "add", "remove" and "update" records of a Journal.
+        """
+        with closing(self._connect()) as connection, connection:
+            for record in records:
+                match record["op"]:
+                    case "add":
+                        self._insert(connection, (record["book"],))
+                    case "remove":
+                        connection.execute("DELETE FROM books WHERE uuid = ?", (record["uuid"],))
+                    case "update":
+                        fields = record["fields"]
+                        assignments = ", ".join(f"{self._column(key)} = ?" for key in fields)
+                        connection.execute(f"UPDATE books SET {assignments} WHERE uuid = ?",
+                                           (*fields.values(), record["uuid"]))
+
+    def _connect(self) -> "sqlite3.Connection":
+        connection = sqlite3.connect(self.filePath)
+        if not self._schemaReady:
+            # Only the first connection creates the missing tables, before any transaction of its own is open;
+            # executescript commits whatever is pending, so it must not run on the connections doing the work.
+            connection.executescript(self.SCHEMA)
+            self._schemaReady = True
+        return connection
+
+    def _column(self, attribute: str) -> str:
+        if attribute not in self.FIELDS:
+            raise ValueError(f"Unsupported attribute: {attribute}")
+        return attribute
+
+    def _insert(self, connection: "sqlite3.Connection", books: Iterable[Book]):
+        fields = self.FIELDS
+        statement = f"INSERT OR REPLACE INTO books ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})"
+        connection.executemany(statement, (tuple(book.get(field) for field in fields) for book in books))
+
+    def _select(self, connection: "sqlite3.Connection", where: str, parameters: tuple = ()) -> Iterator[Book]:
+        fields = self.FIELDS
+        for row in connection.execute(f"SELECT {', '.join(fields)} FROM books {where} ORDER BY rowid", parameters):
+            book = dict(zip(fields, row))
+            book["available"] = bool(book["available"])
+            yield book
+
+
+@register_extension
+class DbLoader[T: list[Book]](SqliteLoader[T]):
+    extension = ".db"
+
+
+@register_extension
+class KbinLoader[T: list[Book]](BaseLoader[T]):
+    """
+    Keeps the books in a binary file of fixed-width records that is read and updated through mmap.
+
+    The file holds a header, one record per book, the record numbers sorted by UUID and a heap of UTF-8
+    strings. Records point into the heap for the UUID, name and author and keep the availability, dates
+    and readings in place, so find locates a book with a binary search over the sorted record numbers and
+    apply_changes overwrites the state of a book without touching the rest of the file. Files are replaced,
+    not truncated, when they are rewritten, so books can still be read from an older mapping meanwhile.
+    Serializing produces the bytes of such a file.
+    """
+    extension = ".kbin"
+    transactional = True
+    randomAccess = True
+
+    MAGIC = b"KBIN"
+    VERSION = 1
+    # magic, version, record count, offset of the sorted record numbers, offset of the string heap
+    HEADER = struct.Struct("<4sHxxIQQ4x")
+    # offset and length of the uuid, name and author in the heap, followed by STATE
+    RECORD = struct.Struct("<IIIIIIBxxxqqI")
+    # flags, issue date, expire date, number of readings
+    STATE = struct.Struct("<BxxxqqI")
+    STATE_OFFSET = RECORD.size - STATE.size
+    STATE_FIELDS = frozenset(("available", "issue_date", "expire_date", "number_of_readings"))
+
+    _AVAILABLE = 1
+    _NO_ISSUE_DATE = 2
+    _NO_EXPIRE_DATE = 4
+    _EMPTY_DATE = -(1 << 63)
+
+    def load(self):
+        return list(self.iter_load())
+
+    def save(self, content):
+        self.save_iter(content)
+
+    def deserialize(self, serialized_content):
+        return list(self._read(serialized_content))
+
+    def serialize(self, content):
+        output = io.BytesIO()
+        self._write(output, content)
         return output.getvalue()
 
+    def iter_load(self):
+        with open(self.filePath, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield from self._read(view)
+
+    def save_iter(self, books):
+        temporaryPath = self.filePath + ".tmp"
+        try:
+            with open(temporaryPath, 'wb') as file:
+                self._write(file, books)
+            os.replace(temporaryPath, self.filePath)
+        finally:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+
+    def keys(self):
+        with open(self.filePath, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            count, indexOffset, heapOffset = self._header(view)
+            words = array('I')
+            with memoryview(view) as buffer:
+                words.frombytes(buffer[self.HEADER.size:indexOffset])
+            if sys.byteorder == "big":
+                words.byteswap()
+            stride = self.RECORD.size // words.itemsize
+            # The UUIDs are sliced straight from the map instead of from a copy of the whole heap.
+            return [view[heapOffset + start:heapOffset + start + length].decode()
+                    for start, length in zip(words[0::stride], words[1::stride])]
+
+    def read(self, positions):
+        with open(self.filePath, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            header = self._header(view)
+            for position in positions:
+                yield self._record(view, header, position)
+
+    def find(self, uuid: str) -> Book | None:
+        """
+        Reads a single book without loading the rest of the catalog.
+
+        Args:
+            uuid (str): The UUID of the book.
+
+        Returns:
+            Book | None: The book, or None if the catalog has no book with the UUID.
+        """
+        with open(self.filePath, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            header = self._header(view)
+            number = self._search(view, header, uuid.encode())
+            return None if number is None else self._record(view, header, number)
+
+    def apply_changes(self, records: Iterable[dict]):
+        """
+        Persists changes of the books.
+
+        Updates of the availability, dates and readings are written into the records in place. Adding or
+        removing books, or renaming them, changes the layout of the file, so such batches rewrite it.
+
+        Args:
+            records (Iterable[dict]): The changes, as the "add", "remove" and "update" records of a Journal.
+        """
+        records = list(records)
+        if any(record["op"] != "update" or not self.STATE_FIELDS.issuperset(record["fields"]) for record in records):
+            catalog = {book["uuid"]: book for book in self.iter_load()}
+            Journal.apply(catalog, records)
+            self.save_iter(catalog.values())
+            return
+        with open(self.filePath, 'r+b') as file, mmap.mmap(file.fileno(), 0) as view:
+            header = self._header(view)
+            for record in records:
+                if (number := self._search(view, header, record["uuid"].encode())) is None:
+                    continue
+                offset = self.HEADER.size + number * self.RECORD.size + self.STATE_OFFSET
+                flags, issued, expires, readings = self.STATE.unpack_from(view, offset)
+                for key, value in record["fields"].items():
+                    match key:
+                        case "available":
+                            flags = flags | self._AVAILABLE if value else flags & ~self._AVAILABLE
+                        case "issue_date":
+                            flags, issued = self._pack_date(value, flags, self._NO_ISSUE_DATE)
+                        case "expire_date":
+                            flags, expires = self._pack_date(value, flags, self._NO_EXPIRE_DATE)
+                        case "number_of_readings":
+                            readings = value
+                self.STATE.pack_into(view, offset, flags, issued, expires, readings)
+            view.flush()
+
+    def _header(self, view) -> tuple[int, int, int]:
+        if len(view) < self.HEADER.size:
+            raise ValueError(f"{self.filePath} is not a {self.extension} catalog")
+        magic, version, count, indexOffset, heapOffset = self.HEADER.unpack_from(view)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.filePath} is not a {self.extension} catalog")
+        return count, indexOffset, heapOffset
+
+    def _search(self, view, header: tuple[int, int, int], key: bytes) -> int | None:
+        count, indexOffset, heapOffset = header
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            number, = struct.unpack_from("<I", view, indexOffset + 4 * middle)
+            start, length = struct.unpack_from("<II", view, self.HEADER.size + number * self.RECORD.size)
+            uuid = view[heapOffset + start:heapOffset + start + length]
+            if uuid == key:
+                return number
+            if uuid < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _record(self, view, header: tuple[int, int, int], number: int) -> Book:
+        heapOffset = header[2]
+        (uuidStart, uuidLength, nameStart, nameLength, authorStart, authorLength,
+         flags, issued, expires, readings) = self.RECORD.unpack_from(view, self.HEADER.size + number * self.RECORD.size)
+        return Book(
+            uuid=view[heapOffset + uuidStart:heapOffset + uuidStart + uuidLength].decode(),
+            name=view[heapOffset + nameStart:heapOffset + nameStart + nameLength].decode(),
+            author=sys.intern(view[heapOffset + authorStart:heapOffset + authorStart + authorLength].decode()),
+            available=bool(flags & self._AVAILABLE),
+            issue_date=self._unpack_date(issued, flags, self._NO_ISSUE_DATE),
+            expire_date=self._unpack_date(expires, flags, self._NO_EXPIRE_DATE),
+            number_of_readings=readings
+        )
+
+    def _read(self, view) -> Iterator[Book]:
+        count, indexOffset, heapOffset = self._header(view)
+        # The records are unpacked through a view and the strings sliced straight from the file, so neither
+        # region is copied. The view goes with the frame of this generator, which is cleared before iter_load
+        # closes the map.
+        records = memoryview(view)[self.HEADER.size:indexOffset]
+        intern, unpack_date = sys.intern, self._unpack_date
+        for (uuidStart, uuidLength, nameStart, nameLength, authorStart, authorLength,
+             flags, issued, expires, readings) in self.RECORD.iter_unpack(records):
+            uuidStart += heapOffset
+            nameStart += heapOffset
+            authorStart += heapOffset
+            yield {
+                "uuid": view[uuidStart:uuidStart + uuidLength].decode(),
+                "name": view[nameStart:nameStart + nameLength].decode(),
+                "author": intern(view[authorStart:authorStart + authorLength].decode()),
+                "available": bool(flags & self._AVAILABLE),
+                "issue_date": unpack_date(issued, flags, self._NO_ISSUE_DATE),
+                "expire_date": unpack_date(expires, flags, self._NO_EXPIRE_DATE),
+                "number_of_readings": readings
+            }
+
+    def _write(self, file, books: Iterable[Book]):
+        file.write(bytes(self.HEADER.size))
+        heap = bytearray()
+        authors: dict[str, tuple[int, int]] = {}
+        keys: list[bytes] = []
+
+        def store(value: bytes) -> tuple[int, int]:
+            start = len(heap)
+            heap.extend(value)
+            return start, len(value)
+
+        for book in books:
+            uuid = book["uuid"].encode()
+            keys.append(uuid)
+            if (author := authors.get(book["author"])) is None:
+                author = authors[book["author"]] = store(book["author"].encode())
+            flags = self._AVAILABLE if book["available"] else 0
+            flags, issued = self._pack_date(book.get("issue_date"), flags, self._NO_ISSUE_DATE)
+            flags, expires = self._pack_date(book.get("expire_date"), flags, self._NO_EXPIRE_DATE)
+            file.write(self.RECORD.pack(*store(uuid), *store(book["name"].encode()), *author,
+                                        flags, issued, expires, book["number_of_readings"]))
+        index = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+        if sys.byteorder == "big":
+            index.byteswap()
+        indexOffset = self.HEADER.size + len(keys) * self.RECORD.size
+        file.write(index.tobytes())
+        file.write(heap)
+        file.seek(0)
+        file.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(keys), indexOffset, indexOffset + 4 * len(keys)))
+
+    @classmethod
+    def _pack_date(cls, date: str | None, flags: int, missing: int) -> tuple[int, int]:
+        if date is None:
+            return flags | missing, cls._EMPTY_DATE
+        timestamp = date2timestamp(date)
+        return flags & ~missing, cls._EMPTY_DATE if timestamp is None else timestamp
+
+    @classmethod
+    def _unpack_date(cls, timestamp: int, flags: int, missing: int) -> str | None:
+        if flags & missing:
+            return None
+        return "" if timestamp == cls._EMPTY_DATE else timestamp2date(timestamp)
+
 
 def dump_data[T](data: T, filePath: str):
     """
-    Dumps a list of books to a file.
+    Dumps a list of books to a file, streaming them when the format allows it.
 
     Args:
-        data (Generic[T]): The list of books to dump.
+        data (Generic[T]): The list, or any iterable, of books to dump.
         filePath (str): The path of the file to dump the books to.
 
     Raises:
@@ -222,11 +1003,64 @@ def dump_data[T](data: T, filePath: str):
     """
     if (loaderClass := supportedExtensions.get(os.path.splitext(filePath)[1].lower())) is not None:
         loader = loaderClass[T](filePath)
-        loader.save(data)
+        loader.save_iter(data)
     else:
         raise TypeError(f"File format of {filePath} is unsupported!!")
 
 
+# The books of the export running in a worker process, set once per worker by _share_snapshot.
+_snapshot: list[Book] = []
+
+
+def _share_snapshot(books: list[Book]):
+    global _snapshot
+    _snapshot = books
+
+
+def _export_snapshot(filePath: str) -> float:
+    start = time.perf_counter()
+    dump_data(_snapshot, filePath)
+    return time.perf_counter() - start
+
+
+def export_data(data: Iterable[Book], filePaths: Iterable[str], workers: int | None = None) -> dict[str, float]:
+    """
+    Dumps a list of books to several files concurrently, one format per worker process.
+
+    The books are copied into a single snapshot first, which every worker receives once when it starts,
+    so later changes of the books do not leak into the export and the books are not sent once per file.
+
+    Args:
+        data (Iterable[Book]): The books to dump.
+        filePaths (Iterable[str]): The paths of the files to dump the books to; their extensions select the
+            formats.
+        workers (int | None): The maximum number of worker processes. Defaults to one per file, up to the
+            number of CPUs. With a single worker the files are written one after another in this process.
+
+    Returns:
+        dict[str, float]: The seconds it took to write each file, by path.
+
+    Raises:
+        TypeError: If the format of a file is unsupported.
+    """
+    filePaths = list(filePaths)
+    for filePath in filePaths:
+        if os.path.splitext(filePath)[1].lower() not in supportedExtensions:
+            raise TypeError(f"File format of {filePath} is unsupported!!")
+    snapshot = [dict(book) for book in data]
+    workers = min(len(filePaths), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        _share_snapshot(snapshot)
+        try:
+            return {filePath: _export_snapshot(filePath) for filePath in filePaths}
+        finally:
+            _share_snapshot([])
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_share_snapshot, initargs=(snapshot,)) as executor:
+        return dict(zip(filePaths, executor.map(_export_snapshot, filePaths)))
+
+
 def get_loader(filePath) -> BaseLoader:
     """
     Gets a file loader for a specific file.
@@ -0,0 +1,269 @@
+import shlex
+from typing import Any, Iterable, Iterator
+
+from managers.indexes import BaseIndex, SortedIndex
+from utils import Book
+
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "prefix")
+
+
+class Condition:
+    """
+    A single comparison of a book attribute with a value.
+
+    Attributes:
+        attribute (str): The attribute to compare.
+        operator (str): One of OPERATORS.
+        value (Any): The value to compare with; strings are converted to the type of the attribute.
+    """
+
+    def __init__(self, attribute: str, operator: str, value: Any):
+        """
+        Initializes a new instance of the Condition class.
+
+        Raises:
+            ValueError: If the operator is unsupported.
+        """
+        if operator not in OPERATORS:
+            raise ValueError(f"Unsupported operator: {operator}")
+        self.attribute = attribute
+        self.operator = operator
+        self.value = value
+
+    def __repr__(self):
+        return f"Condition({self.attribute!r}, {self.operator!r}, {self.value!r})"
+
+    def key(self, sample: Any) -> Any:
+        """
+        Converts the value of the condition to a normalized key comparable with the attribute.
+
+        Args:
+            sample (Any): A value of the attribute, used to find out its type.
+
+        Returns:
+            Any: The normalized key.
+        """
+        value = self.value
+        if isinstance(value, str):
+            if isinstance(sample, bool):
+                return value.lower() == 'true'
+            if isinstance(sample, int):
+                return int(value)
+        return BaseIndex.normalize(value)
+
+    def matches(self, book: Book, key: Any) -> bool:
+        """
+        Checks whether a book satisfies the condition.
+
+        Args:
+            book (Book): The book to check.
+            key (Any): The normalized key of the condition.
+
+        Returns:
+            bool: True if the book satisfies the condition.
+        """
+        value = BaseIndex.normalize(book.get(self.attribute))
+        try:
+            match self.operator:
+                case "=":
+                    return value == key
+                case "!=":
+                    return value != key
+                case "<":
+                    return value < key
+                case "<=":
+                    return value <= key
+                case ">":
+                    return value > key
+                case ">=":
+                    return value >= key
+                case "prefix":
+                    return isinstance(value, str) and value.startswith(key)
+        except TypeError:
+            return False
+
+
+class Query:
+    """
+    A conjunction of conditions with an optional ordering and limit.
+
+    Queries are built either fluently, e.g.
+    ``Query().where("author", "prefix", "Ad").where("available", "=", True).order_by("number_of_readings",
+    descending=True).limit(20)``, or parsed from text with ``Query.parse``.
+
+    Attributes:
+        conditions (list[Condition]): The conditions every result satisfies.
+        orderBy (str | None): The attribute to order the results by.
+        descending (bool): Whether the results are ordered in descending order.
+        limitCount (int | None): The maximum number of results.
+    """
+
+    def __init__(self):
+        self.conditions: list[Condition] = []
+        self.orderBy: str | None = None
+        self.descending = False
+        self.limitCount: int | None = None
+
+    def where(self, attribute: str, operator: str, value: Any) -> "Query":
+        """
+        Adds a condition to the query.
+        """
+        self.conditions.append(Condition(attribute, operator, value))
+        return self
+
+    def order_by(self, attribute: str, descending: bool = False) -> "Query":
+        """
+        Orders the results by an attribute.
+        """
+        self.orderBy = attribute
+        self.descending = descending
+        return self
+
+    def limit(self, count: int) -> "Query":
+        """
+        Limits the number of results.
+
+        Raises:
+            ValueError: If the count is negative.
+        """
+        if count < 0:
+            raise ValueError(f"LIMIT can not be negative: {count}")
+        self.limitCount = count
+        return self
+
+    @classmethod
+    def parse(cls, text: str) -> "Query":
+        """
+        Parses a query such as
+        ``author prefix 'Ad' AND available AND number_of_readings >= 50 ORDER BY number_of_readings DESC LIMIT 20``.
+
+        A bare attribute is a shorthand for ``attribute = true``. Keywords are case-insensitive and values
+        containing spaces must be quoted.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            Query: The parsed query.
+
+        Raises:
+            ValueError: If the text is not a valid query.
+        """
+        lexer = shlex.shlex(text, posix=True, punctuation_chars="<>=!")
+        tokens = list(lexer)
+        query = cls()
+        position = 0
+
+        def take() -> str:
+            nonlocal position
+            if position >= len(tokens):
+                raise ValueError(f"Unexpected end of query: {text}")
+            position += 1
+            return tokens[position - 1]
+
+        def peek() -> str:
+            return tokens[position].lower() if position < len(tokens) else ""
+
+        while position < len(tokens) and peek() not in ("order", "limit"):
+            attribute = take()
+            if peek() in OPERATORS:
+                query.where(attribute, take().lower(), take())
+            else:
+                query.where(attribute, "=", "true")
+            if peek() == "and":
+                take()
+            elif position < len(tokens) and peek() not in ("order", "limit"):
+                raise ValueError(f"Expected AND, ORDER BY or LIMIT but found {tokens[position]!r}")
+        if peek() == "order":
+            take()
+            if take().lower() != "by":
+                raise ValueError("Expected BY after ORDER")
+            attribute = take()
+            descending = False
+            if peek() in ("asc", "desc"):
+                descending = take().lower() == "desc"
+            query.order_by(attribute, descending)
+        if peek() == "limit":
+            take()
+            try:
+                count = int(take())
+            except ValueError:
+                raise ValueError(f"LIMIT must be an integer: {text}") from None
+            query.limit(count)
+        if position < len(tokens):
+            raise ValueError(f"Unexpected {tokens[position]!r} in query: {text}")
+        return query
+
+
+def execute(query: Query, books: dict[str, Book], indexes: dict[str, BaseIndex]) -> Iterator[str]:
+    """
+    Runs a query over a catalog and lazily yields the UUIDs of the matching books.
+
+    The condition whose index yields the fewest candidates drives the search, conditions answered by a
+    single index bucket are intersected with it and the remaining ones are checked book by book. Without
+    an ORDER BY the results come in no particular order.
+
+    Args:
+        query (Query): The query to run.
+        books (dict[str, Book]): The books of the catalog by UUID.
+        indexes (dict[str, BaseIndex]): The secondary indexes of the catalog by attribute.
+
+    Yields:
+        str: The UUIDs of the matching books.
+    """
+    if not books or query.limitCount == 0:
+        return
+    sample = next(iter(books.values()))
+    keyed = [(condition, condition.key(sample.get(condition.attribute))) for condition in query.conditions]
+
+    selections = []
+    filters = []
+    for condition, key in keyed:
+        index = indexes.get(condition.attribute)
+        buckets = index.select(condition.operator, key) if index is not None else None
+        if buckets is None:
+            filters.append((condition, key))
+        else:
+            selections.append((sum(map(len, buckets)), buckets, condition, key))
+    selections.sort(key=lambda selection: selection[0])
+
+    candidates = None
+    if selections:
+        _, buckets, _, _ = selections[0]
+        candidates = set().union(*buckets) if len(buckets) != 1 else set(buckets[0])
+        for _, buckets, condition, key in selections[1:]:
+            if len(buckets) == 1:
+                candidates &= buckets[0]
+            else:
+                filters.append((condition, key))
+
+    results = _ordered(query, candidates, books, indexes)
+    count = 0
+    for uuid, book in books.items() if results is books else ((uuid, books[uuid]) for uuid in results):
+        if all(condition.matches(book, key) for condition, key in filters):
+            yield uuid
+            count += 1
+            if count == query.limitCount:
+                return
+
+
+def _ordered(query: Query, candidates: set[str] | None, books: dict[str, Book],
+             indexes: dict[str, BaseIndex]) -> Iterable[str]:
+    """
+    Orders the candidates of a query, walking a sorted index lazily when that is cheaper than sorting.
+    """
+    if query.orderBy is None:
+        return books if candidates is None else candidates
+    index = indexes.get(query.orderBy)
+    if isinstance(index, SortedIndex) and (candidates is None or len(candidates) * 8 >= len(books)):
+        return (uuid for bucket in index.ordered(query.descending) for uuid in bucket
+                if candidates is None or uuid in candidates)
+
+    def sort_key(uuid):
+        value = BaseIndex.normalize(books[uuid].get(query.orderBy))
+        return (value is None) != query.descending, value
+
+    try:
+        return sorted(books if candidates is None else candidates, key=sort_key, reverse=query.descending)
+    except TypeError:
+        raise ValueError(f"Can not order by {query.orderBy}") from None
@@ -0,0 +1,103 @@
+from typing import Any, Callable, Iterable
+
+from utils import Book
+
+
+def _decode_text(value: str | None) -> str:
+    return "" if value is None else value
+
+
+def _decode_boolean(value: str | None) -> bool:
+    return value is not None and value.lower() == "true"
+
+
+def _decode_integer(value: str | None) -> int:
+    return int(value) if value else 0
+
+
+def _decode_unknown(value: str | None) -> Any:
+    """
+    Guesses the type of a value of a column the schema does not know, without raising.
+    """
+    if not value:
+        return ""
+    if value.isascii() and (value.isdigit() or value[0] == "-" and value[1:].isdigit()):
+        return int(value)
+    lowered = value.lower()
+    if lowered == "true" or lowered == "false":
+        return lowered == "true"
+    return value
+
+
+def _encode(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+_DECODERS: dict[type, Callable[[str | None], Any]] = {str: _decode_text, bool: _decode_boolean, int: _decode_integer}
+
+
+class Schema:
+    """
+    Converts the text fields of books to and from their types, compiled once for the columns of a file.
+
+    The type of every column is looked up in a TypedDict, Book by default, when the schema is created, so
+    decoding a row only calls the converter of each column. Columns the TypedDict does not know keep the
+    old behaviour of guessing integers and booleans.
+
+    Attributes:
+        columns (tuple[str, ...]): The names of the columns.
+        decoders (tuple[Callable, ...]): The converter from text of every column.
+        types (dict[str, type]): The type of every known field.
+        _decoders (dict[str, Callable]): The converters looked up so far, by column.
+    """
+
+    def __init__(self, columns: Iterable[str], typedDict: type = Book):
+        """
+        Initializes a new instance of the Schema class.
+
+        Args:
+            columns (Iterable[str]): The names of the columns, e.g. the header of a CSV file.
+            typedDict (type): The TypedDict describing the fields.
+        """
+        self.types: dict[str, type] = typedDict.__annotations__
+        self._decoders: dict[str, Callable[[str | None], Any]] = {}
+        self.columns = tuple(columns)
+        self.decoders = tuple(self.decoder(column) for column in self.columns)
+
+    def decoder(self, column: str) -> Callable[[str | None], Any]:
+        """
+        Returns the converter from text of a column, looking its type up on the first call.
+
+        Args:
+            column (str): The name of the column.
+
+        Returns:
+            Callable[[str | None], Any]: The converter.
+        """
+        if (decoder := self._decoders.get(column)) is None:
+            decoder = self._decoders[column] = _DECODERS.get(self.types.get(column), _decode_unknown)
+        return decoder
+
+    def decode(self, values: Iterable[str | None]) -> Book:
+        """
+        Converts the text values of a row to a book.
+
+        Args:
+            values (Iterable[str | None]): The values, in the order of the columns.
+
+        Returns:
+            Book: The book.
+        """
+        return {column: decode(value) for column, decode, value in zip(self.columns, self.decoders, values)}
+
+    def encode(self, book: Book) -> list[str | None]:
+        """
+        Converts a book to the text values of a row.
+
+        Args:
+            book (Book): The book.
+
+        Returns:
+            list[str | None]: The values in the order of the columns; None for missing or null fields.
+        """
+        return [_encode(book.get(column)) for column in self.columns]
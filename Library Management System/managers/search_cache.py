@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from utils import Book
+
+
+class CacheInfo(NamedTuple):
+    """
+    The counters of a search cache.
+
+    Attributes:
+        hits (int): The number of searches answered from the cache.
+        misses (int): The number of searches that had to be run.
+        size (int): The number of cached results.
+        capacity (int): The maximum number of cached results.
+    """
+    hits: int
+    misses: int
+    size: int
+    capacity: int
+
+
+class SearchCache:
+    """
+    A least recently used cache of search results, invalidated by generation counters.
+
+    Every result is stamped with the generation of the library and the generation of its attribute when it
+    is stored, and is only returned while both are unchanged. Updating a book bumps the generations of the
+    changed attributes only, so issuing a book keeps the cached author and name searches. Adding or removing
+    a book bumps the generation of the library, since it can change any result and the order of the books.
+
+    Attributes:
+        capacity (int): The maximum number of cached results.
+        hits (int): The number of searches answered from the cache.
+        misses (int): The number of searches that had to be run.
+        generation (int): Bumped whenever a book is added or removed.
+        generations (dict[str, int]): The generation of every attribute, bumped whenever it changes.
+        _entries (OrderedDict): The (generation stamp, results) of every search, least recently used first.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initializes a new instance of the SearchCache class.
+
+        Args:
+            capacity (int): The maximum number of cached results.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self.generations: dict[str, int] = {}
+        self._entries: OrderedDict[tuple[str, Any], tuple[tuple[int, int], tuple[str, ...]]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _stamp(self, attribute: str) -> tuple[int, int]:
+        return self.generation, self.generations.get(attribute, 0)
+
+    def get(self, attribute: str, key: Any) -> tuple[str, ...] | None:
+        """
+        Looks up the results of a search.
+
+        Args:
+            attribute (str): The searched attribute.
+            key (Any): The normalized searched value.
+
+        Returns:
+            tuple[str, ...] | None: The cached results, or None if they are missing or outdated.
+        """
+        entry = self._entries.get((attribute, key))
+        if entry is not None:
+            if entry[0] == self._stamp(attribute):
+                self._entries.move_to_end((attribute, key))
+                self.hits += 1
+                return entry[1]
+            del self._entries[(attribute, key)]
+        self.misses += 1
+        return None
+
+    def put(self, attribute: str, key: Any, results: tuple[str, ...]) -> None:
+        """
+        Stores the results of a search, evicting the least recently used one when the cache is full.
+
+        Args:
+            attribute (str): The searched attribute.
+            key (Any): The normalized searched value.
+            results (tuple[str, ...]): The UUIDs of the found books, kept immutable since the cache shares them.
+        """
+        if self.capacity <= 0:
+            return
+        self._entries[(attribute, key)] = (self._stamp(attribute), results)
+        self._entries.move_to_end((attribute, key))
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Bumps the generations a mutation event of the library outdates.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        if event == "update":
+            for attribute in previous:
+                self.generations[attribute] = self.generations.get(attribute, 0) + 1
+        else:
+            self.generation += 1
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the counters of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, len(self._entries), self.capacity)
@@ -0,0 +1,240 @@
+"""
+Serves a library to many clients over TCP with a line protocol of JSON objects.
+
+Every request is one JSON object on a line, such as ``{"op": "issue", "uuid": "..."}``, and is answered by one
+JSON object on a line with an "ok" member. Run from the project root:
+    python -m managers.service resources/books.json --port 8765
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Coroutine
+
+from managers.library import Library, OperationResult
+
+
+class LibraryService:
+    """
+    Exposes the operations of a library to asynchronous clients.
+
+    All requests run on the event loop thread and never await in between, so they are serialized without
+    locks. Mutations are persisted in groups: the first change after a save schedules the next save
+    ``saveDelay`` seconds later, and every change made until then is saved by it. Even without a delay, the
+    changes of all requests that are ready in the same iteration of the event loop share a save. Saves run
+    one after another on a worker thread, so the loop keeps answering requests during the disk sync; the
+    library must therefore be concurrent. A mutation is answered only once the save containing it finished,
+    so an acknowledged change is never lost.
+
+    Attributes:
+        library (Library): The served library.
+        saveDelay (float): The seconds to wait for more changes before saving.
+        saves (int): The number of saves so far.
+        mutations (int): The number of saved mutations so far.
+        _batch (asyncio.Future | None): Resolved when the scheduled save finished, None if none is scheduled.
+        _batchSize (int): The number of mutations waiting for the scheduled save.
+        _saver (ThreadPoolExecutor): The worker thread running the saves.
+        _operations (dict[str, Callable]): The handler of every operation.
+    """
+
+    def __init__(self, library: Library, saveDelay: float = 0.0):
+        """
+        Initializes a new instance of the LibraryService class.
+
+        Args:
+            library (Library): The library to serve, which must be concurrent.
+            saveDelay (float): The seconds to wait for more changes before saving.
+
+        Raises:
+            ValueError: If the library is not concurrent.
+        """
+        if not library.concurrent:
+            raise ValueError("A served library must be concurrent, since it is saved on a worker thread")
+        self.library = library
+        self.saveDelay = saveDelay
+        self.saves = 0
+        self.mutations = 0
+        self._batch: asyncio.Future | None = None
+        self._batchSize = 0
+        self._saver = ThreadPoolExecutor(1, thread_name_prefix="library-save")
+        self._operations: dict[str, Callable[[dict], Any]] = {
+            "get": self._get,
+            "search": self._search,
+            "query": self._query,
+            "issue": self._issue,
+            "return": self._return,
+            "add": self._add,
+            "remove": self._remove,
+        }
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Runs a request.
+
+        Args:
+            request (dict): The request, with the operation under "op" and its arguments.
+
+        Returns:
+            dict: The response, with "ok" telling whether the request succeeded and "error" why it did not.
+        """
+        operation = self._operations.get(request.get("op")) if isinstance(request, dict) else None
+        if operation is None:
+            return {"ok": False, "error": "Unknown operation"}
+        try:
+            response = operation(request)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        except KeyError as error:
+            return {"ok": False, "error": f"Missing argument: {error.args[0]}"}
+        except Exception as error:
+            return {"ok": False, "error": str(error)}
+
+    def _mutated(self, result: OperationResult) -> dict | Coroutine[Any, Any, dict]:
+        """
+        Answers a mutation of the library, once it is saved if it succeeded.
+
+        Args:
+            result (OperationResult): The outcome of the mutation.
+        """
+        if not result.ok:
+            return {"ok": False, "error": result.message}
+        return self._saved({"ok": True, "message": result.message})
+
+    def _saved(self, response: dict) -> Coroutine[Any, Any, dict]:
+        """
+        Adds the last change to the scheduled save, scheduling one if needed.
+
+        Returns:
+            Coroutine: Returns the response once the save finished, or raises its error.
+        """
+        if self._batch is None:
+            loop = asyncio.get_running_loop()
+            self._batch = loop.create_future()
+            loop.call_later(self.saveDelay, self._save)
+        self._batchSize += 1
+        return self._after(self._batch, response)
+
+    @staticmethod
+    async def _after(batch: asyncio.Future, response: dict) -> dict:
+        # Shielded, so a client that goes away does not cancel the save for the others.
+        await asyncio.shield(batch)
+        return response
+
+    def _save(self) -> None:
+        batch, self._batch = self._batch, None
+        batchSize, self._batchSize = self._batchSize, 0
+        saved = asyncio.get_running_loop().run_in_executor(self._saver, self.library.persist)
+        saved.add_done_callback(partial(self._finish_save, batch, batchSize))
+
+    def _finish_save(self, batch: asyncio.Future, batchSize: int, saved: asyncio.Future) -> None:
+        if (error := saved.exception()) is not None:
+            batch.set_exception(error)
+        else:
+            self.saves += 1
+            self.mutations += batchSize
+            batch.set_result(None)
+
+    def close(self) -> None:
+        """
+        Waits for the running save and stops the worker thread of the saves.
+        """
+        self._saver.shutdown()
+
+    def _get(self, request: dict) -> dict:
+        if (book := self.library.get_book(request["uuid"])) is None:
+            return {"ok": False, "error": "Invalid UUID!"}
+        return {"ok": True, "book": dict(book)}
+
+    def _search(self, request: dict) -> dict:
+        return {"ok": True, "uuids": self.library.find(request["attribute"], str(request["value"]))}
+
+    def _query(self, request: dict) -> dict:
+        return {"ok": True, "uuids": list(islice(self.library.query(request["query"]), request.get("limit")))}
+
+    def _issue(self, request: dict) -> dict | Coroutine[Any, Any, dict]:
+        return self._mutated(self.library.issue(request["uuid"]))
+
+    def _return(self, request: dict) -> dict | Coroutine[Any, Any, dict]:
+        return self._mutated(self.library.return_(request["uuid"]))
+
+    def _add(self, request: dict) -> dict | Coroutine[Any, Any, dict]:
+        result = self.library.add(request["title"], request["author"])
+        return self._saved({"ok": True, "message": result.message, "uuid": result.uuid})
+
+    def _remove(self, request: dict) -> dict | Coroutine[Any, Any, dict]:
+        return self._mutated(self.library.remove(request["uuid"]))
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answers the requests of a connection until the client closes it.
+
+        Requests of a connection are answered in order; invalid JSON is answered with an error.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the requests.
+            writer (asyncio.StreamWriter): The stream of the responses.
+        """
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {"ok": False, "error": f"Invalid request: {error}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        """
+        Starts listening for clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+
+        Returns:
+            asyncio.Server: The server; close it to stop serving.
+        """
+        return await asyncio.start_server(self.serve_client, host, port, limit=1 << 20)
+
+
+async def _serve(library: Library, host: str, port: int, saveDelay: float) -> None:
+    service = LibraryService(library, saveDelay)
+    server = await service.start(host, port)
+    print(f"[+] Serving {library.bookListFile} on {', '.join(str(s.getsockname()) for s in server.sockets)}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(arguments: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m managers.service", description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("catalog", help="the catalog file to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--save-delay", dest="saveDelay", type=float, default=0.0,
+                        help="the seconds to collect changes before saving them together")
+    parser.add_argument("--no-journal", dest="journal", action="store_false",
+                        help="rewrite the catalog file on every save instead of appending to a journal")
+    options = parser.parse_args(arguments)
+    library = Library(bookListFile=options.catalog, journal=options.journal, concurrent=True)
+    try:
+        asyncio.run(_serve(library, options.host, options.port, options.saveDelay))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,181 @@
+import os
+from typing import Iterable, Iterator
+
+from managers.loaders import dump_data, get_loader, supportedExtensions
+from utils import Book
+
+
+def _load_shard_file(filePath: str) -> list[Book]:
+    return list(get_loader(filePath)(filePath).iter_load())
+
+
+class ShardedLoader:
+    """
+    A catalog stored as a directory of shard files, partitioned by the first characters of the UUIDs.
+
+    Every shard holds the books whose UUIDs start with its prefix in a file named after the prefix, such as
+    ``books/3f.json``, in any registered format. The shards are read and written on their own, so a library
+    only loads the shards it touches and rewrites the ones it changed. With hexadecimal UUIDs a catalog has
+    up to ``16 ** prefixLength`` shards.
+
+    The directory is not a file of any format, so the loader is a store of its own rather than a BaseLoader:
+    it offers the whole-catalog load, iter_load and save_iter a library relies on, and the shard operations.
+
+    Attributes:
+        filePath (str): The directory of the shards.
+        fileName (str): The directory of the shards, next to which exports are written.
+        fileExt (str): The extension of the shard files.
+        prefixLength (int): The number of leading UUID characters selecting the shard of a book.
+        paths (dict[str, str]): The path of every shard file by its prefix.
+        transactional (bool): Always False, changes are saved by rewriting the changed shards.
+        randomAccess (bool): Always False, single books are read by loading their shard.
+    """
+    defaultExtension = ".json"
+    defaultPrefixLength = 2
+    transactional = False
+    randomAccess = False
+
+    def __init__(self, filePath: str = '', extension: str | None = None, prefixLength: int | None = None):
+        """
+        Initializes a new instance of the ShardedLoader class.
+
+        The format and the prefix length are taken from the shard files of the directory when it has any.
+
+        Args:
+            filePath (str): The directory of the shards; it is created by the first save if it does not exist.
+            extension (str | None): The extension of the shard files. Defaults to the one of the existing
+                shards, or defaultExtension.
+            prefixLength (int | None): The number of leading UUID characters selecting the shard of a book.
+                Defaults to the one of the existing shards, or defaultPrefixLength.
+
+        Raises:
+            TypeError: If the format of the shards is unsupported.
+            ValueError: If the existing shards mix formats or prefix lengths, or disagree with the arguments.
+        """
+        self.filePath = filePath
+        self.fileName = filePath.rstrip(os.sep)
+        self.paths: dict[str, str] = {}
+        extensions, lengths = set(), set()
+        if os.path.isdir(filePath):
+            for entry in os.scandir(filePath):
+                prefix, fileExtension = os.path.splitext(entry.name)
+                # Shards being written are hidden until they replace the old ones.
+                if entry.is_file() and not entry.name.startswith(".") and \
+                        fileExtension.lower() in supportedExtensions:
+                    self.paths[prefix.lower()] = entry.path
+                    extensions.add(fileExtension.lower())
+                    lengths.add(len(prefix))
+        self.fileExt = (extension or (min(extensions) if extensions else self.defaultExtension)).lower()
+        self.prefixLength = prefixLength or (min(lengths) if lengths else self.defaultPrefixLength)
+        if self.fileExt not in supportedExtensions:
+            raise TypeError(f"File format {self.fileExt} is unsupported!!")
+        if extensions - {self.fileExt} or lengths - {self.prefixLength}:
+            raise ValueError(f"The shards of {filePath} must share the {self.fileExt} format and a prefix "
+                             f"length of {self.prefixLength}")
+
+    def shard_of(self, uuid: str) -> str:
+        """
+        Returns the prefix of the shard a book belongs to.
+
+        Args:
+            uuid (str): The UUID of the book.
+        """
+        return uuid[:self.prefixLength].lower()
+
+    def shards(self) -> list[str]:
+        """
+        Lists the prefixes of the existing shards, in order.
+        """
+        return sorted(self.paths)
+
+    def load_shard(self, prefix: str) -> list[Book]:
+        """
+        Loads the books of a shard.
+
+        Args:
+            prefix (str): The prefix of the shard.
+
+        Returns:
+            list[Book]: The books of the shard, none if the shard does not exist yet.
+        """
+        if (filePath := self.paths.get(prefix)) is None:
+            return []
+        return _load_shard_file(filePath)
+
+    def load_shards(self, prefixes: Iterable[str], workers: int | None = None) -> dict[str, list[Book]]:
+        """
+        Loads the books of several shards, in parallel worker processes.
+
+        Args:
+            prefixes (Iterable[str]): The prefixes of the shards.
+            workers (int | None): The maximum number of worker processes. Defaults to one per shard, up to the
+                number of CPUs. With a single worker the shards are loaded one after another in this process.
+
+        Returns:
+            dict[str, list[Book]]: The books of every shard, by prefix.
+        """
+        prefixes = list(prefixes)
+        existing = [prefix for prefix in prefixes if prefix in self.paths]
+        workers = min(len(existing), workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return {prefix: self.load_shard(prefix) for prefix in prefixes}
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as executor:
+            shards = dict(zip(existing, executor.map(_load_shard_file, [self.paths[prefix] for prefix in existing],
+                                                     chunksize=max(len(existing) // (workers * 4), 1))))
+        return {prefix: shards.get(prefix, []) for prefix in prefixes}
+
+    def save_shard(self, prefix: str, books: Iterable[Book]) -> None:
+        """
+        Replaces the books of a shard, creating the directory and the shard file if needed.
+
+        The shard is written to a hidden file first and moved over the old one, so it is never left half
+        written.
+
+        Args:
+            prefix (str): The prefix of the shard.
+            books (Iterable[Book]): The books of the shard.
+        """
+        os.makedirs(self.filePath, exist_ok=True)
+        filePath = os.path.join(self.filePath, prefix + self.fileExt)
+        partialPath = os.path.join(self.filePath, f".{prefix}.partial{self.fileExt}")
+        try:
+            dump_data(books, partialPath)
+            os.replace(partialPath, filePath)
+        finally:
+            if os.path.exists(partialPath):
+                os.remove(partialPath)
+        self.paths[prefix] = filePath
+
+    def iter_load(self) -> Iterator[Book]:
+        """
+        Loads the books of every shard, one shard at a time.
+
+        Yields:
+            Book: The books of the catalog.
+        """
+        for prefix in self.shards():
+            yield from self.load_shard(prefix)
+
+    def save_iter(self, books: Iterable[Book]):
+        """
+        Partitions books into shards and rewrites every shard, emptying the shards none of them belongs to.
+
+        Args:
+            books (Iterable[Book]): The books of the catalog.
+        """
+        shards: dict[str, list[Book]] = {prefix: [] for prefix in self.paths}
+        for book in books:
+            shards.setdefault(self.shard_of(book["uuid"]), []).append(book)
+        for prefix, shard in sorted(shards.items()):
+            self.save_shard(prefix, shard)
+
+    def load(self) -> list[Book]:
+        """
+        Loads the books of every shard.
+
+        Returns:
+            list[Book]: The books of the catalog.
+        """
+        return list(self.iter_load())
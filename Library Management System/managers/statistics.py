@@ -0,0 +1,232 @@
+import bisect
+import heapq
+from collections import Counter
+from typing import Hashable, Iterable, Mapping, NamedTuple
+
+from utils import Book
+
+
+class RankedCounter[K: Hashable]:
+    """
+    Counts per key, bucketed by count so that the largest ones are listed without sorting every key.
+
+    The keys sharing a count are kept in a bucket and the distinct counts in a sorted list. Changing the
+    count of a key moves it between buckets in O(log D + D) for D distinct counts, which stays small for the
+    reading counters of a catalog, and listing the k largest counts visits only the buckets above the k-th.
+
+    Attributes:
+        counts (dict[K, int]): The count of every key.
+        _buckets (dict[int, set[K]]): The keys of every count.
+        _levels (list[int]): The distinct counts, ascending.
+    """
+
+    def __init__(self):
+        self.counts: dict[K, int] = {}
+        self._buckets: dict[int, set[K]] = {}
+        self._levels: list[int] = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def set(self, key: K, count: int) -> None:
+        """
+        Sets the count of a key, adding the key if it is missing.
+
+        Args:
+            key (K): The key.
+            count (int): The new count of the key.
+        """
+        if (previous := self.counts.get(key)) == count:
+            return
+        if previous is not None:
+            self._leave(key, previous)
+        self.counts[key] = count
+        if (bucket := self._buckets.get(count)) is None:
+            bucket = self._buckets[count] = set()
+            bisect.insort(self._levels, count)
+        bucket.add(key)
+
+    def update(self, counts: Mapping[K, int]) -> None:
+        """
+        Sets the counts of several keys, bucketing them all at once when the counter is empty.
+
+        Args:
+            counts (Mapping[K, int]): The new count of every key.
+        """
+        if self.counts:
+            for key, count in counts.items():
+                self.set(key, count)
+            return
+        self.counts = dict(counts)
+        for key, count in self.counts.items():
+            if (bucket := self._buckets.get(count)) is None:
+                bucket = self._buckets[count] = set()
+            bucket.add(key)
+        self._levels = sorted(self._buckets)
+
+    def add(self, key: K, delta: int) -> None:
+        """
+        Changes the count of a key by a delta, adding the key with the delta if it is missing.
+
+        Args:
+            key (K): The key.
+            delta (int): The change of the count.
+        """
+        self.set(key, self.counts.get(key, 0) + delta)
+
+    def discard(self, key: K) -> None:
+        """
+        Removes a key, if it is counted.
+
+        Args:
+            key (K): The key.
+        """
+        if (count := self.counts.pop(key, None)) is not None:
+            self._leave(key, count)
+
+    def _leave(self, key: K, count: int) -> None:
+        bucket = self._buckets[count]
+        bucket.discard(key)
+        if not bucket:
+            del self._buckets[count]
+            del self._levels[bisect.bisect_left(self._levels, count)]
+
+    def most_common(self, n: int) -> list[tuple[K, int]]:
+        """
+        Lists the keys with the largest counts, ties ordered by key.
+
+        Args:
+            n (int): The maximum number of keys.
+
+        Returns:
+            list[tuple[K, int]]: The (key, count) pairs, the largest count first.
+        """
+        result = []
+        for count in reversed(self._levels):
+            if len(result) >= n:
+                break
+            bucket = self._buckets[count]
+            keys = sorted(bucket) if len(bucket) <= n - len(result) else heapq.nsmallest(n - len(result), bucket)
+            result.extend((key, count) for key in keys)
+        return result
+
+
+class AuthorStats(NamedTuple):
+    """
+    The circulation figures of an author.
+
+    Attributes:
+        author (str): The name of the author.
+        readings (int): The total number of readings of the books of the author.
+        books (int): The number of books of the author.
+    """
+    author: str
+    readings: int
+    books: int
+
+
+class CirculationStats:
+    """
+    Keeps circulation statistics of a library up to date from its mutation events.
+
+    Attributes:
+        issued (int): The number of issued books.
+        books (RankedCounter[str]): The number of readings of every book, by UUID.
+        authors (RankedCounter[str]): The total number of readings of the books of every author.
+        authorBooks (dict[str, int]): The number of books of every author.
+    """
+    # The fields of a book the statistics depend on.
+    fields = frozenset({"author", "available", "number_of_readings"})
+
+    def __init__(self):
+        self.issued = 0
+        self.books: RankedCounter[str] = RankedCounter()
+        self.authors: RankedCounter[str] = RankedCounter()
+        self.authorBooks: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.books)
+
+    def build(self, books: Iterable[Book]) -> None:
+        """
+        Counts every book of a collection, which must not be counted already.
+
+        Args:
+            books (Iterable[Book]): The books to count.
+        """
+        readings, authorReadings, authorBooks = {}, Counter(), Counter(self.authorBooks)
+        for book in books:
+            count = readings[book["uuid"]] = book.get("number_of_readings") or 0
+            author = book.get("author")
+            authorReadings[author] += count
+            authorBooks[author] += 1
+            self.issued += not book.get("available", True)
+        self.books.update(readings)
+        self.authors.update({author: self.authors.counts.get(author, 0) + count
+                             for author, count in authorReadings.items()})
+        self.authorBooks = dict(authorBooks)
+
+    def _count(self, book: Book, sign: int) -> None:
+        """
+        Adds a book to the statistics, or removes it with a negative sign.
+
+        Args:
+            book (Book): The book, or a mapping of the fields the statistics depend on.
+            sign (int): 1 to add the book, -1 to remove it.
+        """
+        readings = book.get("number_of_readings") or 0
+        author = book.get("author")
+        self.issued += sign * (not book.get("available", True))
+        if sign > 0:
+            self.books.set(book["uuid"], readings)
+        else:
+            self.books.discard(book["uuid"])
+        if (count := self.authorBooks.get(author, 0) + sign) > 0:
+            self.authorBooks[author] = count
+            self.authors.add(author, sign * readings)
+        else:
+            self.authorBooks.pop(author, None)
+            self.authors.discard(author)
+
+    def observe(self, event: str, book: Book, previous: dict | None = None, **details) -> None:
+        """
+        Applies a mutation event of the library to the statistics.
+
+        Args:
+            event (str): The kind of the mutation.
+            book (Book): The affected book.
+            previous (dict | None): The old values of the changed fields for "update" events.
+            **details: Other event specific details.
+        """
+        if event == "add":
+            self._count(book, 1)
+        elif event == "remove":
+            self._count(book, -1)
+        elif not self.fields.isdisjoint(previous):
+            self._count({**{field: book.get(field) for field in self.fields}, "uuid": book["uuid"], **previous}, -1)
+            self._count(book, 1)
+
+    def most_read_books(self, limit: int) -> list[tuple[str, int]]:
+        """
+        Lists the most read books.
+
+        Args:
+            limit (int): The maximum number of books.
+
+        Returns:
+            list[tuple[str, int]]: The UUIDs of the books with their number of readings, the most read first.
+        """
+        return self.books.most_common(limit)
+
+    def most_read_authors(self, limit: int) -> list[AuthorStats]:
+        """
+        Lists the authors whose books were read the most.
+
+        Args:
+            limit (int): The maximum number of authors.
+
+        Returns:
+            list[AuthorStats]: The figures of the authors, the most read first.
+        """
+        return [AuthorStats(author, readings, self.authorBooks[author])
+                for author, readings in self.authors.most_common(limit)]
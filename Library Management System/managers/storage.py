@@ -0,0 +1,102 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable
+
+from utils import Book, date2timestamp, timestamp2date
+
+_AVAILABLE = 1
+_NO_ISSUE_DATE = 2
+_NO_EXPIRE_DATE = 4
+
+
+class CompactBook(Mapping):
+    """
+    A memory-compact book record that behaves like the Book dictionary.
+
+    The record keeps its fields in slots instead of a per-book dict, interns the author, packs the
+    availability into a flags integer and keeps the issue and expire dates as timestamps, formatting them
+    only when they are read. Empty dates are kept apart from missing (null) ones, so records round-trip
+    through the loaders unchanged.
+
+    Attributes:
+        uuid (str): The UUID of the book.
+        name (str): The name of the book.
+        author (str): The interned author of the book.
+        number_of_readings (int): How many times the book was issued.
+        issued (int | None): The issue date as a timestamp made by date2timestamp.
+        expires (int | None): The expire date as a timestamp made by date2timestamp.
+        flags (int): The availability and the missing dates as bits.
+    """
+    __slots__ = ("uuid", "name", "author", "number_of_readings", "issued", "expires", "flags")
+
+    FIELDS = ("uuid", "name", "author", "available", "issue_date", "expire_date", "number_of_readings")
+
+    def __init__(self, uuid: str, name: str, author: str, available: bool, issue_date: str | None,
+                 expire_date: str | None, number_of_readings: int):
+        self.uuid = uuid
+        self.name = name
+        self.author = sys.intern(author) if isinstance(author, str) else author
+        self.number_of_readings = number_of_readings
+        self.flags = 0
+        self["available"] = available
+        self["issue_date"] = issue_date
+        self["expire_date"] = expire_date
+
+    @classmethod
+    def from_book(cls, book: Book) -> "CompactBook":
+        """
+        Creates a compact record from a Book dictionary.
+
+        Args:
+            book (Book): The book to convert.
+
+        Returns:
+            CompactBook: The compact record.
+        """
+        return cls(book["uuid"], book["name"], book["author"], book["available"], book.get("issue_date"),
+                   book.get("expire_date"), book["number_of_readings"])
+
+    def __getitem__(self, key: str) -> Any:
+        match key:
+            case "available":
+                return bool(self.flags & _AVAILABLE)
+            case "issue_date":
+                return None if self.flags & _NO_ISSUE_DATE else timestamp2date(self.issued)
+            case "expire_date":
+                return None if self.flags & _NO_EXPIRE_DATE else timestamp2date(self.expires)
+            case "uuid" | "name" | "author" | "number_of_readings":
+                return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        match key:
+            case "available":
+                self.flags = self.flags | _AVAILABLE if value else self.flags & ~_AVAILABLE
+            case "issue_date":
+                self.issued = date2timestamp(value)
+                self.flags = self.flags | _NO_ISSUE_DATE if value is None else self.flags & ~_NO_ISSUE_DATE
+            case "expire_date":
+                self.expires = date2timestamp(value)
+                self.flags = self.flags | _NO_EXPIRE_DATE if value is None else self.flags & ~_NO_EXPIRE_DATE
+            case "author":
+                self.author = sys.intern(value)
+            case "uuid" | "name" | "number_of_readings":
+                setattr(self, key, value)
+            case _:
+                raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"CompactBook({dict(self)!r})"
+
+
+# The record types a library can keep its books in, by name.
+STORAGE_BACKENDS: dict[str, Callable[[Book], Book] | None] = {
+    "dict": None,
+    "compact": CompactBook.from_book,
+}
@@ -0,0 +1,140 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import unittest
+
+from managers.library import Library
+
+test_samples = [
+    {
+        "uuid": f"00000000-0000-4000-8000-{number:012d}",
+        "name": f"Book {number}",
+        "author": f"Author {number % 5}",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 0
+    }
+    for number in range(200)
+]
+
+
+def run_threads(count: int, target) -> None:
+    errors = []
+
+    def run(number):
+        try:
+            target(number)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestConcurrentLibrary(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_concurrency_books.json"
+        with open(self.test_file_path, 'w') as f:
+            json.dump(test_samples, f)
+        self.library = Library(bookListFile=self.test_file_path, journal=True, concurrent=True)
+        self.switchInterval = sys.getswitchinterval()
+        # Switching threads as often as possible makes races show up in a few iterations.
+        sys.setswitchinterval(1e-6)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        sys.setswitchinterval(self.switchInterval)
+        for path in (self.test_file_path, self.test_file_path + ".journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_a_book_is_issued_once(self):
+        uuid, rounds, threads = test_samples[0]["uuid"], 100, 8
+        barrier = threading.Barrier(threads)
+
+        def issue(number):
+            for _ in range(rounds):
+                barrier.wait()
+                self.library.issue_book(uuid)
+                if barrier.wait() == 0:
+                    self.library.return_book(uuid)
+
+        run_threads(threads, issue)
+        self.assertEqual(self.library.get_book(uuid)["number_of_readings"], rounds)
+
+    def test_stale_positions_are_not_found(self):
+        for library in (self.library, Library(bookListFile=self.test_file_path)):
+            with self.subTest(concurrent=library._bookLocks is not None):
+                popped = library.bList.pop()
+                self.assertIsNone(library.get_book(popped["uuid"]))
+                library.bList[0] = popped
+                self.assertIsNone(library.get_book(test_samples[0]["uuid"]))
+
+    def test_mixed_operations_keep_the_library_consistent(self):
+        threads = 6
+        added: list[str] = []
+
+        def work(number):
+            if number == 0:
+                for i in range(100):
+                    self.library.add_book(f"New {i}", "Author 9")
+                    added.append(self.library.search_by("name", f"New {i}")[0])
+                    if i % 2:
+                        self.library.remove_book(added.pop(0))
+                return
+            mine = [book["uuid"] for book in test_samples[number::threads]]
+            for _ in range(20):
+                for uuid in mine:
+                    self.library.issue_book(uuid)
+                for uuid in mine[::2]:
+                    self.library.return_book(uuid)
+                self.library.search_by("author", f"Author {number}")
+                self.library.outdated_books()
+            for uuid in mine[:3]:
+                self.library.remove_book(uuid)
+
+        run_threads(threads, work)
+
+        books = self.library.bList
+        self.assertEqual(len(books), len(test_samples) - 3 * (threads - 1) + 50)
+        self.assertEqual({book["uuid"]: position for position, book in enumerate(books)}, self.library._positions)
+        issued = self.library.search_by("available", "false")
+        self.assertCountEqual(issued, [book["uuid"] for book in books if not book["available"]])
+        for book in books:
+            if book["name"].startswith("Book ") and int(book["name"][5:]) % threads:
+                self.assertEqual(book["number_of_readings"], 1 if int(book["name"][5:]) // threads % 2 else 20)
+
+        self.library.save("json")
+        reloaded = Library(bookListFile=self.test_file_path, journal=True)
+        self.assertCountEqual(reloaded.bList, books)
+
+    def test_lazy_books_are_read_into_a_shared_cache(self):
+        library = Library(bookListFile=self.test_file_path, lazy=True, cacheSize=8, concurrent=True)
+        threads = 6
+
+        def read(number):
+            for _ in range(5):
+                for uuid in [book["uuid"] for book in test_samples[number::threads]]:
+                    self.assertEqual(library.get_book(uuid)["uuid"], uuid)
+                    library.issue(uuid)
+                    library.return_(uuid)
+
+        run_threads(threads, read)
+        self.assertLessEqual(len(library.bList._cache), 8)
+        self.assertEqual(sum(book["number_of_readings"] for book in library.bList), 5 * len(test_samples))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
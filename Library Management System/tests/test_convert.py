@@ -0,0 +1,95 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from managers.convert import convert, main, Progress
+from managers.journal import Journal
+from managers.loaders import dump_data, get_loader, supportedExtensions
+
+test_samples = [
+    {
+        "uuid": f"00000000-0000-4000-8000-{number:012d}",
+        "name": f"Book {number}",
+        "author": f"Author {number % 7}",
+        "available": number % 3 != 0,
+        "issue_date": "" if number % 3 else "2024/06/26 16:55:12",
+        "expire_date": "" if number % 3 else "2024/07/09 16:55:12",
+        "number_of_readings": number
+    }
+    for number in range(2_500)
+]
+
+
+def load(filePath):
+    return sorted(get_loader(filePath)(filePath).iter_load(), key=lambda book: book["uuid"])
+
+
+class TestConvert(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "books.csv")
+        dump_data(test_samples, self.source)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_every_format(self):
+        for extension in supportedExtensions:
+            with self.subTest(extension=extension):
+                target = os.path.join(self.directory.name, "converted" + extension)
+                self.assertEqual(convert(self.source, target).books, len(test_samples))
+                self.assertEqual(load(target), test_samples)
+
+    def test_pipelines(self):
+        for pipeline in ("thread", "process"):
+            with self.subTest(pipeline=pipeline):
+                target = os.path.join(self.directory.name, f"{pipeline}.json")
+                convert(self.source, target, pipeline=pipeline, chunkSize=100, queueSize=2)
+                self.assertEqual(load(target), test_samples)
+
+    def test_journal_is_replayed(self):
+        journal = Journal(self.source)
+        journal.observe("update", {**test_samples[1], "available": False}, previous={"available": True})
+        journal.observe("remove", test_samples[2], position=2, moved=None)
+        journal.observe("add", {**test_samples[0], "uuid": "new"}, position=2_499)
+        journal.flush()
+        expected = [{**test_samples[1], "available": False}] + test_samples[3:] + [test_samples[0]]
+        expected = sorted(expected + [{**test_samples[0], "uuid": "new"}], key=lambda book: book["uuid"])
+        for pipeline in ("inline", "thread", "process"):
+            with self.subTest(pipeline=pipeline):
+                target = os.path.join(self.directory.name, f"{pipeline}.json")
+                self.assertEqual(convert(self.source, target, pipeline=pipeline).books, len(test_samples))
+                self.assertEqual(load(target), expected)
+
+    def test_progress(self):
+        reports: list[Progress] = []
+        convert(self.source, os.path.join(self.directory.name, "books.kbin"), reports.append, every=1_000)
+        self.assertEqual([report.books for report in reports], [1_000, 2_000, 2_500])
+
+    def test_failed_conversion_keeps_target(self):
+        target = os.path.join(self.directory.name, "books.json")
+        dump_data(test_samples[:1], target)
+
+        def fail(progress):
+            raise RuntimeError("stop")
+
+        for pipeline in ("inline", "thread"):
+            with self.subTest(pipeline=pipeline), self.assertRaises(RuntimeError):
+                convert(self.source, target, fail, pipeline=pipeline, every=100, chunkSize=10, queueSize=1)
+        self.assertEqual(load(target), test_samples[:1])
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["books.csv", "books.json"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            convert(self.source, os.path.join(self.directory.name, "books.txt"))
+        with self.assertRaises(FileExistsError):
+            convert(os.path.join(self.directory.name, "missing.csv"), os.path.join(self.directory.name, "books.json"))
+        with self.assertRaises(ValueError):
+            convert(self.source, self.source)
+        with self.assertRaises(ValueError):
+            convert(self.source, os.path.join(self.directory.name, "books.json"), pipeline="fiber")
+
+    def test_command(self):
+        target = os.path.join(self.directory.name, "books.yaml")
+        self.assertEqual(main([self.source, target, "--quiet", "--pipeline", "thread"]), 0)
+        self.assertEqual(load(target), test_samples)
@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from managers.due_dates import DueDateTracker
+from utils import date2timestamp, timestamp2date
+
+
+class TestDateConversion(TestCase):
+    def test_round_trip(self):
+        for date in ("2024/07/09 16:55:12", "1337/12/31 00:00:00", "2097/12/31 23:59:59"):
+            with self.subTest(msg=date):
+                self.assertEqual(timestamp2date(date2timestamp(date)), date)
+
+    def test_empty_and_invalid_dates(self):
+        self.assertIsNone(date2timestamp(""))
+        self.assertIsNone(date2timestamp(None))
+        self.assertEqual(timestamp2date(None), "")
+        self.assertRaises(ValueError, date2timestamp, "09.07.2024")
+
+
+class TestDueDateTracker(TestCase):
+    def setUp(self):
+        self.tracker = DueDateTracker()
+        self.tracker.build([
+            {"uuid": f"uuid{day}", "available": False, "expire_date": f"2024/07/{day:02d} 12:00:00"}
+            for day in (9, 3, 27, 14, 1, 20)
+        ] + [{"uuid": "uuid0", "available": True, "expire_date": ""}])
+
+    def test_overdue_in_expiry_order(self):
+        self.assertEqual(self.tracker.overdue(date2timestamp("2024/07/15 00:00:00")),
+                         ["uuid1", "uuid3", "uuid9", "uuid14"])
+        self.assertEqual(self.tracker.overdue(date2timestamp("2024/06/01 00:00:00")), [])
+
+    def test_returned_and_reissued_books(self):
+        self.tracker.observe("update", {"uuid": "uuid3", "available": True, "expire_date": ""},
+                             previous={"available": False, "expire_date": "2024/07/03 12:00:00"})
+        self.tracker.observe("update", {"uuid": "uuid27", "available": False, "expire_date": "2024/07/02 12:00:00"},
+                             previous={"available": False, "expire_date": "2024/07/27 12:00:00"})
+        self.tracker.observe("remove", {"uuid": "uuid1"}, position=0, moved=None)
+        self.assertEqual(self.tracker.overdue(date2timestamp("2024/07/15 00:00:00")), ["uuid27", "uuid9", "uuid14"])
+        self.assertEqual(len(self.tracker), 4)
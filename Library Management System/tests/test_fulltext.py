@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from managers.fulltext import TrigramIndex, trigrams
+
+test_samples = [
+    {"uuid": "uuid1", "name": "The Hitchhiker's Guide To The Galaxy", "author": "Douglas Adams"},
+    {"uuid": "uuid2", "name": "Watership Down", "author": "Richard Adams"},
+    {"uuid": "uuid3", "name": "The Five People You Meet in Heaven", "author": "Mitch Albom"},
+    {"uuid": "uuid4", "name": "Speak", "author": "Laurie Halse Anderson"},
+]
+
+
+class TestTrigrams(TestCase):
+    def test_words_are_padded_and_lower_cased(self):
+        self.assertEqual(trigrams("Ab, c"), {"  a", " ab", "ab ", "  c", " c "})
+
+
+class TestTrigramIndex(TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.build(test_samples)
+
+    def test_misspelled_title(self):
+        self.assertEqual(self.index.search("hitchiker guide", limit=1)[0][0], "uuid1")
+
+    def test_partial_author(self):
+        self.assertEqual({uuid for uuid, _ in self.index.search("adams")}, {"uuid1", "uuid2"})
+
+    def test_results_are_ranked(self):
+        results = self.index.search("watership dwn")
+        self.assertEqual(results[0][0], "uuid2")
+        self.assertEqual(results, sorted(results, key=lambda result: result[1], reverse=True))
+
+    def test_events_keep_index_current(self):
+        self.index.observe("remove", test_samples[1], position=1, moved=None)
+        self.index.observe("add", {"uuid": "uuid5", "name": "Shardik", "author": "Richard Adams"}, position=3)
+        self.assertEqual(self.index.search("shardik", limit=1), [("uuid5", 1.0)])
+        self.assertNotIn("uuid2", [uuid for uuid, _ in self.index.search("watership")])
+        self.index.observe("update", {"uuid": "uuid5", "name": "Tales from Watership Down", "author": "Richard Adams"},
+                           previous={"name": "Shardik"})
+        self.assertEqual(self.index.search("shardik"), [])
+        self.assertEqual(self.index.search("watership", limit=1), [("uuid5", 1.0)])
+
+    def test_shared_terms_are_stored_once(self):
+        self.index.add("uuid5", "DOUGLAS ADAMS")
+        self.assertEqual(self.index._owners[self.index._termIDs["douglas adams"]], {"uuid1", "uuid5"})
+        self.assertEqual({uuid for uuid, _ in self.index.search("douglas")}, {"uuid1", "uuid5"})
+        self.index.discard("uuid1", "Douglas Adams")
+        self.index.discard("uuid5", "Douglas Adams")
+        self.assertNotIn("douglas adams", self.index._termIDs)
+        self.assertEqual(self.index.search("douglas"), [])
+
+    def test_rebuild_drops_tombstones(self):
+        for sample in test_samples[:2]:
+            self.index.observe("remove", sample, position=0, moved=None)
+        self.index.rebuild()
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(len(self.index._terms), 4)
+        self.assertEqual(self.index.search("speak")[0][0], "uuid4")
+
+    def test_search_collects_a_bounded_number_of_candidates(self):
+        for number in range(50):
+            self.index.add(f"extra{number}", f"Watership Sequel {number}")
+        self.index.scanBudget = 8
+        self.index.rescored = 4
+        self.assertEqual(self.index.search("watership dwn", limit=1)[0][0], "uuid2")
+        self.assertEqual(self.index.search("sequel 7", limit=1), [("extra7", 1.0)])
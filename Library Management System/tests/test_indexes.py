@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from managers.indexes import HashIndex, UniqueIndex, BooleanIndex, SortedIndex
+
+
+class TestHashIndex(TestCase):
+    def setUp(self):
+        self.index = HashIndex("author")
+        self.index.build([
+            {"uuid": "uuid1", "author": "Douglas Adams"},
+            {"uuid": "uuid2", "author": "douglas adams"},
+            {"uuid": "uuid3", "author": "Mitch Albom"},
+        ])
+
+    def test_lookup_is_case_insensitive(self):
+        self.assertEqual(self.index.lookup(self.index.parse("DOUGLAS ADAMS")), {"uuid1", "uuid2"})
+
+    def test_update_event_moves_book(self):
+        self.index.observe("update", {"uuid": "uuid3", "author": "Douglas Adams"}, previous={"author": "Mitch Albom"})
+        self.assertEqual(self.index.lookup("douglas adams"), {"uuid1", "uuid2", "uuid3"})
+        self.assertNotIn("mitch albom", self.index.buckets)
+
+    def test_update_event_of_other_attribute_is_ignored(self):
+        self.index.observe("update", {"uuid": "uuid3", "author": "Mitch Albom"}, previous={"available": True})
+        self.assertEqual(self.index.lookup("mitch albom"), {"uuid3"})
+
+    def test_remove_event(self):
+        self.index.observe("remove", {"uuid": "uuid1", "author": "Douglas Adams"}, position=0, moved=None)
+        self.assertEqual(self.index.lookup("douglas adams"), {"uuid2"})
+
+
+class TestUniqueIndex(TestCase):
+    def test_lookup(self):
+        index = UniqueIndex("uuid")
+        index.build([{"uuid": "ABC"}, {"uuid": "def"}])
+        index.observe("remove", {"uuid": "def"}, position=1, moved=None)
+        self.assertEqual(index.lookup(index.parse("abc")), {"ABC"})
+        self.assertEqual(index.lookup(index.parse("def")), set())
+
+
+class TestBooleanIndex(TestCase):
+    def test_lookup(self):
+        index = BooleanIndex("available")
+        index.build([{"uuid": "uuid1", "available": True}, {"uuid": "uuid2", "available": False}])
+        self.assertEqual(index.lookup(index.parse("True")), {"uuid1"})
+        self.assertEqual(index.lookup(index.parse("false")), {"uuid2"})
+
+
+class TestSortedIndex(TestCase):
+    def test_keys_stay_sorted(self):
+        index = SortedIndex("number_of_readings")
+        index.build([{"uuid": "uuid1", "number_of_readings": 7}, {"uuid": "uuid2", "number_of_readings": 3}])
+        index.observe("update", {"uuid": "uuid2", "number_of_readings": 4}, previous={"number_of_readings": 3})
+        self.assertEqual(index.keys, [4, 7])
+        self.assertEqual(index.lookup(index.parse("4")), {"uuid2"})
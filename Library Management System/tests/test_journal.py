@@ -0,0 +1,174 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from managers.journal import Journal
+from managers.library import Library
+from managers.loaders import SqliteLoader, KbinLoader
+
+test_samples = [
+    {
+        "uuid": "03d462ed-dbac-43b4-8a66-c3cfaf47245a",
+        "name": "The Hitchhiker's Guide To The Galaxy",
+        "author": "Douglas Adams",
+        "available": False,
+        "issue_date": "2024/06/26 16:55:12",
+        "expire_date": "2024/07/09 16:55:12",
+        "number_of_readings": 17
+    },
+    {
+        "uuid": "f07abcb2-1f4b-457b-a856-cdff22f7acfc",
+        "name": "Watership Down",
+        "author": "Richard Adams",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 51
+    },
+    {
+        "uuid": "d09d6221-dd8f-4667-a4e9-2f063ee37f5d",
+        "name": "I Know Why the Caged Bird Sings",
+        "author": "Maya Angelou",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 74
+    }
+]
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_journal_books.json"
+        self.journal = Journal(self.test_file_path)
+
+    def test_replay_without_journal(self):
+        self.assertEqual(self.journal.replay(iter(test_samples)), test_samples)
+        self.assertEqual(self.journal.records, 0)
+
+    def test_flush_and_replay(self):
+        books = [dict(book) for book in test_samples]
+        added = dict(test_samples[0], uuid="uuid4", name="Speak")
+        self.journal.observe("add", added, position=3)
+        self.journal.observe("remove", books[1], position=1, moved=added)
+        self.journal.observe("update", dict(books[2], available=False), previous={"available": True})
+        self.assertEqual(self.journal.flush(), 3)
+        self.assertEqual(self.journal.flush(), 0)
+        self.assertEqual(self.journal.pending, [])
+
+        replayed = Journal(self.test_file_path).replay([dict(book) for book in test_samples])
+        self.assertEqual([book["uuid"] for book in replayed], [test_samples[0]["uuid"], test_samples[2]["uuid"], "uuid4"])
+        self.assertFalse(replayed[1]["available"])
+
+    def test_torn_last_record_is_ignored(self):
+        self.journal.observe("remove", test_samples[0], position=0, moved=None)
+        self.journal.flush()
+        with open(self.journal.filePath, 'a') as file:
+            file.write('{"op":"remove","uu')
+        journal = Journal(self.test_file_path)
+        replayed = journal.replay([dict(book) for book in test_samples])
+        self.assertEqual(len(replayed), 2)
+        self.assertEqual(journal.records, 1)
+
+    def tearDown(self):
+        self.journal.truncate()
+
+
+class TestJournaledLibrary(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_journal_library.json"
+        with open(self.test_file_path, 'w') as f:
+            json.dump(test_samples, f)
+
+    def _load(self):
+        with open(self.test_file_path) as f:
+            return json.load(f)
+
+    @patch("managers.library.Library.compact")
+    def test_save_appends_to_the_journal(self, compact):
+        library = Library(bookListFile=self.test_file_path, journal=True)
+        library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        library.remove_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+        self.assertTrue(library.save("json"))
+        self.assertEqual(self._load(), test_samples)
+        with open(self.test_file_path + Journal.suffix) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        reopened = Library(bookListFile=self.test_file_path, journal=True)
+        self.assertEqual(sorted(reopened.bList, key=lambda b: b["uuid"]),
+                         sorted(library.bList, key=lambda b: b["uuid"]))
+        self.assertEqual(reopened.search_by("available", "false"), ["f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+
+    def test_compact(self):
+        library = Library(bookListFile=self.test_file_path, journal=True)
+        library.add_book("Speak", "Laurie Halse Anderson")
+        library.compact()
+        self.assertFalse(os.path.exists(self.test_file_path + Journal.suffix))
+        self.assertEqual(self._load(), library.bList)
+
+    def test_large_journal_is_compacted_on_save(self):
+        library = Library(bookListFile=self.test_file_path, journal=True)
+        for _ in range(5):
+            library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+            library.return_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        self.assertTrue(library.save("json"))
+        self.assertFalse(os.path.exists(self.test_file_path + Journal.suffix))
+        self.assertEqual(self._load()[1]["number_of_readings"], 56)
+
+    def test_leftover_journal_is_replayed_without_journaling(self):
+        uuid = "f07abcb2-1f4b-457b-a856-cdff22f7acfc"
+        library = Library(bookListFile=self.test_file_path, journal=True)
+        library.issue_book(uuid)
+        library._journal.flush()
+
+        plain = Library(bookListFile=self.test_file_path)
+        self.assertFalse(plain._get_book(uuid)["available"])
+        plain.return_book(uuid)
+        self.assertTrue(plain.save("json"))
+        self.assertFalse(os.path.exists(self.test_file_path + Journal.suffix))
+
+        reopened = Library(bookListFile=self.test_file_path, journal=True)
+        self.assertTrue(reopened._get_book(uuid)["available"])
+        self.assertEqual(reopened._get_book(uuid)["number_of_readings"], 52)
+
+    def test_leftover_journal_is_folded_into_lazy_files(self):
+        uuid = "f07abcb2-1f4b-457b-a856-cdff22f7acfc"
+        test_file_path = "test_journal_library.kbin"
+        KbinLoader(test_file_path).save(test_samples)
+        journal = Journal(test_file_path)
+        journal.observe("update", {**test_samples[1], "available": False}, previous={"available": True})
+        journal.flush()
+        try:
+            with patch.object(Journal, "replay", side_effect=AssertionError):
+                library = Library(bookListFile=test_file_path, lazy=True)
+            self.assertFalse(os.path.exists(journal.filePath))
+            self.assertFalse(library._get_book(uuid)["available"])
+            self.assertFalse(KbinLoader(test_file_path).load()[1]["available"])
+        finally:
+            journal.truncate()
+            os.remove(test_file_path)
+
+    def tearDown(self):
+        for path in (self.test_file_path, self.test_file_path + Journal.suffix):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class TestTransactionalLibrary(unittest.TestCase):
+    def test_save_applies_the_changes(self):
+        for loaderClass in (SqliteLoader, KbinLoader):
+            with self.subTest(msg=loaderClass.extension):
+                test_file_path = "test_journal_library" + loaderClass.extension
+                loaderClass(test_file_path).save(test_samples)
+                try:
+                    library = Library(bookListFile=test_file_path)
+                    library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+                    library.add_book("Speak", "Laurie Halse Anderson")
+                    library.remove_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+                    self.assertTrue(library.save(loaderClass.extension[1:]))
+                    self.assertFalse(os.path.exists(test_file_path + Journal.suffix))
+                    self.assertEqual(sorted(loaderClass(test_file_path).load(), key=lambda b: b["uuid"]),
+                                     sorted(library.bList, key=lambda b: b["uuid"]))
+                finally:
+                    os.remove(test_file_path)
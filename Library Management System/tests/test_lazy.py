@@ -0,0 +1,182 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from managers.lazy import LazyBookList
+from managers.library import Library
+from managers.loaders import CsvLoader, JsonLoader, KbinLoader
+from managers.storage import CompactBook
+
+test_samples = [
+    {
+        "uuid": "03d462ed-dbac-43b4-8a66-c3cfaf47245a",
+        "name": "The Hitchhiker's Guide To The Galaxy",
+        "author": "Douglas Adams",
+        "available": False,
+        "issue_date": "2024/06/26 16:55:12",
+        "expire_date": "2024/07/09 16:55:12",
+        "number_of_readings": 17
+    },
+    {
+        "uuid": "f07abcb2-1f4b-457b-a856-cdff22f7acfc",
+        "name": "Watership Down",
+        "author": "Richard Adams",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 51
+    },
+    {
+        "uuid": "a74e8e90-2b3b-4c53-a166-8dfb3b2783b1",
+        "name": "The Five People You Meet in Heaven",
+        "author": "Mitch Albom",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 75
+    },
+    {
+        "uuid": "d09d6221-dd8f-4667-a4e9-2f063ee37f5d",
+        "name": "I Know Why the Caged Bird Sings",
+        "author": "Maya Angelou",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 74
+    }
+]
+
+
+class TestLazyBookList(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_lazy_books.kbin"
+        KbinLoader(self.test_file_path).save(test_samples)
+
+    def test_reads_books_on_demand(self):
+        books = LazyBookList(KbinLoader(self.test_file_path), capacity=2)
+        self.assertEqual(len(books), 4)
+        self.assertEqual(books[2], test_samples[2])
+        self.assertEqual(books[-1], test_samples[3])
+        self.assertIs(books[2], books[2])
+        books[0]
+        self.assertLessEqual(len(books._cache), 2)
+        self.assertEqual(list(books), test_samples)
+        self.assertEqual(books[1:3], test_samples[1:3])
+
+    def test_changed_books_are_pinned(self):
+        books = LazyBookList(KbinLoader(self.test_file_path), capacity=1)
+        book = books[1]
+        book["available"] = False
+        books.observe("update", book, previous={"available": True})
+        for _ in books:
+            pass
+        self.assertIs(books[1], book)
+
+    def test_converts_records(self):
+        books = LazyBookList(KbinLoader(self.test_file_path), record=CompactBook.from_book)
+        self.assertIsInstance(books[0], CompactBook)
+        self.assertEqual(list(books), test_samples)
+
+    def tearDown(self):
+        os.remove(self.test_file_path)
+
+
+class TestLazyLibrary(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_lazy_library.kbin"
+        KbinLoader(self.test_file_path).save(test_samples)
+
+    def test_startup_does_not_load_the_catalog(self):
+        with patch.object(KbinLoader, "iter_load", side_effect=AssertionError), \
+                patch.object(KbinLoader, "read", side_effect=AssertionError):
+            library = Library(bookListFile=self.test_file_path, lazy=True)
+            self.assertEqual(list(library.uuids()), [book["uuid"] for book in test_samples])
+        self.assertEqual(len(library.bList), 4)
+        self.assertIsNone(library._indexes)
+
+    def test_operations_are_saved(self):
+        library = Library(bookListFile=self.test_file_path, lazy=True, cacheSize=1)
+        library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        library.return_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+        library.remove_book("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1")
+        library.add_book("Speak", "Laurie Halse Anderson")
+        self.assertEqual(library.search_by("available", "false"), ["f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+        self.assertFalse(library._get_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")["available"])
+        expected = [dict(book) for book in library.bList]
+        self.assertTrue(library.save("kbin"))
+        self.assertEqual([dict(book) for book in library.bList], expected)
+        library.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        self.assertTrue(library.save("kbin"))
+
+        reopened = Library(bookListFile=self.test_file_path, lazy=True)
+        self.assertEqual(sorted(map(dict, reopened.bList), key=lambda b: b["uuid"]),
+                         sorted(map(dict, library.bList), key=lambda b: b["uuid"]))
+        self.assertEqual(sorted(reopened.query("available = false")),
+                         ["d09d6221-dd8f-4667-a4e9-2f063ee37f5d", "f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+
+    def test_formats_without_random_access_can_not_be_loaded_lazily(self):
+        with open("test_lazy_library.xml", 'w') as file:
+            file.write("<books></books>")
+        try:
+            self.assertRaises(ValueError, Library, bookListFile="test_lazy_library.xml", lazy=True)
+        finally:
+            os.remove("test_lazy_library.xml")
+
+    def tearDown(self):
+        os.remove(self.test_file_path)
+
+
+class TestLazyTextFormats(unittest.TestCase):
+    samples = test_samples + [
+        {
+            "uuid": "5c1bd4a6-0c55-4bd2-9d7f-8e1f63c2e0a4",
+            "name": "Cien años de soledad, \"el libro\"\nprimera edición",
+            "author": "Gabriel García Márquez",
+            "available": True,
+            "issue_date": "",
+            "expire_date": "",
+            "number_of_readings": 3
+        }
+    ]
+
+    def test_reads_single_books(self):
+        for loaderClass in (JsonLoader, CsvLoader):
+            with self.subTest(loader=loaderClass.__name__):
+                path = "test_lazy_text" + loaderClass.extension
+                loaderClass(path).save_iter(self.samples)
+                try:
+                    loader = loaderClass(path)
+                    self.assertEqual(loader.keys(), [book["uuid"] for book in self.samples])
+                    self.assertEqual(list(loader.read([4, 0, 2])), [self.samples[4], self.samples[0], self.samples[2]])
+                    self.assertEqual(list(loaderClass(path).read([4])), [self.samples[4]])
+                finally:
+                    os.remove(path)
+
+    def test_lazy_libraries_save_changes(self):
+        for extension in (".json", ".csv"):
+            for journal in (False, True):
+                with self.subTest(extension=extension, journal=journal):
+                    path = "test_lazy_text" + extension
+                    JsonLoader(path).save_iter(self.samples) if extension == ".json" else \
+                        CsvLoader(path).save_iter(self.samples)
+                    try:
+                        with patch.object(JsonLoader, "iter_load", side_effect=AssertionError), \
+                                patch.object(CsvLoader, "iter_load", side_effect=AssertionError):
+                            library = Library(bookListFile=path, lazy=True, cacheSize=1, journal=journal)
+                        library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+                        library.remove_book("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1")
+                        library.add_book("Speak", "Laurie Halse Anderson")
+                        expected = [dict(book) for book in library.bList]
+                        self.assertTrue(library.save(extension))
+                        self.assertEqual([dict(book) for book in library.bList], expected)
+                        library.compact()
+                        self.assertEqual([dict(book) for book in library.bList], expected)
+                        reopened = Library(bookListFile=path, lazy=True)
+                        self.assertEqual([dict(book) for book in reopened.bList], expected)
+                        self.assertEqual(reopened.search_by("available", "false"),
+                                         ["03d462ed-dbac-43b4-8a66-c3cfaf47245a",
+                                          "f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+                    finally:
+                        for leftover in (path, path + ".journal"):
+                            if os.path.exists(leftover):
+                                os.remove(leftover)
@@ -3,7 +3,8 @@ import unittest
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
-from managers.library import Library
+from managers.library import Library, OperationResult
+from managers.loaders import JsonLoader
 from utils import Printer
 
 test_samples = """[
@@ -68,6 +69,11 @@ class LibraryManagerTests(unittest.TestCase):
         self.assertEqual(len(library.bList), 5)
         self.assertIsInstance(library._printer, Printer)
 
+    def test_library_manager_loads_the_file_at_once(self):
+        with patch.object(JsonLoader, "iter_load", side_effect=AssertionError):
+            library = Library(bookListFile=self.test_file_path)
+        self.assertEqual(len(library.bList), 5)
+
     def test_library_manager_display_book_method(self):
         with patch.object(Library, "_print_book") as mock_print_book:
             library = Library(bookListFile=self.test_file_path)
@@ -121,11 +127,193 @@ class LibraryManagerTests(unittest.TestCase):
                 uuids = library.search_by(key, value)
                 self.assertTrue(uuids == correct_uuids)
 
+    def test_library_manager_search_by_matches_scan(self):
+        indexed = Library(bookListFile=self.test_file_path)
+        scanned = Library(bookListFile=self.test_file_path, indexes={})
+        for library in (indexed, scanned):
+            library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+            library.return_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+            library.remove_book("d5feecd6-b41a-4d6e-bd7a-ad8eeed5b5bf")
+        for key, value in (("author", "richard adams"), ("available", "false"), ("available", "true"),
+                           ("number_of_readings", "52"), ("uuid", "A74E8E90-2B3B-4C53-A166-8DFB3B2783B1")):
+            with self.subTest(msg=f"Searching by {key}={value}"):
+                self.assertEqual(indexed.search_by(key, value), scanned.search_by(key, value))
+
+    def test_library_manager_search_by_cache(self):
+        library = Library(bookListFile=self.test_file_path)
+        author = library.search_by("author", "Richard Adams")
+        available = library.search_by("available", "true")
+        self.assertEqual(library.search_by("author", "richard adams"), author)
+        self.assertEqual(library.search_by("available", "TRUE"), available)
+        self.assertEqual(library.search_cache_info()[:3], (2, 2, 2))
+
+        library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        self.assertEqual(library.search_by("author", "Richard Adams"), author)
+        self.assertNotIn("f07abcb2-1f4b-457b-a856-cdff22f7acfc", library.search_by("available", "true"))
+
+        library.add_book("Shardik", "Richard Adams")
+        added = library.bList[-1]["uuid"]
+        self.assertEqual(library.search_by("author", "Richard Adams"), ["f07abcb2-1f4b-457b-a856-cdff22f7acfc", added])
+        library.remove_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        self.assertEqual(library.search_by("author", "Richard Adams"), [added])
+        self.assertEqual(library.search_cache_info()[:2], (3, 5))
+
+    def test_library_manager_operations_without_printing(self):
+        library = Library(bookListFile=self.test_file_path)
+        with patch.object(Printer, "print", side_effect=AssertionError), \
+                patch.object(Printer, "error", side_effect=AssertionError):
+            self.assertEqual(library.issue("f07abcb2-1f4b-457b-a856-cdff22f7acfc"),
+                             OperationResult("f07abcb2-1f4b-457b-a856-cdff22f7acfc", True, "Book issued successfully!"))
+            self.assertFalse(library.issue("f07abcb2-1f4b-457b-a856-cdff22f7acfc").ok)
+            self.assertTrue(library.return_("f07abcb2-1f4b-457b-a856-cdff22f7acfc").ok)
+            added = library.add("Shardik", "Richard Adams")
+            self.assertEqual(library.find("author", "Richard Adams"), ["f07abcb2-1f4b-457b-a856-cdff22f7acfc", added.uuid])
+            self.assertEqual(library.remove("missing"), OperationResult("missing", False, "Invalid UUID!"))
+            self.assertTrue(library.remove(added.uuid).ok)
+            self.assertEqual(library.find("author", "Nobody"), [])
+
+    def test_library_manager_search_by_cache_returns_copies(self):
+        library = Library(bookListFile=self.test_file_path)
+        results = library.search_by("author", "Richard Adams")
+        results.append("not-a-uuid")
+        self.assertEqual(library.search_by("author", "Richard Adams"), ["f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+        self.assertEqual(library.search_cache_info()[:2], (1, 1))
+
+    def test_library_manager_search_by_cache_is_bounded(self):
+        library = Library(bookListFile=self.test_file_path, searchCacheSize=2)
+        for value in ("17", "51", "75", "17"):
+            library.search_by("number_of_readings", value)
+        self.assertEqual(library.search_cache_info(), (0, 4, 2, 2))
+        library = Library(bookListFile=self.test_file_path, searchCacheSize=0)
+        library.search_by("author", "Richard Adams")
+        library.search_by("author", "Richard Adams")
+        self.assertEqual(library.search_cache_info(), (0, 2, 0, 0))
+
+    def test_library_manager_fuzzy_search_method(self):
+        library = Library(bookListFile=self.test_file_path)
+        self.assertEqual(library.fuzzy_search("caged brd sings", limit=1)[0][0], "d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        library.add_book("Shardik", "Richard Adams")
+        library.remove_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        self.assertEqual(library.fuzzy_search("shardik", limit=1)[0][0], library.bList[-1]["uuid"])
+        self.assertEqual(library.fuzzy_search("caged brd sings"), [])
+
+    def test_library_manager_outdated_books_method(self):
+        library = Library(bookListFile=self.test_file_path)
+        self.assertEqual(library.outdated_books(), ["03d462ed-dbac-43b4-8a66-c3cfaf47245a"])
+        self.assertEqual(library.outdated_books(datetime(2024, 7, 1)), [])
+
+        library.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        library.return_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+        self.assertEqual(library.outdated_books(), [])
+        self.assertEqual(library.outdated_books(datetime.now() + timedelta(weeks=5)),
+                         ["d09d6221-dd8f-4667-a4e9-2f063ee37f5d"])
+        library.remove_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        self.assertEqual(library.outdated_books(datetime.now() + timedelta(weeks=5)), [])
+
     def test_library_manager_remove_book_method(self):
         library = Library(bookListFile=self.test_file_path)
         library.remove_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
         self.assertEqual(len(library.bList), 4)
         self.assertNotIn("d09d6221-dd8f-4667-a4e9-2f063ee37f5d", [book["uuid"] for book in library.bList])
 
+    def test_library_manager_remove_book_keeps_index_consistent(self):
+        library = Library(bookListFile=self.test_file_path)
+        library.remove_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+        library.add_book("New Book", "New Author")
+        library.remove_book("d5feecd6-b41a-4d6e-bd7a-ad8eeed5b5bf")
+        self.assertEqual(len(library.bList), 4)
+        for position, book in enumerate(library.bList):
+            self.assertIs(library._get_book(book["uuid"]), book)
+            self.assertEqual(library._positions[book["uuid"]], position)
+        self.assertIsNone(library._get_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a"))
+        self.assertEqual(len(library._books), len(library.bList))
+
+    def test_library_manager_notifies_observers(self):
+        library = Library(bookListFile=self.test_file_path)
+        events = []
+        library.subscribe(lambda event, book, **details: events.append((event, book["uuid"], details)))
+        library.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        library.remove_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+
+        self.assertEqual([(event, uuid) for event, uuid, _ in events],
+                         [("update", "d09d6221-dd8f-4667-a4e9-2f063ee37f5d"),
+                          ("remove", "03d462ed-dbac-43b4-8a66-c3cfaf47245a")])
+        self.assertEqual(events[0][2]["previous"]["available"], True)
+        self.assertEqual(events[1][2]["position"], 0)
+        self.assertEqual(events[1][2]["moved"]["uuid"], "d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+
+    def test_library_manager_save_exports_other_formats(self):
+        library = Library(bookListFile=self.test_file_path)
+        library.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        try:
+            self.assertTrue(library.save("json, XML,csv"))
+            for extension in (".xml", ".csv"):
+                exported = Library(bookListFile="test_books" + extension)
+                self.assertEqual(sorted(exported._positions), sorted(library._positions))
+                self.assertEqual(exported.search_by("available", "false"), library.search_by("available", "false"))
+            self.assertEqual(Library(bookListFile=self.test_file_path).bList, library.bList)
+        finally:
+            for extension in (".xml", ".csv"):
+                if os.path.exists("test_books" + extension):
+                    os.remove("test_books" + extension)
+
+    @patch('datetime.datetime')
+    def test_library_manager_issue_many_method(self, mock_datetime):
+        now = datetime(2024, 7, 3, 12, 0, 0)
+        mock_datetime.now.return_value = now
+        library = Library(bookListFile=self.test_file_path)
+        uuids = ["f07abcb2-1f4b-457b-a856-cdff22f7acfc", "03d462ed-dbac-43b4-8a66-c3cfaf47245a", "missing",
+                 "a74e8e90-2b3b-4c53-a166-8dfb3b2783b1"]
+        with patch.object(Printer, "print") as mock_print, patch.object(Printer, "error") as mock_error:
+            results = library.issue_many(uuids)
+        mock_print.assert_called_once_with("2 of 4 books issued successfully!")
+        mock_error.assert_called_once_with("2 books could not be issued.")
+
+        self.assertEqual([result.uuid for result in results], uuids)
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertEqual(results[2].message, "Invalid UUID!")
+        self.assertTrue(results[1].message.startswith("This book is already issued."))
+        for uuid in (uuids[0], uuids[3]):
+            book = library._get_book(uuid)
+            self.assertFalse(book["available"])
+            self.assertEqual(book["issue_date"], now.strftime("%Y/%m/%d %H:%M:%S"))
+            self.assertEqual(book["expire_date"], (now + timedelta(weeks=4)).strftime("%Y/%m/%d %H:%M:%S"))
+        self.assertEqual(library._get_book(uuids[0])["number_of_readings"], 52)
+
+    def test_library_manager_return_many_method(self):
+        library = Library(bookListFile=self.test_file_path)
+        results = library.return_many(["03d462ed-dbac-43b4-8a66-c3cfaf47245a", "f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+        self.assertEqual([result.ok for result in results], [True, False])
+        self.assertEqual(results[1].message, "This book is not issued.")
+        self.assertEqual(library.search_by("available", "false"), None)
+
+    def test_library_manager_add_many_and_remove_many_methods(self):
+        library = Library(bookListFile=self.test_file_path)
+        added = library.add_many([("New Book", "New Author"), ("Other Book", "New Author")])
+        self.assertTrue(all(result.ok for result in added))
+        self.assertEqual([library._get_book(result.uuid)["name"] for result in added], ["New Book", "Other Book"])
+        self.assertEqual(library.search_by("author", "new author"), [result.uuid for result in added])
+
+        removed = library.remove_many([added[0].uuid, "03d462ed-dbac-43b4-8a66-c3cfaf47245a", added[0].uuid])
+        self.assertEqual([result.ok for result in removed], [True, True, False])
+        self.assertEqual(len(library.bList), 5)
+        self.assertEqual(library.search_by("author", "new author"), [added[1].uuid])
+
+    def test_library_manager_statistics_methods(self):
+        library = Library(bookListFile=self.test_file_path)
+        self.assertEqual(library.issued_count(), 1)
+        self.assertEqual(library.most_read_books(2), [("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1", 75),
+                                                      ("d09d6221-dd8f-4667-a4e9-2f063ee37f5d", 74)])
+        with patch.object(Printer, "print"):
+            library.issue_many(["d09d6221-dd8f-4667-a4e9-2f063ee37f5d"] * 2)
+            library.remove_book("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1")
+            uuid = library.add_many([("New Book", "Maya Angelou")])[0].uuid
+        self.assertEqual(library.issued_count(), 2)
+        self.assertEqual(library.most_read_books(2), [("d09d6221-dd8f-4667-a4e9-2f063ee37f5d", 75),
+                                                      ("f07abcb2-1f4b-457b-a856-cdff22f7acfc", 51)])
+        self.assertEqual(library.most_read_books(10)[-1], (uuid, 0))
+        self.assertEqual([tuple(author) for author in library.most_read_authors(2)],
+                         [("Maya Angelou", 75, 2), ("Richard Adams", 51, 1)])
+
     def tearDown(self):
         os.remove(self.test_file_path)
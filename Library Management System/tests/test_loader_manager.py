@@ -1,6 +1,14 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 
-from managers.loaders import JsonLoader, XmlLoader, YamlLoader, TomlLoader, CsvLoader, supportedExtensions
+from managers.loaders import JsonLoader, XmlLoader, YamlLoader, TomlLoader, CsvLoader, SqliteLoader, DbLoader, \
+    KbinLoader, supportedExtensions, dump_data, export_data, get_loader, Codec, codecFactories, selectedCodecs, \
+    register_codec, available_codecs, get_codec, describe_codecs
 
 test_samples = [
     {
@@ -67,11 +75,52 @@ class LoaderTestSetup():
         self.assertEqual(sorted(test_samples, key=sort_funtion), sorted(deserialized, key=sort_funtion),
                          "The deserialized content is not the same as the original.")
 
+    def test_streaming_round_trip(self):
+        sort_funtion = lambda dict_: dict_['number_of_readings']
+        with tempfile.TemporaryDirectory() as directory:
+            loader = type(self.loader)(os.path.join(directory, "books" + self.loader.extension))
+            loader.save_iter(iter(test_samples))
+            self.assertEqual(sorted(test_samples, key=sort_funtion), sorted(loader.iter_load(), key=sort_funtion),
+                             "The streamed content is not the same as the original.")
+            self.assertEqual(sorted(test_samples, key=sort_funtion), sorted(loader.load(), key=sort_funtion),
+                             "The streamed file can not be loaded at once.")
+
+    def test_streaming_empty_catalog(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = type(self.loader)(os.path.join(directory, "books" + self.loader.extension))
+            loader.save_iter(iter([]))
+            self.assertEqual(list(loader.iter_load()), [])
+
 
 class TestJsonLoader(TestCase, LoaderTestSetup):
     def setUp(self):
         self.loader = JsonLoader()
 
+    def test_streamed_file_matches_serialize(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = JsonLoader(os.path.join(directory, "books.json"))
+            loader.save_iter(iter(test_samples))
+            with open(loader.filePath) as file:
+                self.assertEqual(file.read(), loader.serialize(test_samples))
+
+    def test_compact_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = JsonLoader(os.path.join(directory, "books.json"))
+            loader.indent = None
+            serialized = loader.serialize(test_samples)
+            self.assertNotIn("\n", serialized)
+            self.assertEqual(loader.deserialize(serialized), test_samples)
+            loader.save_iter(iter(test_samples))
+            with open(loader.filePath) as file:
+                self.assertEqual(file.read(), serialized)
+
+    def test_iter_load_across_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = JsonLoader(os.path.join(directory, "books.json"))
+            loader.save(test_samples)
+            loader.chunkSize = 7
+            self.assertEqual(list(loader.iter_load()), test_samples)
+
 
 class TestYamlLoader(TestCase, LoaderTestSetup):
     def setUp(self):
@@ -87,7 +136,199 @@ class TestXmlLoader(TestCase, LoaderTestSetup):
     def setUp(self):
         self.loader = XmlLoader()
 
+    def test_null_dates_round_trip(self):
+        books = [{**test_samples[1], "issue_date": None, "expire_date": None}, test_samples[0]]
+        self.assertEqual(self.loader.deserialize(self.loader.serialize(books)), books)
+
+    def test_numeric_names_stay_text(self):
+        books = [{**test_samples[1], "name": "1984"}]
+        self.assertEqual(self.loader.deserialize(self.loader.serialize(books)), books)
+
 
 class TestCsvLoader(TestCase, LoaderTestSetup):
     def setUp(self):
         self.loader = CsvLoader()
+
+    def test_numeric_names_stay_text(self):
+        books = [{**test_samples[1], "name": "1984", "author": "True"}]
+        self.assertEqual(self.loader.deserialize(self.loader.serialize(books)), books)
+
+
+class TestSqliteLoader(TestCase, LoaderTestSetup):
+    def setUp(self):
+        self.loader = SqliteLoader()
+
+    def test_apply_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = SqliteLoader(os.path.join(directory, "books.sqlite"))
+            loader.save(test_samples[:2])
+            loader.apply_changes([
+                {"op": "add", "book": test_samples[2]},
+                {"op": "remove", "uuid": test_samples[0]["uuid"]},
+                {"op": "update", "uuid": test_samples[1]["uuid"], "fields": {"available": False, "number_of_readings": 52}},
+            ])
+            self.assertEqual(loader.load(), [{**test_samples[1], "available": False, "number_of_readings": 52},
+                                             test_samples[2]])
+            self.assertRaises(ValueError, loader.apply_changes,
+                              [{"op": "add", "book": test_samples[3]},
+                               {"op": "remove", "uuid": test_samples[2]["uuid"]},
+                               {"op": "update", "uuid": test_samples[1]["uuid"], "fields": {"title": "Speak"}}])
+            self.assertEqual(len(loader.load()), 2, "A failed batch of changes was partially applied.")
+
+    def test_text_is_stored_without_an_ascii_only_collation(self):
+        books = [{**test_samples[0], "name": "Émile, ou De l'éducation"}]
+        script = self.loader.serialize(books)
+        self.assertNotIn("NOCASE", script)
+        self.assertEqual(self.loader.deserialize(script), books)
+
+    def test_schema_is_created_by_the_first_connection_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "books.sqlite")
+            loader = SqliteLoader(path)
+            loader.save(test_samples[:1])
+            with patch.object(SqliteLoader, "SCHEMA", "NOT SQL"):
+                loader.apply_changes([{"op": "add", "book": test_samples[1]}])
+                self.assertEqual(loader.load(), test_samples[:2])
+                self.assertRaises(sqlite3.OperationalError, SqliteLoader(path).load)
+
+    def test_migration(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = JsonLoader(os.path.join(directory, "books.json"))
+            source.save(test_samples)
+            dump_data(source.iter_load(), os.path.join(directory, "books.db"))
+            self.assertEqual(DbLoader(os.path.join(directory, "books.db")).load(), test_samples)
+
+
+class TestKbinLoader(TestCase, LoaderTestSetup):
+    def setUp(self):
+        self.loader = KbinLoader()
+
+    def test_null_dates_round_trip(self):
+        books = [{**test_samples[1], "issue_date": None, "expire_date": None}, test_samples[0]]
+        self.assertEqual(self.loader.deserialize(self.loader.serialize(books)), books)
+
+    def test_find(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = KbinLoader(os.path.join(directory, "books.kbin"))
+            loader.save(test_samples)
+            for sample in test_samples:
+                self.assertEqual(loader.find(sample["uuid"]), sample)
+            self.assertIsNone(loader.find("00000000-0000-0000-0000-000000000000"))
+
+    def test_loads_can_stop_early(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = KbinLoader(os.path.join(directory, "books.kbin"))
+            loader.save(test_samples)
+            books = loader.iter_load()
+            self.assertEqual(next(books), test_samples[0])
+            books.close()
+            self.assertEqual(loader.keys(), [sample["uuid"] for sample in test_samples])
+
+    def test_failed_save_leaves_the_file_alone(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = KbinLoader(os.path.join(directory, "books.kbin"))
+            loader.save(test_samples)
+            broken = [test_samples[0], {"uuid": test_samples[1]["uuid"]}]
+            self.assertRaises(KeyError, loader.save_iter, iter(broken))
+            self.assertEqual(os.listdir(directory), ["books.kbin"])
+            self.assertEqual(loader.load(), test_samples)
+
+    def test_updates_are_written_in_place(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = KbinLoader(os.path.join(directory, "books.kbin"))
+            loader.save(test_samples)
+            size = os.path.getsize(loader.filePath)
+            fields = {"available": False, "issue_date": "2024/07/01 10:00:00", "expire_date": "2024/07/29 10:00:00",
+                      "number_of_readings": 52}
+            with patch.object(KbinLoader, "save_iter") as save_iter:
+                loader.apply_changes([{"op": "update", "uuid": test_samples[1]["uuid"], "fields": fields}])
+                save_iter.assert_not_called()
+            self.assertEqual(os.path.getsize(loader.filePath), size)
+            self.assertEqual(loader.find(test_samples[1]["uuid"]), {**test_samples[1], **fields})
+            self.assertEqual(loader.find(test_samples[0]["uuid"]), test_samples[0])
+
+    def test_layout_changes_rewrite_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            loader = KbinLoader(os.path.join(directory, "books.kbin"))
+            loader.save(test_samples[:2])
+            loader.apply_changes([
+                {"op": "add", "book": test_samples[2]},
+                {"op": "remove", "uuid": test_samples[0]["uuid"]},
+                {"op": "update", "uuid": test_samples[1]["uuid"], "fields": {"name": "Watership Down II"}},
+            ])
+            self.assertEqual(loader.load(), [{**test_samples[1], "name": "Watership Down II"}, test_samples[2]])
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "books.kbin")
+            with open(path, 'wb') as file:
+                file.write(b"[]" * 32)
+            self.assertRaises(ValueError, KbinLoader(path).load)
+
+
+class TestExportData(TestCase):
+    def test_exports_every_format(self):
+        sort_funtion = lambda dict_: dict_['number_of_readings']
+        for workers in (1, 2):
+            with self.subTest(msg=f"{workers} workers"), tempfile.TemporaryDirectory() as directory:
+                paths = [os.path.join(directory, "books" + extension) for extension in supportedExtensions]
+                timings = export_data(iter(test_samples), paths, workers)
+                self.assertEqual(list(timings), paths)
+                for path in paths:
+                    self.assertGreaterEqual(timings[path], 0)
+                    self.assertEqual(sorted(get_loader(path)(path).load(), key=sort_funtion),
+                                     sorted(test_samples, key=sort_funtion))
+
+    def test_unsupported_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, "books.json"), os.path.join(directory, "books.txt")]
+            self.assertRaises(TypeError, export_data, test_samples, paths)
+            self.assertEqual(os.listdir(directory), [])
+
+
+class TestCodecs(TestCase):
+    def test_available_codecs_agree(self):
+        content = {sample["uuid"]: {**sample} for sample in test_samples[1:]}
+        for format_ in codecFactories:
+            codecs = available_codecs(format_)
+            self.assertEqual(get_codec(format_).name, codecs[0].name)
+            for codec in codecs:
+                with self.subTest(msg=f"{format_} {codec.name}"):
+                    self.assertEqual(codec.loads(codec.dumps(content)), content)
+                    self.assertEqual(codecs[-1].loads(codec.dumps(content)), content)
+
+    def test_falls_back_to_available_codec(self):
+        def unavailable():
+            import codec_that_does_not_exist
+            return Codec("missing", codec_that_does_not_exist.loads, codec_that_does_not_exist.dumps)
+
+        register_codec("test")(unavailable)
+        register_codec("test")(lambda: Codec("fallback", str, str))
+        try:
+            self.assertEqual([codec.name for codec in available_codecs("test")], ["fallback"])
+            self.assertEqual(get_codec("test").name, "fallback")
+            self.assertEqual(describe_codecs()["test"], "fallback")
+        finally:
+            del codecFactories["test"]
+            selectedCodecs.pop("test", None)
+        self.assertRaises(RuntimeError, get_codec, "test")
+
+
+class TestBackendImports(TestCase):
+    backends = ["yaml", "toml", "tomllib", "csv", "sqlite3", "xml.etree.ElementTree", "concurrent.futures"]
+
+    def imported_backends(self, script: str) -> list[str]:
+        script += f"\nimport sys\nprint(*[name for name in {self.backends!r} if name in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        return output.split()
+
+    def test_backends_are_imported_on_first_use(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonPath, xmlPath = os.path.join(directory, "books.json"), os.path.join(directory, "books.xml")
+            dump_data(test_samples, jsonPath)
+            dump_data(test_samples, xmlPath)
+            self.assertEqual(self.imported_backends("import main"), [])
+            self.assertEqual(self.imported_backends(f"from managers.library import Library\n"
+                                                    f"Library(bookListFile={jsonPath!r})"), [])
+            self.assertEqual(self.imported_backends(f"from managers.library import Library\n"
+                                                    f"Library(bookListFile={xmlPath!r})"), ["xml.etree.ElementTree"])
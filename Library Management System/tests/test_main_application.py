@@ -3,6 +3,14 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
 from main import MainApplication
+from managers.statistics import AuthorStats
+
+
+def mock_library_with(books):
+    library = MagicMock()
+    library.bList = books
+    library.uuids.side_effect = lambda: (book['uuid'] for book in library.bList)
+    return library
 
 
 class TestMainApplicationFunctions(TestCase):
@@ -13,8 +21,7 @@ class TestMainApplicationFunctions(TestCase):
             {'uuid': 'uuid1', 'title': 'Book One', 'author': 'Author One', 'available': True},
             {'uuid': 'uuid2', 'title': 'Book Two', 'author': 'Author Two', 'available': False}
         ]
-        mock_library_instance = MagicMock()
-        mock_library_instance.bList = mock_books
+        mock_library_instance = mock_library_with(mock_books)
         mock_library.return_value = mock_library_instance
 
         # Instantiate MainApplication and check bookIDs
@@ -23,6 +30,20 @@ class TestMainApplicationFunctions(TestCase):
 
         self.assertEqual(app.bookIDs, expected_book_ids)
 
+    @patch('main.Library')
+    def test_book_ids_follow_library_changes(self, mock_library):
+        mock_library_instance = mock_library_with([{'uuid': 'uuid1'}, {'uuid': 'uuid2'}, {'uuid': 'uuid3'}])
+        mock_library.return_value = mock_library_instance
+
+        app = MainApplication()
+        observer = mock_library_instance.subscribe.call_args.args[0]
+        observer("add", {'uuid': 'uuid4'}, position=3)
+        observer("remove", {'uuid': 'uuid1'}, position=0, moved={'uuid': 'uuid4'})
+        observer("remove", {'uuid': 'uuid3'}, position=2, moved=None)
+
+        self.assertEqual(app.bookIDs, {1: 'uuid4', 2: 'uuid2'})
+        self.assertEqual(app.bookUUIDs, {'uuid4': 1, 'uuid2': 2})
+
     @patch('main.Library')
     @patch('main.Printer')
     def test_display_menu_shows_correct_options(self, mock_printer, *args, **kwargs):
@@ -39,7 +60,8 @@ class TestMainApplicationFunctions(TestCase):
             ('6. Remove Book',),
             ('7. Display Outdated Issued Books',),
             ('8. Clear console',),
-            ('9. Exit',)
+            ('9. Exit',),
+            ('10. Display Statistics',)
         ]
 
         # Verify each expected call was made to Printer.print
@@ -50,12 +72,11 @@ class TestMainApplicationFunctions(TestCase):
 class MainApplicationMethodsSetup:
     def setUp(self):
         self.printer = MagicMock()
-        self.library = MagicMock()
-        self.library.bList = [
+        self.library = mock_library_with([
             {'uuid': 'uuid1', 'title': 'Book One', 'author': 'Author One', 'available': True},
             {'uuid': 'uuid2', 'title': 'Book Two', 'author': 'Author Two', 'available': False},
             {'uuid': 'uuid3', 'title': 'Book Three', 'author': 'Author Three', 'available': True},
-        ]
+        ])
 
 
 class TestMainApplicationDisplayBooksMethod(MainApplicationMethodsSetup, TestCase):
@@ -64,8 +85,7 @@ class TestMainApplicationDisplayBooksMethod(MainApplicationMethodsSetup, TestCas
     @patch('main.Printer')
     def test_no_books_found_message(self, mock_printer, mock_library):
         # Setup mock library to return an empty list of books
-        mock_library_instance = MagicMock()
-        mock_library_instance.bList = []
+        mock_library_instance = mock_library_with([])
         mock_library.return_value = mock_library_instance
 
         app = MainApplication()
@@ -90,6 +110,56 @@ class TestMainApplicationDisplayBooksMethod(MainApplicationMethodsSetup, TestCas
         ]
         mock_printer.return_value.print.assert_has_calls([unittest.mock.call(*args) for args in expected_calls])
 
+    @patch('main.Library')
+    @patch('main.Printer')
+    def test_books_are_displayed_in_pages(self, mock_printer, mock_library):
+        self.library.bList = [{'uuid': f'uuid{i}'} for i in range(1, 8)]
+        self.printer.input.side_effect = ['y', 'n']
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+
+        app = MainApplication()
+        app.pageSize = 2
+        app.display_books()
+
+        self.assertEqual([call.args[0] for call in self.printer.input.call_args_list],
+                         ['Show page 2? (y/n/all): ', 'Show page 3? (y/n/all): '])
+        self.assertEqual([call.args[0] for call in self.library.display_book.call_args_list],
+                         ['uuid1', 'uuid2', 'uuid3', 'uuid4'])
+        self.assertEqual(self.printer.buffered.call_count, 2)
+
+    @patch('main.Library')
+    @patch('main.Printer')
+    def test_all_remaining_books_are_displayed_at_once(self, mock_printer, mock_library):
+        self.library.bList = [{'uuid': f'uuid{i}'} for i in range(1, 8)]
+        self.printer.input.side_effect = ['all']
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+
+        app = MainApplication()
+        app.pageSize = 2
+        app.display_books()
+
+        self.assertEqual(self.printer.input.call_count, 1)
+        self.assertEqual(self.library.display_book.call_count, 7)
+        self.assertEqual(self.printer.buffered.call_count, 2)
+
+    @patch('main.sys.stdout')
+    @patch('main.Library')
+    @patch('main.Printer')
+    def test_output_that_is_not_a_terminal_is_not_paged(self, mock_printer, mock_library, mock_stdout):
+        self.library.bList = [{'uuid': f'uuid{i}'} for i in range(1, 50)]
+        mock_stdout.isatty.return_value = False
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+
+        app = MainApplication()
+        app.display_books()
+
+        self.assertIsNone(app.pageSize)
+        self.printer.input.assert_not_called()
+        self.assertEqual(self.library.display_book.call_count, 49)
+
 
 class TestMainApplicationIssueBookMethod(MainApplicationMethodsSetup, TestCase):
     @patch('main.Printer.input', return_value=1)
@@ -156,6 +226,34 @@ class TestMainApplicationSearchBookMethod(MainApplicationMethodsSetup, TestCase)
 
         mock_library.return_value.display_book.assert_called_once_with('uuid1')
 
+    @patch('main.Printer')
+    @patch('main.Library')
+    def test_search_book_query_mode(self, mock_library, mock_printer):
+        self.printer.input.side_effect = ['query', 'available order by number_of_readings desc']
+        self.library.query.return_value = iter(['uuid3', 'uuid1'])
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+        app = MainApplication()
+        app.search_book()
+
+        mock_library.return_value.query.assert_called_once_with('available order by number_of_readings desc')
+        self.printer.print.assert_has_calls([unittest.mock.call('Book 3:'), unittest.mock.call('Book 1:')])
+        mock_library.return_value.search_by.assert_not_called()
+
+    @patch('main.Printer')
+    @patch('main.Library')
+    def test_search_book_fuzzy_mode(self, mock_library, mock_printer):
+        self.printer.input.side_effect = ['fuzzy', 'bok too']
+        self.library.fuzzy_search.return_value = [('uuid2', 0.75)]
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+        app = MainApplication()
+        app.search_book()
+
+        mock_library.return_value.fuzzy_search.assert_called_once_with('bok too')
+        self.printer.print.assert_called_with('Book 2 (75% match):')
+        mock_library.return_value.display_book.assert_called_once_with('uuid2')
+
 
 class TestMainApplicationRemoveBookMethod(MainApplicationMethodsSetup, TestCase):
     @patch('main.Printer.input', return_value=1)
@@ -197,13 +295,8 @@ class TestMainApplicationDisplayOutdatedIssuedBooksMethod(MainApplicationMethods
     @patch('main.Library')
     @patch('main.Printer')
     def test_no_outdated_books_found_message(self, mock_printer, mock_library):
-        # Setup mock library to return a list of books without any outdated books
-        self.library.bList = [
-            {'uuid': 'uuid1', 'title': 'Book One', 'author': 'Author One', 'available': False,
-             'expire_date': '2097/12/31 00:00:00'},
-            {'uuid': 'uuid2', 'title': 'Book Two', 'author': 'Author Two', 'available': False,
-             'expire_date': '2092/12/31 00:00:00'}
-        ]
+        # Setup mock library to report no outdated books
+        self.library.outdated_books.return_value = []
         mock_library.return_value = self.library
 
         app = MainApplication()
@@ -215,13 +308,8 @@ class TestMainApplicationDisplayOutdatedIssuedBooksMethod(MainApplicationMethods
     @patch('main.Library')
     @patch('main.Printer')
     def test_outdated_books_are_displayed_correctly(self, mock_printer, mock_library):
-        # Setup mock library to return a list of books with an outdated book
-        self.library.bList = [
-            {'uuid': 'uuid1', 'title': 'Book One', 'author': 'Author One', 'available': False,
-             'expire_date': '1337/12/31 00:00:00'},
-            {'uuid': 'uuid2', 'title': 'Book Two', 'author': 'Author Two', 'available': False,
-             'expire_date': '2000/12/31 00:00:00'}
-        ]
+        # Setup mock library to report two outdated books
+        self.library.outdated_books.return_value = ['uuid1', 'uuid2']
         mock_library.return_value = self.library
 
         app = MainApplication()
@@ -235,6 +323,30 @@ class TestMainApplicationDisplayOutdatedIssuedBooksMethod(MainApplicationMethods
         mock_printer.return_value.print.assert_has_calls([unittest.mock.call(*args) for args in expected_calls])
 
 
+class TestMainApplicationDisplayStatisticsMethod(MainApplicationMethodsSetup, TestCase):
+    @patch('main.Library')
+    @patch('main.Printer')
+    def test_statistics_are_displayed(self, mock_printer, mock_library):
+        self.library.issued_count.return_value = 1
+        self.library.most_read_books.return_value = [('uuid2', 7)]
+        self.library.get_book.return_value = {'uuid': 'uuid2', 'name': 'Book Two', 'author': 'Author Two'}
+        self.library.most_read_authors.return_value = [AuthorStats('Author Two', 7, 1)]
+        mock_printer.return_value = self.printer
+        mock_library.return_value = self.library
+
+        app = MainApplication()
+        app.display_statistics()
+
+        self.library.most_read_books.assert_called_once_with(app.statisticsSize)
+        self.assertEqual([call.args[0] for call in self.printer.print.call_args_list], [
+            'Issued books: 1 of 3',
+            'Most read books:',
+            'Book 2: Book Two by Author Two (7 readings)',
+            'Most read authors:',
+            'Author Two: 7 readings of 1 books',
+        ])
+
+
 class TestMainApplicationExitApplicationMethod(MainApplicationMethodsSetup, TestCase):
     @patch('main.Printer')
     @patch('main.Library')
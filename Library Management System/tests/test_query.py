@@ -0,0 +1,75 @@
+import json
+import os
+import unittest
+
+from managers.library import Library
+from managers.query import Query
+
+test_samples = [
+    {"uuid": "uuid1", "name": "The Hitchhiker's Guide To The Galaxy", "author": "Douglas Adams",
+     "available": False, "issue_date": "2024/06/26 16:55:12", "expire_date": "2024/07/09 16:55:12",
+     "number_of_readings": 17},
+    {"uuid": "uuid2", "name": "Watership Down", "author": "Richard Adams", "available": True,
+     "issue_date": "", "expire_date": "", "number_of_readings": 51},
+    {"uuid": "uuid3", "name": "The Five People You Meet in Heaven", "author": "Mitch Albom", "available": True,
+     "issue_date": "", "expire_date": "", "number_of_readings": 75},
+    {"uuid": "uuid4", "name": "Speak", "author": "Laurie Halse Anderson", "available": True,
+     "issue_date": "", "expire_date": "", "number_of_readings": 5},
+    {"uuid": "uuid5", "name": "Shogun", "author": "James Clavell", "available": True,
+     "issue_date": "", "expire_date": "", "number_of_readings": 80},
+    {"uuid": "uuid6", "name": "Salmon of Doubt", "author": "Douglas Adams", "available": True,
+     "issue_date": "", "expire_date": "", "number_of_readings": 64},
+]
+
+
+class TestQueryParse(unittest.TestCase):
+    def test_parse_full_query(self):
+        query = Query.parse("author prefix 'Ad' AND available and number_of_readings>=50 "
+                            "ORDER BY number_of_readings DESC LIMIT 20")
+        self.assertEqual([(c.attribute, c.operator, c.value) for c in query.conditions],
+                         [("author", "prefix", "Ad"), ("available", "=", "true"), ("number_of_readings", ">=", "50")])
+        self.assertEqual((query.orderBy, query.descending, query.limitCount), ("number_of_readings", True, 20))
+
+    def test_parse_invalid_queries(self):
+        for text in ("name =", "name = x or author = y", "name = x limit many", "order name", "available limit -1"):
+            with self.subTest(msg=text):
+                self.assertRaises(ValueError, Query.parse, text)
+
+
+class TestLibraryQuery(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_query_books.json"
+        with open(self.test_file_path, 'w') as f:
+            json.dump(test_samples, f)
+
+    def test_indexed_and_scanned_queries_agree(self):
+        indexed = Library(bookListFile=self.test_file_path)
+        scanned = Library(bookListFile=self.test_file_path, indexes={})
+        queries = (
+            "author prefix d and available",
+            "number_of_readings > 50 and number_of_readings <= 75",
+            "name = speak",
+            "available = false",
+            "author != 'douglas adams' and number_of_readings < 60",
+        )
+        for text in queries:
+            with self.subTest(msg=text):
+                self.assertEqual(sorted(indexed.query(text)), sorted(scanned.query(text)))
+
+    def test_order_and_limit(self):
+        library = Library(bookListFile=self.test_file_path)
+        self.assertEqual(list(library.query("available order by number_of_readings desc limit 3")),
+                         ["uuid5", "uuid3", "uuid6"])
+        self.assertEqual(list(library.query("author = 'douglas adams' order by number_of_readings")),
+                         ["uuid1", "uuid6"])
+        self.assertEqual(list(library.query("order by name limit 2")), ["uuid6", "uuid5"])
+
+    def test_query_follows_mutations(self):
+        library = Library(bookListFile=self.test_file_path)
+        library.issue_book("uuid5")
+        library.remove_book("uuid3")
+        self.assertEqual(list(library.query("available and number_of_readings >= 50 order by number_of_readings")),
+                         ["uuid2", "uuid6"])
+
+    def tearDown(self):
+        os.remove(self.test_file_path)
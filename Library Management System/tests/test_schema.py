@@ -0,0 +1,33 @@
+import unittest
+
+from managers.schema import Schema
+
+
+class TestSchema(unittest.TestCase):
+    def test_decode_by_the_book_fields(self):
+        schema = Schema(["uuid", "name", "available", "issue_date", "number_of_readings"])
+        self.assertEqual(schema.decode(["uuid1", "1984", "False", "", "17"]),
+                         {"uuid": "uuid1", "name": "1984", "available": False, "issue_date": "",
+                          "number_of_readings": 17})
+        self.assertEqual(schema.decode(["uuid1", None, "TRUE", None, None]),
+                         {"uuid": "uuid1", "name": "", "available": True, "issue_date": "",
+                          "number_of_readings": 0})
+
+    def test_unknown_columns_are_guessed(self):
+        schema = Schema(["shelf", "floor", "lent", "note"])
+        self.assertEqual(schema.decode(["A12", "-2", "true", ""]),
+                         {"shelf": "A12", "floor": -2, "lent": True, "note": ""})
+
+    def test_invalid_numbers_raise(self):
+        self.assertRaises(ValueError, Schema(["number_of_readings"]).decode, ["many"])
+
+    def test_encode(self):
+        schema = Schema(["uuid", "available", "issue_date", "number_of_readings"])
+        self.assertEqual(schema.encode({"uuid": "uuid1", "available": True, "issue_date": None,
+                                        "number_of_readings": 3}),
+                         ["uuid1", "True", None, "3"])
+
+    def test_decoders_are_looked_up_once(self):
+        schema = Schema(())
+        self.assertIs(schema.decoder("available"), schema.decoder("available"))
+        self.assertEqual(schema.decoder("available")("false"), False)
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from managers.library import Library
+from managers.service import LibraryService
+
+test_samples = [
+    {
+        "uuid": f"00000000-0000-4000-8000-{number:012d}",
+        "name": f"Book {number}",
+        "author": f"Author {number % 3}",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": number
+    }
+    for number in range(20)
+]
+
+
+class TestLibraryService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.test_file_path = "test_service_books.json"
+        with open(self.test_file_path, 'w') as f:
+            json.dump(test_samples, f)
+        self.library = Library(bookListFile=self.test_file_path, journal=True, concurrent=True)
+        self.service = LibraryService(self.library, saveDelay=0.001)
+
+    def tearDown(self):
+        self.service.close()
+        for path in (self.test_file_path, self.test_file_path + ".journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _reloaded(self):
+        return Library(bookListFile=self.test_file_path, journal=True)
+
+    async def test_mutations_are_saved_before_the_response(self):
+        response = await self.service.handle({"op": "issue", "uuid": test_samples[0]["uuid"]})
+        self.assertEqual(response, {"ok": True, "message": "Book issued successfully!"})
+        self.assertFalse(self._reloaded().get_book(test_samples[0]["uuid"])["available"])
+
+        response = await self.service.handle({"op": "add", "title": "Speak", "author": "Laurie Halse Anderson"})
+        self.assertTrue(response["ok"])
+        self.assertEqual(self._reloaded().get_book(response["uuid"])["name"], "Speak")
+
+    async def test_concurrent_mutations_share_a_save(self):
+        responses = await asyncio.gather(
+            *(self.service.handle({"op": "issue", "uuid": book["uuid"]}) for book in test_samples)
+        )
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertEqual(self.service.saves, 1)
+        self.assertEqual(self.service.mutations, len(test_samples))
+        self.assertFalse(any(book["available"] for book in self._reloaded().bList))
+
+    async def test_errors(self):
+        uuid = test_samples[0]["uuid"]
+        await self.service.handle({"op": "issue", "uuid": uuid})
+        self.assertFalse((await self.service.handle({"op": "issue", "uuid": uuid}))["ok"])
+        self.assertEqual(await self.service.handle({"op": "return", "uuid": "missing"}),
+                         {"ok": False, "error": "Invalid UUID!"})
+        self.assertEqual(await self.service.handle({"op": "remove"}), {"ok": False, "error": "Missing argument: uuid"})
+        self.assertEqual(await self.service.handle({"op": "burn"}), {"ok": False, "error": "Unknown operation"})
+        self.assertFalse((await self.service.handle({"op": "query", "query": "name ~ x"}))["ok"])
+        self.assertEqual(self.service.saves, 1)
+
+    async def test_results_do_not_depend_on_printed_messages(self):
+        uuid = test_samples[0]["uuid"]
+        with patch("utils.Printer.print", side_effect=AssertionError("printed")), \
+                patch("utils.Printer.error", side_effect=AssertionError("printed")):
+            self.assertEqual(await self.service.handle({"op": "issue", "uuid": uuid}),
+                             {"ok": True, "message": "Book issued successfully!"})
+            self.assertEqual(await self.service.handle({"op": "issue", "uuid": "missing"}),
+                             {"ok": False, "error": "Invalid UUID!"})
+            added = await self.service.handle({"op": "add", "title": "Speak", "author": "Laurie Halse Anderson"})
+            self.assertEqual(self.library.get_book(added["uuid"])["name"], "Speak")
+            self.assertEqual(await self.service.handle({"op": "search", "attribute": "author", "value": "Nobody"}),
+                             {"ok": True, "uuids": []})
+
+    async def test_saves_run_off_the_event_loop(self):
+        threads = []
+        persist = self.library.persist
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            persist()
+
+        with patch.object(self.library, "persist", side_effect=record_thread):
+            await self.service.handle({"op": "issue", "uuid": test_samples[0]["uuid"]})
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_library_must_be_concurrent(self):
+        self.assertRaises(ValueError, LibraryService, Library(bookListFile=self.test_file_path))
+
+    async def test_failed_save_is_reported(self):
+        with patch.object(self.library, "persist", side_effect=OSError("disk full")):
+            response = await self.service.handle({"op": "remove", "uuid": test_samples[0]["uuid"]})
+        self.assertEqual(response, {"ok": False, "error": "disk full"})
+
+    async def test_reads(self):
+        response = await self.service.handle({"op": "get", "uuid": test_samples[1]["uuid"]})
+        self.assertEqual(response, {"ok": True, "book": test_samples[1]})
+        response = await self.service.handle({"op": "search", "attribute": "author", "value": "Author 1"})
+        self.assertEqual(response["uuids"], [book["uuid"] for book in test_samples if book["author"] == "Author 1"])
+        response = await self.service.handle({"op": "search", "attribute": "author", "value": "Nobody"})
+        self.assertEqual(response, {"ok": True, "uuids": []})
+        response = await self.service.handle({"op": "query", "query": "number_of_readings >= 18"})
+        self.assertCountEqual(response["uuids"], [book["uuid"] for book in test_samples[18:]])
+
+    async def test_line_protocol(self):
+        server = await self.service.start(port=0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b'{"op": "get", "uuid": "%s"}\nnot json\n' % test_samples[0]["uuid"].encode())
+            await writer.drain()
+            self.assertEqual(json.loads(await reader.readline()), {"ok": True, "book": test_samples[0]})
+            self.assertFalse(json.loads(await reader.readline())["ok"])
+            writer.close()
+            await writer.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
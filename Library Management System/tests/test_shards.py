@@ -0,0 +1,157 @@
+import contextlib
+import io
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from managers.library import Library
+from managers.loaders import KbinLoader
+from managers.shards import ShardedLoader
+
+test_samples = [
+    {
+        "uuid": "03d462ed-dbac-43b4-8a66-c3cfaf47245a",
+        "name": "The Hitchhiker's Guide To The Galaxy",
+        "author": "Douglas Adams",
+        "available": False,
+        "issue_date": "2024/06/26 16:55:12",
+        "expire_date": "2024/07/09 16:55:12",
+        "number_of_readings": 17
+    },
+    {
+        "uuid": "f07abcb2-1f4b-457b-a856-cdff22f7acfc",
+        "name": "Watership Down",
+        "author": "Richard Adams",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 51
+    },
+    {
+        "uuid": "a74e8e90-2b3b-4c53-a166-8dfb3b2783b1",
+        "name": "The Five People You Meet in Heaven",
+        "author": "Mitch Albom",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 75
+    },
+    {
+        "uuid": "0d9d6221-dd8f-4667-a4e9-2f063ee37f5d",
+        "name": "I Know Why the Caged Bird Sings",
+        "author": "Maya Angelou",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 74
+    }
+]
+
+
+class TestShardedLoader(unittest.TestCase):
+    def setUp(self):
+        self.test_directory = "test_shards"
+
+    def test_books_are_partitioned_by_uuid_prefix(self):
+        ShardedLoader(self.test_directory, ".kbin", prefixLength=1).save_iter(test_samples)
+        self.assertEqual(sorted(os.listdir(self.test_directory)), ["0.kbin", "a.kbin", "f.kbin"])
+
+        loader = ShardedLoader(self.test_directory)
+        self.assertEqual((loader.fileExt, loader.prefixLength), (".kbin", 1))
+        self.assertEqual(loader.load_shard("0"), [test_samples[0], test_samples[3]])
+        self.assertEqual(loader.load_shard("b"), [])
+        self.assertCountEqual(loader.load(), test_samples)
+
+    def test_shards_are_loaded_in_parallel(self):
+        ShardedLoader(self.test_directory, prefixLength=1).save_iter(test_samples)
+        loader = ShardedLoader(self.test_directory)
+        self.assertEqual(loader.load_shards(["f", "0", "b"], workers=2),
+                         {"f": [test_samples[1]], "0": [test_samples[0], test_samples[3]], "b": []})
+
+    def test_mixed_shards_are_rejected(self):
+        ShardedLoader(self.test_directory, prefixLength=1).save_iter(test_samples)
+        KbinLoader(os.path.join(self.test_directory, "b.kbin")).save([])
+        self.assertRaises(ValueError, ShardedLoader, self.test_directory)
+        os.remove(os.path.join(self.test_directory, "b.kbin"))
+        self.assertRaises(ValueError, ShardedLoader, self.test_directory, prefixLength=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_directory, ignore_errors=True)
+
+
+class TestShardedLibrary(unittest.TestCase):
+    def setUp(self):
+        self.test_directory = "test_sharded_library"
+        ShardedLoader(self.test_directory, prefixLength=1).save_iter(test_samples)
+        self.output = io.StringIO()
+
+    def library(self, **options) -> Library:
+        with contextlib.redirect_stdout(self.output):
+            return Library(bookListFile=self.test_directory, sharded=True, **options)
+
+    def test_only_touched_shards_are_loaded(self):
+        library = self.library()
+        self.assertEqual(library.bList, [])
+        with contextlib.redirect_stdout(self.output):
+            library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+        self.assertEqual(library._loadedShards, {"f"})
+        self.assertEqual([book["uuid"] for book in library.bList], ["f07abcb2-1f4b-457b-a856-cdff22f7acfc"])
+        self.assertEqual(library._dirtyShards, {"f"})
+        self.assertIsNone(library.get_book("f0000000-0000-4000-8000-000000000000"))
+
+    def test_only_dirty_shards_are_saved(self):
+        library = self.library()
+        with contextlib.redirect_stdout(self.output):
+            library.issue_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")
+            library.remove_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+            library.display_book("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1")
+            with patch.object(ShardedLoader, "save_shard", autospec=True,
+                              side_effect=ShardedLoader.save_shard) as save_shard:
+                self.assertTrue(library.save("json"))
+        self.assertEqual([call.args[1] for call in save_shard.call_args_list], ["0", "f"])
+        self.assertEqual(library._dirtyShards, set())
+
+        reopened = self.library()
+        self.assertIsNone(reopened.get_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a"))
+        self.assertFalse(reopened.get_book("f07abcb2-1f4b-457b-a856-cdff22f7acfc")["available"])
+        self.assertEqual(reopened.get_book("0d9d6221-dd8f-4667-a4e9-2f063ee37f5d"), test_samples[3])
+
+    def test_added_books_join_their_shard(self):
+        library = self.library()
+        with contextlib.redirect_stdout(self.output):
+            uuid = library.add_many([("Speak", "Laurie Halse Anderson")])[0].uuid
+            library.save("json")
+        prefix = uuid[0]
+        self.assertEqual(library._loadedShards, {prefix})
+        reopened = self.library()
+        self.assertEqual(reopened.get_book(uuid)["name"], "Speak")
+        self.assertEqual(len(reopened.dataLoader.load_shard(prefix)),
+                         1 + sum(book["uuid"].startswith(prefix) for book in test_samples))
+
+    def test_catalog_wide_operations_load_every_shard(self):
+        library = self.library()
+        with contextlib.redirect_stdout(self.output):
+            library.issue_book("a74e8e90-2b3b-4c53-a166-8dfb3b2783b1")
+            self.assertEqual(library.search_by("author", "Maya Angelou"), ["0d9d6221-dd8f-4667-a4e9-2f063ee37f5d"])
+        self.assertEqual(library._loadedShards, {"0", "a", "f"})
+        self.assertEqual(library._dirtyShards, {"a"})
+        self.assertEqual(sorted(library.query("available = false")),
+                         ["03d462ed-dbac-43b4-8a66-c3cfaf47245a", "a74e8e90-2b3b-4c53-a166-8dfb3b2783b1"])
+
+    def test_preload_loads_every_shard(self):
+        library = self.library(preload=True, storage="compact")
+        self.assertCountEqual(map(dict, library.bList), test_samples)
+        self.assertEqual(library._dirtyShards, set())
+        self.assertEqual(library.search_by("available", "false"), ["03d462ed-dbac-43b4-8a66-c3cfaf47245a"])
+
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, Library, bookListFile=self.test_directory, sharded=True, journal=True)
+        self.assertRaises(FileExistsError, Library, bookListFile="missing_shards", sharded=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+from unittest import TestCase
+
+from managers.statistics import AuthorStats, CirculationStats, RankedCounter
+
+
+class TestRankedCounter(TestCase):
+    def test_most_common(self):
+        counter = RankedCounter()
+        for key, count in {"a": 3, "b": 7, "c": 3, "d": 1, "e": 3}.items():
+            counter.set(key, count)
+        self.assertEqual(counter.most_common(3), [("b", 7), ("a", 3), ("c", 3)])
+        counter.add("d", 9)
+        counter.discard("b")
+        counter.discard("missing")
+        self.assertEqual(counter.most_common(10), [("d", 10), ("a", 3), ("c", 3), ("e", 3)])
+        self.assertEqual(counter._levels, [3, 10])
+        self.assertEqual(counter.most_common(0), [])
+
+    def test_matches_sorting(self):
+        rand = random.Random(7)
+        counter, counts = RankedCounter(), {}
+        for _ in range(2000):
+            key = rand.randrange(100)
+            if rand.random() < 0.1:
+                counter.discard(key)
+                counts.pop(key, None)
+            else:
+                delta = rand.randint(-2, 5)
+                counter.add(key, delta)
+                counts[key] = counts.get(key, 0) + delta
+        self.assertEqual(counter.counts, counts)
+        self.assertEqual(counter.most_common(15), sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:15])
+
+
+class TestCirculationStats(TestCase):
+    def setUp(self):
+        self.stats = CirculationStats()
+        self.stats.build([
+            {"uuid": "uuid1", "author": "Ada", "available": False, "number_of_readings": 4},
+            {"uuid": "uuid2", "author": "Bob", "available": True, "number_of_readings": 9},
+            {"uuid": "uuid3", "author": "Ada", "available": True, "number_of_readings": 6},
+        ])
+
+    def test_build(self):
+        self.assertEqual(self.stats.issued, 1)
+        self.assertEqual(self.stats.most_read_books(2), [("uuid2", 9), ("uuid3", 6)])
+        self.assertEqual(self.stats.most_read_authors(5), [AuthorStats("Ada", 10, 2), AuthorStats("Bob", 9, 1)])
+
+    def test_follows_mutations(self):
+        self.stats.observe("update", {"uuid": "uuid3", "author": "Ada", "available": False, "number_of_readings": 7},
+                           previous={"available": True, "number_of_readings": 6})
+        self.stats.observe("update", {"uuid": "uuid1", "author": "Ada", "available": True, "number_of_readings": 4},
+                           previous={"available": False, "expire_date": "2024/07/09 16:55:12"})
+        self.stats.observe("update", {"uuid": "uuid2", "author": "Bob", "available": True, "number_of_readings": 9},
+                           previous={"issue_date": ""})
+        self.stats.observe("remove", {"uuid": "uuid2", "author": "Bob", "available": True, "number_of_readings": 9},
+                           position=1, moved=None)
+        self.stats.observe("add", {"uuid": "uuid4", "author": "Cy", "available": True, "number_of_readings": 0},
+                           position=2)
+        self.assertEqual(self.stats.issued, 1)
+        self.assertEqual(self.stats.most_read_books(5), [("uuid3", 7), ("uuid1", 4), ("uuid4", 0)])
+        self.assertEqual(self.stats.most_read_authors(5), [AuthorStats("Ada", 11, 2), AuthorStats("Cy", 0, 1)])
+        self.assertEqual(self.stats.authorBooks, Counter({"Ada": 2, "Cy": 1}))
@@ -0,0 +1,114 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from managers.library import Library
+from managers.loaders import JsonLoader, supportedExtensions
+from managers.storage import CompactBook
+
+test_samples = [
+    {
+        "uuid": "03d462ed-dbac-43b4-8a66-c3cfaf47245a",
+        "name": "The Hitchhiker's Guide To The Galaxy",
+        "author": "Douglas Adams",
+        "available": False,
+        "issue_date": "2024/06/26 16:55:12",
+        "expire_date": "2024/07/09 16:55:12",
+        "number_of_readings": 17
+    },
+    {
+        "uuid": "f07abcb2-1f4b-457b-a856-cdff22f7acfc",
+        "name": "Watership Down",
+        "author": "Richard Adams",
+        "available": True,
+        "issue_date": "",
+        "expire_date": "",
+        "number_of_readings": 51
+    },
+    {
+        "uuid": "d09d6221-dd8f-4667-a4e9-2f063ee37f5d",
+        "name": "I Know Why the Caged Bird Sings",
+        "author": "Maya Angelou",
+        "available": True,
+        "issue_date": None,
+        "expire_date": None,
+        "number_of_readings": 74
+    }
+]
+
+
+class TestCompactBook(unittest.TestCase):
+    def test_behaves_like_the_book_dictionary(self):
+        for sample in test_samples:
+            with self.subTest(msg=sample["uuid"]):
+                book = CompactBook.from_book(sample)
+                self.assertEqual(book, sample)
+                self.assertEqual(dict(book), sample)
+                self.assertEqual(list(book.keys()), list(sample.keys()))
+
+    def test_null_dates_are_kept(self):
+        book = CompactBook("uuid1", "Speak", "Laurie Halse Anderson", True, None, None, 5)
+        self.assertIsNone(book["issue_date"])
+        book["issue_date"] = "2024/07/03 12:00:00"
+        book["available"] = False
+        self.assertEqual(book["issue_date"], "2024/07/03 12:00:00")
+        self.assertFalse(book["available"])
+        self.assertIsNone(book["expire_date"])
+
+    def test_unknown_fields_are_rejected(self):
+        book = CompactBook.from_book(test_samples[0])
+        self.assertRaises(KeyError, book.__getitem__, "title")
+        self.assertRaises(KeyError, book.__setitem__, "title", "Speak")
+
+    def test_authors_are_interned(self):
+        first = CompactBook.from_book({**test_samples[0], "author": "".join(["Douglas", " Adams"])})
+        second = CompactBook.from_book({**test_samples[0], "author": "".join(["Douglas ", "Adams"])})
+        self.assertIs(first["author"], second["author"])
+
+    def test_loaders_round_trip(self):
+        books = [CompactBook.from_book(sample) for sample in test_samples]
+        for extension, loaderClass in supportedExtensions.items():
+            with self.subTest(msg=extension):
+                loader = loaderClass()
+                self.assertEqual(sorted(loader.deserialize(loader.serialize(books[:2])), key=lambda b: b["uuid"]),
+                                 test_samples[:2])
+
+
+class TestCompactLibrary(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = "test_storage_books.json"
+        with open(self.test_file_path, 'w') as f:
+            json.dump(test_samples, f)
+
+    def test_library_operations(self):
+        library = Library(bookListFile=self.test_file_path, storage="compact")
+        self.assertTrue(all(isinstance(book, CompactBook) for book in library.bList))
+        library.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        library.return_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")
+        library.add_book("New Book", "New Author")
+        self.assertIsInstance(library.bList[-1], CompactBook)
+        self.assertEqual(library.search_by("available", "false"), ["d09d6221-dd8f-4667-a4e9-2f063ee37f5d"])
+        self.assertEqual(library._get_book("03d462ed-dbac-43b4-8a66-c3cfaf47245a")["expire_date"], "")
+        self.assertTrue(library.save("json"))
+        with open(self.test_file_path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved, [dict(book) for book in library.bList])
+
+    def test_records_are_converted_while_streaming(self):
+        journaled = Library(bookListFile=self.test_file_path, journal=True)
+        journaled.issue_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")
+        self.assertTrue(journaled.save("json"))
+        try:
+            with patch.object(JsonLoader, "load", side_effect=AssertionError):
+                library = Library(bookListFile=self.test_file_path, storage="compact", journal=True)
+            self.assertTrue(all(isinstance(book, CompactBook) for book in library.bList))
+            self.assertFalse(library._get_book("d09d6221-dd8f-4667-a4e9-2f063ee37f5d")["available"])
+        finally:
+            os.remove(self.test_file_path + ".journal")
+
+    def test_unknown_storage(self):
+        self.assertRaises(ValueError, Library, bookListFile=self.test_file_path, storage="columnar")
+
+    def tearDown(self):
+        os.remove(self.test_file_path)
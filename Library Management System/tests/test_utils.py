@@ -0,0 +1,47 @@
+import contextlib
+import io
+import unittest
+from unittest.mock import patch
+
+from utils import Printer
+
+
+class TestPrinter(unittest.TestCase):
+    def setUp(self):
+        self.printer = Printer()
+        self.output = io.StringIO()
+
+    def test_print_many(self):
+        with contextlib.redirect_stdout(self.output), self.printer:
+            self.printer.print_many(["UUID: 1", "Name: Dune\n"])
+        self.assertEqual(self.output.getvalue(), "\t[+] UUID: 1\n\t[+] Name: Dune\n\n")
+
+    def test_buffered_output_is_written_at_once(self):
+        with contextlib.redirect_stdout(self.output):
+            with self.printer.buffered():
+                self.printer.print("first")
+                with self.printer, self.printer.buffered():
+                    self.printer.error("second", end="!\n")
+                self.assertEqual(self.output.getvalue(), "")
+            self.assertEqual(self.output.getvalue(), "[+] first\n\t[-] second!\n")
+            self.printer.print("third")
+        self.assertEqual(self.output.getvalue(), "[+] first\n\t[-] second!\n[+] third\n")
+
+    def test_buffered_output_is_flushed_when_full(self):
+        with contextlib.redirect_stdout(self.output), patch.object(Printer, "bufferSize", 10):
+            with self.printer.buffered():
+                self.printer.print("a")
+                self.assertEqual(self.output.getvalue(), "")
+                self.printer.print("long message")
+                self.assertEqual(self.output.getvalue(), "[+] a\n[+] long message\n")
+
+    @patch("builtins.input", return_value="yes")
+    def test_input_flushes_the_buffer(self, mock_input):
+        with contextlib.redirect_stdout(self.output), self.printer.buffered():
+            self.printer.print("prompting")
+            self.assertEqual(self.printer.input("Continue? "), "yes")
+            self.assertEqual(self.output.getvalue(), "[+] prompting\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,15 @@
+import calendar
+import datetime
+import io
 import os
-from typing import TypedDict, Optional, Callable, Any
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TypedDict, Optional, Callable, Any, Iterable, Iterator
+
+# The format of the issue and expire dates of the books.
+DATE_FORMAT = "%Y/%m/%d %H:%M:%S"
 
 
 class Book(TypedDict):
@@ -16,9 +26,14 @@ class Printer:
     """
     A utility class for printing messages with indentation.
 
+    Messages are printed one by one, unless they are printed inside ``buffered``, which collects them and
+    writes them to the standard output in large chunks.
+
     Attributes:
-        tab_count (int): The number of tabs to prepend to the message.
+        tab_count (int): The number of tabs to prepend to the message, kept separately for every thread.
+        bufferSize (int): The number of characters collected before a buffered printer writes them.
     """
+    bufferSize = 1 << 16
 
     instance = None
     _initialized = False
@@ -37,7 +52,16 @@ class Printer:
         """
         if not self._initialized:
             self._initialized = True
-            self.tab_count = 0
+            self._local = threading.local()
+
+    @property
+    def tab_count(self) -> int:
+        return getattr(self._local, "tab_count", 0)
+
+    @tab_count.setter
+    def tab_count(self, value: int):
+        self._local.tab_count = value
+        self._local.prefix = value * '\t'
 
     def __enter__(self):
         """
@@ -60,7 +84,7 @@ class Printer:
         Args:
             string (str): The message to print.
         """
-        return self.tab_count * '\t' + string
+        return getattr(self._local, "prefix", "") + string
 
     def print(self, msg, *args, **kwargs):
         """
@@ -71,7 +95,17 @@ class Printer:
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
         """
-        print(self.format("[+] " + msg), *args, **kwargs)
+        self._write(self.format("[+] " + msg), *args, **kwargs)
+
+    def print_many(self, messages: Iterable[str]):
+        """
+        Prints several messages, each on its own line with the current number of tabs prepended, at once.
+
+        Args:
+            messages (Iterable[str]): The messages to print.
+        """
+        prefix = self.format("[+] ")
+        self._write("\n".join(prefix + msg for msg in messages))
 
     def error(self, msg, *args, **kwargs):
         """
@@ -82,7 +116,52 @@ class Printer:
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
         """
-        print(self.format("[-] " + msg), *args, **kwargs)
+        self._write(self.format("[-] " + msg), *args, **kwargs)
+
+    def _write(self, line: str, *args, **kwargs):
+        """
+        Prints a formatted line, into the buffer if the printer is buffered.
+        """
+        if (buffer := getattr(self._local, "buffer", None)) is None or "file" in kwargs:
+            print(line, *args, **kwargs)
+            return
+        if args or kwargs:
+            print(line, *args, file=buffer, **kwargs)
+        else:
+            buffer.write(line)
+            buffer.write("\n")
+        if buffer.tell() >= self.bufferSize:
+            self.flush()
+
+    @contextmanager
+    def buffered(self) -> Iterator["Printer"]:
+        """
+        Collects the messages printed in the context and writes them in large chunks.
+
+        Nested contexts share the buffer of the outermost one, which is flushed when it exits.
+
+        Yields:
+            Printer: The printer.
+        """
+        if getattr(self._local, "buffer", None) is not None:
+            yield self
+            return
+        self._local.buffer = io.StringIO()
+        try:
+            yield self
+        finally:
+            self.flush()
+            self._local.buffer = None
+
+    def flush(self):
+        """
+        Writes the buffered messages to the standard output.
+        """
+        if (buffer := getattr(self._local, "buffer", None)) is not None and buffer.tell():
+            sys.stdout.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+        sys.stdout.flush()
 
     def input(self, message, validation_function: Optional[Callable[[str], Optional[Any]]] = None, counter: int = 3):
         """
@@ -95,6 +174,7 @@ class Printer:
         Returns:
             The validated input.
         """
+        self.flush()
         while counter:
             answer = input(self.format("[*] " + message))
             if answer:
@@ -155,6 +235,21 @@ def validate_book_attributes(string: str) -> str | None:
         printer.error(f'Invalid attribute! Please select one of attributes: {", ".join(attributes)}')
 
 
+def validate_search_mode(string: str) -> str | None:
+    """
+    Validates if a string is a book attribute or the name of a search mode.
+
+    Args:
+        string (str): The string to validate.
+
+    Returns:
+        str: The validated string if valid, None otherwise.
+    """
+    if string.lower() in ("query", "fuzzy"):
+        return string.lower()
+    return validate_book_attributes(string)
+
+
 def list2dict(data: list[Book]) -> dict[str, Book]:
     """
     Converts a list of books to a dictionary where the keys are the UUIDs of the books.
@@ -189,3 +284,43 @@ def dict2list(book: dict[str, Book]) -> list[Book]:
         result_list.append(item)
 
     return result_list
+
+
+def date2timestamp(date: str | datetime.datetime | None) -> int | None:
+    """
+    Converts a date in DATE_FORMAT to the number of seconds between the Unix epoch and that wall-clock time.
+
+    The time zone is ignored on purpose, so timestamps order exactly like the dates they were made from.
+
+    Args:
+        date (str | datetime.datetime | None): The date to convert.
+
+    Returns:
+        int | None: The timestamp, or None for an empty date.
+
+    Raises:
+        ValueError: If the date does not match DATE_FORMAT.
+    """
+    if not date:
+        return None
+    if not isinstance(date, str):
+        return calendar.timegm(date.timetuple())
+    if len(date) == 19 and date[4] == date[7] == '/' and date[10] == ' ' and date[13] == date[16] == ':':
+        return calendar.timegm((int(date[0:4]), int(date[5:7]), int(date[8:10]),
+                                int(date[11:13]), int(date[14:16]), int(date[17:19])))
+    return calendar.timegm(datetime.datetime.strptime(date, DATE_FORMAT).timetuple())
+
+
+def timestamp2date(timestamp: int | None) -> str:
+    """
+    Converts a timestamp made by date2timestamp back to a date in DATE_FORMAT.
+
+    Args:
+        timestamp (int | None): The timestamp to convert.
+
+    Returns:
+        str: The date, or an empty string for a missing timestamp.
+    """
+    if timestamp is None:
+        return ""
+    return time.strftime(DATE_FORMAT, time.gmtime(timestamp))